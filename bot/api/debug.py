@@ -0,0 +1,257 @@
+"""
+Отладочные endpoints для профилирования живого процесса
+
+Доступны только при заданном DEBUG_TOKEN, запрос должен содержать
+заголовок "Authorization: Bearer <DEBUG_TOKEN>". Без токена маршруты
+отвечают 404, как будто их нет.
+
+Endpoints:
+- /debug/profile - сэмплирующий профиль потока event loop (folded stacks)
+- /debug/tracemalloc - top-N разница аллокаций между двумя снимками
+- /debug/tasks - незавершённые asyncio задачи со стеками
+
+Пример:
+    curl -H "Authorization: Bearer $DEBUG_TOKEN" \\
+        "http://localhost:8080/debug/profile?seconds=10" > profile.folded
+    flamegraph.pl profile.folded > profile.svg
+"""
+
+import asyncio
+import hmac
+import io
+import logging
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Awaitable, Callable, Dict, List
+
+from aiohttp import web
+
+from bot.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+# Ограничения, чтобы случайный запрос не повесил процесс надолго
+MAX_PROFILE_SECONDS = 60.0
+MIN_SAMPLE_INTERVAL_MS = 1.0
+MAX_TRACEMALLOC_SECONDS = 300.0
+MAX_TOP = 100
+
+# Одновременно выполняется только одно профилирование
+_profile_lock = asyncio.Lock()
+
+
+# ========== ДОСТУП ==========
+
+
+def require_debug_token(handler: Handler) -> Handler:
+    """Пропускать запрос только с правильным DEBUG_TOKEN"""
+
+    async def wrapper(request: web.Request) -> web.StreamResponse:
+        token = settings.debug_token
+        if not token:
+            raise web.HTTPNotFound()
+
+        auth = request.headers.get("Authorization", "")
+        scheme, _, provided = auth.partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(
+            provided.encode(), token.encode()
+        ):
+            logger.warning(f"⚠️ Отклонён запрос к {request.path} от {request.remote}")
+            raise web.HTTPUnauthorized()
+
+        return await handler(request)
+
+    return wrapper
+
+
+def _float_param(request: web.Request, name: str, default: float, maximum: float) -> float:
+    try:
+        value = float(request.query.get(name, default))
+    except ValueError:
+        raise web.HTTPBadRequest(text=f"{name} must be a number")
+    if value <= 0:
+        raise web.HTTPBadRequest(text=f"{name} must be positive")
+    return min(value, maximum)
+
+
+# ========== СЭМПЛИРУЮЩИЙ ПРОФИЛЬ ==========
+
+
+def _folded_stack(frame) -> str:
+    """Стек кадра в формате folded: корень;...;вершина"""
+    names: List[str] = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+        frame = frame.f_back
+    names.reverse()
+    return ";".join(names)
+
+
+def sample_thread(thread_id: int, seconds: float, interval: float) -> Counter:
+    """
+    Снимать стек потока thread_id каждые interval секунд
+
+    Выполняется в отдельном потоке, поэтому видит и блокирующий код
+    в потоке event loop.
+
+    Returns:
+        Counter: folded stack -> количество сэмплов
+    """
+    stacks: Counter = Counter()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        frame = sys._current_frames().get(thread_id)
+        if frame is not None:
+            stacks[_folded_stack(frame)] += 1
+        del frame
+        time.sleep(interval)
+    return stacks
+
+
+@require_debug_token
+async def profile_endpoint(request: web.Request) -> web.Response:
+    """
+    Сэмплирующий профиль потока event loop
+
+    Query:
+        seconds: длительность (по умолчанию 5, максимум 60)
+        interval_ms: интервал сэмплов (по умолчанию 5 мс)
+
+    GET /debug/profile
+    """
+    seconds = _float_param(request, "seconds", 5.0, MAX_PROFILE_SECONDS)
+    interval_ms = max(
+        _float_param(request, "interval_ms", 5.0, 1000.0), MIN_SAMPLE_INTERVAL_MS
+    )
+
+    if _profile_lock.locked():
+        raise web.HTTPConflict(text="Profiling is already running")
+
+    async with _profile_lock:
+        logger.info(f"🔍 Профилирование event loop: {seconds}s, шаг {interval_ms} мс")
+        loop_thread_id = threading.get_ident()
+        stacks = await asyncio.to_thread(
+            sample_thread, loop_thread_id, seconds, interval_ms / 1000
+        )
+
+    # Простой loop виден как стек select() - это тоже полезный сигнал
+    body = "\n".join(f"{stack} {count}" for stack, count in stacks.most_common())
+    return web.Response(text=body + "\n", content_type="text/plain")
+
+
+# ========== TRACEMALLOC ==========
+
+
+def _compare_snapshots(
+    before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, top: int
+) -> List[Dict[str, object]]:
+    stats = after.compare_to(before, "lineno")
+    return [
+        {
+            "location": str(stat.traceback),
+            "size_diff_kb": round(stat.size_diff / 1024, 2),
+            "size_kb": round(stat.size / 1024, 2),
+            "count_diff": stat.count_diff,
+            "count": stat.count,
+        }
+        for stat in stats[:top]
+    ]
+
+
+@require_debug_token
+async def tracemalloc_endpoint(request: web.Request) -> web.Response:
+    """
+    Top-N разница аллокаций между двумя снимками tracemalloc
+
+    Если tracemalloc не был включён, он включается на время замера.
+
+    Query:
+        seconds: пауза между снимками (по умолчанию 10)
+        top: количество строк (по умолчанию 20)
+
+    GET /debug/tracemalloc
+    """
+    seconds = _float_param(request, "seconds", 10.0, MAX_TRACEMALLOC_SECONDS)
+    top = int(_float_param(request, "top", 20, MAX_TOP))
+
+    if _profile_lock.locked():
+        raise web.HTTPConflict(text="Profiling is already running")
+
+    async with _profile_lock:
+        started_here = not tracemalloc.is_tracing()
+        if started_here:
+            tracemalloc.start(settings.debug_tracemalloc_frames)
+
+        logger.info(f"🔍 tracemalloc: снимки с интервалом {seconds}s")
+        try:
+            before = await asyncio.to_thread(tracemalloc.take_snapshot)
+            await asyncio.sleep(seconds)
+            after = await asyncio.to_thread(tracemalloc.take_snapshot)
+            diff = await asyncio.to_thread(_compare_snapshots, before, after, top)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            if started_here:
+                tracemalloc.stop()
+
+    response_data = {
+        "seconds": seconds,
+        "traced_current_kb": round(current / 1024, 2),
+        "traced_peak_kb": round(peak / 1024, 2),
+        "top": diff,
+    }
+    return web.json_response(response_data)
+
+
+# ========== ASYNCIO ЗАДАЧИ ==========
+
+
+def _task_stack(task: asyncio.Task, limit: int) -> str:
+    buffer = io.StringIO()
+    task.print_stack(limit=limit, file=buffer)
+    return buffer.getvalue()
+
+
+@require_debug_token
+async def tasks_endpoint(request: web.Request) -> web.Response:
+    """
+    Незавершённые asyncio задачи со стеками
+
+    Query:
+        limit: глубина стека (по умолчанию 10)
+
+    GET /debug/tasks
+    """
+    limit = int(_float_param(request, "limit", 10, 100))
+    current = asyncio.current_task()
+
+    tasks = []
+    for task in asyncio.all_tasks():
+        if task is current or task.done():
+            continue
+        coro = task.get_coro()
+        tasks.append(
+            {
+                "name": task.get_name(),
+                "coro": getattr(coro, "__qualname__", repr(coro)),
+                "stack": _task_stack(task, limit),
+            }
+        )
+
+    tasks.sort(key=lambda item: item["name"])
+    return web.json_response({"count": len(tasks), "tasks": tasks})
+
+
+def setup_debug_routes(app: web.Application) -> None:
+    """Регистрация отладочных маршрутов"""
+    app.router.add_get("/debug/profile", profile_endpoint)
+    app.router.add_get("/debug/tracemalloc", tracemalloc_endpoint)
+    app.router.add_get("/debug/tasks", tasks_endpoint)
+
+    if settings.debug_token:
+        logger.info("✅ Отладочные endpoints /debug/* включены")
@@ -3,23 +3,38 @@ Health Check Endpoints для мониторинга состояния бота
 
 Endpoints:
 - /health - базовая проверка (бот жив)
-- /ready - проверка готовности (БД + Redis доступны)
-- /metrics - базовые метрики (для Prometheus в будущем)
+- /ready - проверка готовности (БД + Redis доступны, результат кэшируется)
+- /metrics - метрики в текстовом формате Prometheus
+- /metrics/json - базовые метрики и статистика кэша в JSON
 """
 
+import asyncio
 import logging
+import time
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 
 from aiohttp import web
 
+from bot.core.circuit_breaker import redis_breaker
+from bot.core.config import settings
+from bot.core.lifecycle import lifecycle
+from bot.core.loop_monitor import loop_monitor
+from bot.database.pool import pool_monitor
+from bot.core.metrics import PROMETHEUS_CONTENT_TYPE, REGISTRY, gauge
 from bot.database.connection import check_database_health, check_redis_health
+from bot.services.cache import get_cache_stats
+from bot.services.container import get_container
+from bot.services.degraded import degraded_mode
 
 logger = logging.getLogger(__name__)
 
 # Время запуска бота
 _startup_time: datetime = datetime.now()
 
+UPTIME = gauge("bot_uptime_seconds", "Время работы процесса бота")
+UPTIME.set_function(lambda: (datetime.now() - _startup_time).total_seconds())
+
 
 async def health_check(request: web.Request) -> web.Response:
     """
@@ -44,78 +59,231 @@ async def health_check(request: web.Request) -> web.Response:
     return web.json_response(response_data, status=200)
 
 
+# ========== READINESS ==========
+
+
+async def _check_database(timeout: float) -> Dict[str, Any]:
+    """Проверка БД с таймаутом"""
+    result: Dict[str, Any] = {"status": "unknown", "message": ""}
+    try:
+        db_ok = await asyncio.wait_for(check_database_health(), timeout)
+        result["status"] = "healthy" if db_ok else "unhealthy"
+        if not db_ok:
+            result["message"] = "Database connection failed"
+    except asyncio.TimeoutError:
+        logger.warning(f"⚠️ Database health check timeout ({timeout}s)")
+        result["status"] = "unhealthy"
+        result["message"] = f"Timeout after {timeout}s"
+    except Exception as e:
+        logger.error(f"❌ Database health check error: {e}")
+        result["status"] = "unhealthy"
+        result["message"] = str(e)
+
+    result["degraded_mode"] = degraded_mode.status()
+    return result
+
+
+async def _check_redis(timeout: float) -> Dict[str, Any]:
+    """Проверка Redis с таймаутом (при открытом breaker не ждём socket timeout)"""
+    result: Dict[str, Any] = {"status": "unknown", "message": ""}
+    result["breaker"] = redis_breaker.snapshot()
+    try:
+        if redis_breaker.is_open:
+            raise ConnectionError("Circuit breaker is open")
+
+        redis_ok = await asyncio.wait_for(check_redis_health(), timeout)
+        result["status"] = "healthy" if redis_ok else "unhealthy"
+        if not redis_ok:
+            result["message"] = "Redis connection failed"
+    except asyncio.TimeoutError:
+        logger.warning(f"⚠️ Redis health check timeout ({timeout}s)")
+        result["status"] = "unhealthy"
+        result["message"] = f"Timeout after {timeout}s"
+    except Exception as e:
+        logger.error(f"❌ Redis health check error: {e}")
+        result["status"] = "unhealthy"
+        result["message"] = str(e)
+    return result
+
+
+def _check_warmup() -> Dict[str, Any]:
+    """Прогрев кэша (каталог, паки, админы)"""
+    container = get_container()
+    if container is not None and container.warmed_up:
+        return {"status": "healthy", "message": ""}
+    return {"status": "pending", "message": "Cache warm-up has not finished"}
+
+
+class ReadinessProbe:
+    """
+    Кэшированная проверка готовности
+
+    Результат живёт cache_ttl секунд, одновременные запросы к /ready
+    ждут одну общую проверку. Фоновая задача обновляет результат каждые
+    interval секунд, так что /ready обычно просто читает его из памяти.
+    """
+
+    def __init__(self, cache_ttl: float, check_timeout: float, interval: float):
+        self.cache_ttl = cache_ttl
+        self.check_timeout = check_timeout
+        self.interval = interval
+
+        self._result: Optional[Tuple[int, Dict[str, Any]]] = None
+        self._checked_at: float = 0.0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._result is not None
+            and time.monotonic() - self._checked_at < self.cache_ttl
+        )
+
+    async def refresh(self) -> Tuple[int, Dict[str, Any]]:
+        """Выполнить все проверки (БД и Redis параллельно)"""
+        database, redis = await asyncio.gather(
+            _check_database(self.check_timeout),
+            _check_redis(self.check_timeout),
+        )
+        checks: Dict[str, Any] = {
+            "database": database,
+            "redis": redis,
+            "warmup": _check_warmup(),
+        }
+
+        db_healthy = database["status"] == "healthy"
+        others_healthy = (
+            redis["status"] == "healthy" and checks["warmup"]["status"] == "healthy"
+        )
+
+        # Без БД, но со снимком каталога - деградированный режим
+        if db_healthy and others_healthy:
+            status_code, status = 200, "ready"
+        elif others_healthy and degraded_mode.snapshot.available:
+            status_code, status = 200, "degraded"
+        else:
+            status_code, status = 503, "not_ready"
+
+        payload = {
+            "status": status,
+            "timestamp": datetime.now().isoformat(),
+            "checks": checks,
+        }
+
+        self._result = (status_code, payload)
+        self._checked_at = time.monotonic()
+        return self._result
+
+    async def get(self) -> Tuple[int, Dict[str, Any]]:
+        """Последний результат (проверка только если он устарел)"""
+        if self._is_fresh():
+            return self._result
+
+        async with self._lock:
+            # Пока ждали lock, другой запрос мог уже обновить результат
+            if self._is_fresh():
+                return self._result
+            return await self.refresh()
+
+    @property
+    def age(self) -> Optional[float]:
+        """Возраст последнего результата в секундах"""
+        if self._result is None:
+            return None
+        return time.monotonic() - self._checked_at
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with self._lock:
+                    await self.refresh()
+            except Exception as e:
+                logger.error(f"❌ Ошибка фоновой проверки готовности: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Запустить фоновую проверку (если interval > 0)"""
+        if self.interval <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run(), name="readiness_probe")
+        logger.info(f"🔄 Фоновая проверка готовности: каждые {self.interval}s")
+
+    async def stop(self) -> None:
+        """Остановить фоновую проверку"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+readiness_probe = ReadinessProbe(
+    cache_ttl=settings.readiness_cache_ttl,
+    check_timeout=settings.readiness_check_timeout,
+    interval=settings.readiness_probe_interval,
+)
+
+
 async def readiness_check(request: web.Request) -> web.Response:
     """
     Проверка готовности бота к работе
 
     Проверяет:
     - Доступность базы данных
-    - Доступность Redis
+    - Доступность Redis (и состояние circuit breaker)
+    - Завершение прогрева кэша при старте
+
+    Результат кэшируется (READINESS_CACHE_TTL) и обновляется в фоне,
+    поэтому частые пробы не создают нагрузку на БД и Redis.
 
     Возвращает:
     - 200 OK если все системы доступны
+    - 200 OK со статусом "degraded" если недоступна только БД,
+      а inline запросы обслуживаются из снимка каталога
     - 503 Service Unavailable если есть проблемы
 
     GET /ready
     """
-    checks: Dict[str, Any] = {
-        "database": {"status": "unknown", "message": ""},
-        "redis": {"status": "unknown", "message": ""},
-    }
+    # Во время остановки новые апдейты направлять сюда не нужно
+    if lifecycle.draining:
+        return web.json_response(
+            {"status": "draining", "timestamp": datetime.now().isoformat()},
+            status=503,
+        )
 
-    all_healthy = True
+    status_code, payload = await readiness_probe.get()
 
-    # Проверка базы данных
-    try:
-        db_ok = await check_database_health()
-        checks["database"]["status"] = "healthy" if db_ok else "unhealthy"
-
-        if not db_ok:
-            checks["database"]["message"] = "Database connection failed"
-            all_healthy = False
-
-    except Exception as e:
-        logger.error(f"❌ Database health check error: {e}")
-        checks["database"]["status"] = "unhealthy"
-        checks["database"]["message"] = str(e)
-        all_healthy = False
-
-    # Проверка Redis
-    try:
-        redis_ok = await check_redis_health()
-        checks["redis"]["status"] = "healthy" if redis_ok else "unhealthy"
-
-        if not redis_ok:
-            checks["redis"]["message"] = "Redis connection failed"
-            all_healthy = False
-
-    except Exception as e:
-        logger.error(f"❌ Redis health check error: {e}")
-        checks["redis"]["status"] = "unhealthy"
-        checks["redis"]["message"] = str(e)
-        all_healthy = False
-
-    # Формируем ответ
-    status_code = 200 if all_healthy else 503
-
-    response_data = {
-        "status": "ready" if all_healthy else "not_ready",
-        "timestamp": datetime.now().isoformat(),
-        "checks": checks,
-    }
+    response_data = dict(payload)
+    response_data["age_seconds"] = round(readiness_probe.age or 0.0, 3)
 
     return web.json_response(response_data, status=status_code)
 
 
 async def metrics_endpoint(request: web.Request) -> web.Response:
     """
-    Базовые метрики для мониторинга
+    Метрики в текстовом формате экспозиции Prometheus
 
-    В будущем здесь будут Prometheus метрики.
-    Пока возвращаем базовую информацию.
+    Апдейты по типам, время handlers по роутерам, латентность БД, Redis
+    и Telegram Bot API, задержка event loop, кэш и circuit breaker.
 
     GET /metrics
     """
+    # Content-Type содержит charset, поэтому задаём его заголовком
+    return web.Response(
+        body=REGISTRY.render_text().encode("utf-8"),
+        headers={"Content-Type": PROMETHEUS_CONTENT_TYPE},
+    )
+
+
+async def metrics_json_endpoint(request: web.Request) -> web.Response:
+    """
+    Базовые метрики для мониторинга в JSON
+
+    GET /metrics/json
+    """
     uptime = datetime.now() - _startup_time
     uptime_seconds = int(uptime.total_seconds())
 
@@ -124,6 +292,12 @@ async def metrics_endpoint(request: web.Request) -> web.Response:
         "bot_uptime_seconds": uptime_seconds,
         "bot_startup_timestamp": _startup_time.isoformat(),
         "bot_version": "4.0.0",
+        # Hit/miss/error, байты и латентность Redis по семействам ключей
+        "cache": get_cache_stats(),
+        "circuit_breakers": {redis_breaker.name: redis_breaker.snapshot()},
+        # Перцентили задержки event loop и последние блокировки со стеком
+        "event_loop": loop_monitor.snapshot(),
+        "db_pool": pool_monitor.snapshot(),
     }
 
     return web.json_response(metrics_data, status=200)
@@ -134,6 +308,7 @@ def setup_routes(app: web.Application) -> None:
     app.router.add_get("/health", health_check)
     app.router.add_get("/ready", readiness_check)
     app.router.add_get("/metrics", metrics_endpoint)
+    app.router.add_get("/metrics/json", metrics_json_endpoint)
 
     logger.info("✅ Health check endpoints зарегистрированы")
 
@@ -0,0 +1,84 @@
+"""
+Приём апдейтов через webhook на том же aiohttp приложении, что и /health
+
+Включается настройкой BOT_MODE=webhook:
+    WEBHOOK_URL=https://bot.example.com      # публичный адрес (за reverse proxy)
+    WEBHOOK_PATH=/webhook
+    WEBHOOK_SECRET=случайная_строка           # заголовок X-Telegram-Bot-Api-Secret-Token
+    WEBHOOK_MAX_CONNECTIONS=40
+
+Telegram доставляет апдейты параллельно (до max_connections запросов),
+handler отвечает 200 сразу и обрабатывает апдейт в фоновой задаче.
+
+Во время остановки (lifecycle.draining) handler отвечает 503 - Telegram
+повторит доставку после перезапуска, апдейт не теряется.
+"""
+
+import logging
+
+from aiohttp import web
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+
+from bot.core.config import settings
+from bot.core.lifecycle import lifecycle
+
+logger = logging.getLogger(__name__)
+
+
+def get_webhook_url() -> str:
+    """Полный URL webhook (WEBHOOK_URL + WEBHOOK_PATH)"""
+    if not settings.webhook_url:
+        raise RuntimeError("BOT_MODE=webhook требует WEBHOOK_URL")
+    return settings.webhook_url.rstrip("/") + settings.webhook_path
+
+
+class DrainingRequestHandler(SimpleRequestHandler):
+    """SimpleRequestHandler, который не принимает апдейты во время drain"""
+
+    async def handle(self, request: web.Request) -> web.Response:
+        if lifecycle.draining:
+            return web.Response(text="Shutting down", status=503)
+        return await super().handle(request)
+
+
+def setup_webhook_routes(app: web.Application, dp: Dispatcher, bot: Bot) -> None:
+    """
+    Зарегистрировать обработчик webhook (до runner.setup())
+
+    Args:
+        app: aiohttp приложение health check сервера
+        dp: Диспетчер
+        bot: Бот
+    """
+    if not settings.webhook_secret:
+        logger.warning(
+            "⚠️ WEBHOOK_SECRET не задан - запросы к webhook не проверяются"
+        )
+
+    # Проверяет заголовок X-Telegram-Bot-Api-Secret-Token (403 при несовпадении)
+    DrainingRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        secret_token=settings.webhook_secret,
+    ).register(app, path=settings.webhook_path)
+
+    # startup/shutdown диспетчера вместе с приложением (как при polling)
+    setup_application(app, dp, bot=bot)
+
+    logger.info(f"✅ Webhook endpoint зарегистрирован: POST {settings.webhook_path}")
+
+
+async def set_webhook(bot: Bot, dp: Dispatcher) -> None:
+    """Сообщить Telegram адрес webhook"""
+    url = get_webhook_url()
+    await bot.set_webhook(
+        url=url,
+        secret_token=settings.webhook_secret,
+        max_connections=settings.webhook_max_connections,
+        allowed_updates=dp.resolve_used_update_types(),
+        drop_pending_updates=settings.webhook_drop_pending_updates,
+    )
+    logger.info(
+        f"✅ Webhook установлен: {url} (max_connections={settings.webhook_max_connections})"
+    )
@@ -0,0 +1,138 @@
+"""
+Индекс для валидации действий, паков и emoji
+
+Множества (frozenset) названий в casefold - проверка O(1) без
+пересборки списков на каждый вызов. Источники:
+- паки единого каталога (bot/core/catalog.py, catalog.packs) -
+  пересобирается, когда get_catalog() вернул другой каталог
+  (горячая перезагрузка). Действия каталога без пака (известные
+  только склонятору или actions.json) не допускаются, как и раньше
+  с settings.actions
+- действия из БД - sync_db() при каждой загрузке списка действий
+  (прогрев контейнера, ActionService.get_all_actions - и из БД,
+  и из общего кэша Redis), add() - сразу после создания действия
+
+Индекс заменяется целиком (одно присваивание) - читатели видят
+либо старый, либо новый снимок.
+"""
+
+import logging
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+
+from bot.core.catalog import Catalog, get_catalog
+
+logger = logging.getLogger(__name__)
+
+
+class ValidationSnapshot:
+    """Неизменяемый снимок множеств для проверок"""
+
+    __slots__ = ("version", "actions", "packs", "emojis")
+
+    def __init__(
+        self,
+        version: str,
+        actions: FrozenSet[str],
+        packs: FrozenSet[str],
+        emojis: FrozenSet[str],
+    ):
+        self.version = version
+        self.actions = actions
+        self.packs = packs
+        self.emojis = emojis
+
+    @classmethod
+    def build(
+        cls, catalog: Catalog, db_actions: Iterable[Dict[str, Any]] = ()
+    ) -> "ValidationSnapshot":
+        actions = set()
+        packs = set()
+        emojis = set()
+
+        for pack, names in catalog.packs.items():
+            packs.add(pack.casefold())
+            for name in names:
+                actions.add(name.casefold())
+                emojis.add(catalog.get(name)["emoji"])
+
+        for action in db_actions:
+            actions.add(action["name"].casefold())
+            if action.get("pack"):
+                packs.add(action["pack"].casefold())
+            if action.get("emoji"):
+                emojis.add(action["emoji"])
+
+        return cls(catalog.version, frozenset(actions), frozenset(packs), frozenset(emojis))
+
+    def covers(self, action: Dict[str, Any]) -> bool:
+        """Действие из БД уже учтено в снимке"""
+        return (
+            action["name"].casefold() in self.actions
+            and (not action.get("pack") or action["pack"].casefold() in self.packs)
+            and (not action.get("emoji") or action["emoji"] in self.emojis)
+        )
+
+
+class ActionIndex:
+    """Индекс, синхронизированный с каталогом и БД"""
+
+    def __init__(self):
+        self._catalog: Optional[Catalog] = None
+        self._db_actions: tuple = ()
+        self._snapshot: Optional[ValidationSnapshot] = None
+
+    @property
+    def snapshot(self) -> ValidationSnapshot:
+        """Текущий снимок (пересобирается при смене каталога)"""
+        catalog = get_catalog()
+        if catalog is not self._catalog:
+            self._rebuild(catalog, self._db_actions)
+        return self._snapshot
+
+    def _rebuild(self, catalog: Catalog, db_actions: tuple) -> None:
+        snapshot = ValidationSnapshot.build(catalog, db_actions)
+        self._snapshot, self._catalog, self._db_actions = snapshot, catalog, db_actions
+        logger.debug(
+            f"📦 Индекс валидации: {len(snapshot.actions)} действий, "
+            f"{len(snapshot.packs)} паков (каталог {snapshot.version}, "
+            f"из БД {len(db_actions)})"
+        )
+
+    def sync_db(self, actions: Iterable[Dict[str, Any]]) -> None:
+        """
+        Учесть действия, загруженные из БД (или из общего кэша)
+
+        Тот же список, что уже учтён, снимок не пересобирает.
+
+        Args:
+            actions: Список действий (ActionRepository.get_all_active)
+        """
+        actions = tuple(actions)
+        catalog = get_catalog()
+        if catalog is self._catalog and actions == self._db_actions:
+            return
+        self._rebuild(catalog, actions)
+
+    def add(self, action: Dict[str, Any]) -> None:
+        """
+        Учесть одно новое действие из БД (сразу после создания)
+
+        Args:
+            action: Действие в формате ActionRepository
+        """
+        if self.snapshot.covers(action):
+            return
+        self._rebuild(get_catalog(), self._db_actions + (action,))
+
+    def has_action(self, name: str) -> bool:
+        return name.casefold() in self.snapshot.actions
+
+    def has_pack(self, name: str) -> bool:
+        return name.casefold() in self.snapshot.packs
+
+    def has_emoji(self, emoji: str) -> bool:
+        return emoji in self.snapshot.emojis
+
+
+# Глобальный экземпляр
+action_index = ActionIndex()
@@ -0,0 +1,498 @@
+"""
+Единый каталог действий
+
+Данные о действиях собираются из всех источников в один
+проверенный версионированный артефакт bot/data/catalog.json:
+- bot/data/action_tables.json - паки, emoji, формы глаголов, сокращения
+- bot/data/actions.json - категории и шаблоны текстов с учётом пола
+- таблица actions в БД (опционально, --with-db) - id, порядок, пак
+
+Приоритет полей: БД → actions.json → таблицы конфигурации.
+
+Формы для текстов из БД (past_tense, genitive_noun: "обнял",
+"объятия") и формы склонятора (verb_*: "обнял(а)", "обнимания",
+bot/utils/conjugator.py) - разные колонки, одни не перезаписывают другие.
+
+СБОРКА:
+    python -m scripts.build_catalog
+    python -m scripts.build_catalog --with-db
+
+Формат компактный: список полей и строки-массивы (без повторения
+ключей), JSON без пробелов - json.loads читает его быстрее, чем
+собирать каталог из исходников. Версия - хэш содержимого.
+
+Во время работы каталог читается один раз (get_catalog) и разделяется
+всеми потребителями: settings.action_*, склонения, ActionService.
+Если actions.json или action_tables.json изменились после сборки (не
+совпадает хэш), каталог собирается из исходников в памяти с
+предупреждением; действия из БД (--with-db) переносятся из устаревшего
+артефакта.
+
+ТАБЛИЦЫ (action_tables.json):
+    packs          {пак: [действия]}
+    emojis         {действие: emoji}
+    forms          {действие: {"past": ..., "noun": ...}} - формы для текстов БД
+    verb_forms     {действие: [инфинитив, прошедшее время, родительный падеж]}
+    present_forms  {действие: настоящее время} - для format_action_text
+    short_names    {действие: сокращённое название}
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from string import Formatter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FORMAT = 2
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+CATALOG_PATH = DATA_DIR / "catalog.json"
+ACTIONS_JSON_PATH = DATA_DIR / "actions.json"
+TABLES_PATH = DATA_DIR / "action_tables.json"
+TABLES_SECTIONS = ("packs", "emojis", "forms", "verb_forms", "present_forms", "short_names")
+
+DEFAULT_EMOJI = "✨"
+TEMPLATE_FIELDS = frozenset({"user1", "user2"})
+
+# Порядок колонок в артефакте
+FIELDS = (
+    "name",
+    "emoji",
+    "pack",
+    "category",
+    "display_order",
+    "infinitive",
+    "past_tense",
+    "genitive_noun",
+    "short_name",
+    "verb_infinitive",
+    "verb_past",
+    "verb_genitive",
+    "verb_present",
+    "inline_text",
+    "accepted",
+    "rejected",
+    "json_id",
+    "db_id",
+)
+
+# Подпись источников для горячей перезагрузки: (mtime_ns, размер) файлов
+CatalogSignature = Tuple[Optional[Tuple[int, int]], ...]
+
+
+# ========== КАТАЛОГ ==========
+
+
+class Catalog:
+    """Загруженный каталог (неизменяемый, общий для всех потребителей)"""
+
+    def __init__(self, payload: Dict[str, Any]):
+        """
+        Args:
+            payload: Проверенное содержимое артефакта (validate_payload)
+        """
+        self.version: str = payload["version"]
+        self.built_at: float = payload.get("built_at", 0.0)
+        self.sources: Dict[str, Any] = payload.get("sources", {})
+        self.packs: Dict[str, List[str]] = payload["packs"]
+
+        fields = payload["fields"]
+        self.actions: List[Dict[str, Any]] = [
+            dict(zip(fields, row)) for row in payload["actions"]
+        ]
+        self.by_name: Dict[str, Dict[str, Any]] = {
+            action["name"].casefold(): action for action in self.actions
+        }
+
+        # Производные таблицы (совместимость с settings.action_*)
+        self.names: List[str] = [name for names in self.packs.values() for name in names]
+        self.emojis: Dict[str, str] = {a["name"]: a["emoji"] for a in self.actions}
+        self.forms: Dict[str, Dict[str, str]] = {
+            a["name"]: {"past": a["past_tense"], "noun": a["genitive_noun"]}
+            for a in self.actions
+        }
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Действие по названию (без учёта регистра)"""
+        return self.by_name.get(name.casefold())
+
+    def json_actions(self) -> List[Dict[str, Any]]:
+        """Действия с шаблонами в формате actions.json"""
+        return [
+            {
+                "id": a["json_id"],
+                "name": a["name"],
+                "emoji": a["emoji"],
+                "category": a["category"],
+                "inline_text": a["inline_text"],
+                "accepted": a["accepted"],
+                "rejected": a["rejected"],
+            }
+            for a in self.actions
+            if a["json_id"] is not None
+        ]
+
+    def db_actions(self) -> List[Dict[str, Any]]:
+        """Действия из БД в формате ActionRepository (для снимка каталога)"""
+        return [
+            {
+                "id": a["db_id"],
+                "name": a["name"],
+                "emoji": a["emoji"],
+                "infinitive": a["infinitive"],
+                "past_tense": a["past_tense"],
+                "genitive_noun": a["genitive_noun"],
+                "display_order": a["display_order"],
+                "pack": a["pack"],
+            }
+            for a in self.actions
+            if a["db_id"] is not None
+        ]
+
+
+# ========== СБОРКА ==========
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _read_actions_json(path: Path) -> Tuple[Dict[str, Any], str]:
+    raw = path.read_bytes()
+    try:
+        return json.loads(raw), _sha256(raw)
+    except ValueError as e:
+        raise ValueError(f"{path.name}: ошибка парсинга JSON: {e}")
+
+
+def _read_tables(path: Path) -> Tuple[Dict[str, Dict[str, Any]], str]:
+    """
+    Таблицы action_tables.json
+
+    Хэш и данные берутся из одного и того же содержимого файла, поэтому
+    правка таблиц видна без перезапуска процесса.
+    """
+    raw = path.read_bytes()
+    try:
+        tables = json.loads(raw)
+    except ValueError as e:
+        raise ValueError(f"{path.name}: ошибка парсинга JSON: {e}")
+    for section in TABLES_SECTIONS:
+        if not isinstance(tables.get(section), dict):
+            raise ValueError(f"{path.name}: нет таблицы '{section}'")
+    return tables, _sha256(raw)
+
+
+def build_catalog(
+    db_actions: Optional[Iterable[Dict[str, Any]]] = None,
+    actions_json_path: Path = ACTIONS_JSON_PATH,
+    tables_path: Path = TABLES_PATH,
+) -> Dict[str, Any]:
+    """
+    Собрать каталог из всех источников
+
+    Args:
+        db_actions: Действия из БД (ActionRepository.get_all_active) или None
+        actions_json_path: Путь к actions.json
+        tables_path: Путь к action_tables.json
+
+    Returns:
+        Dict: Проверенное содержимое артефакта
+
+    Raises:
+        ValueError: Ошибка в исходных данных
+    """
+    tables, tables_sha = _read_tables(tables_path)
+    actions_json, actions_json_sha = _read_actions_json(actions_json_path)
+    merged: Dict[str, Dict[str, Any]] = {}
+
+    def entry(name: str) -> Dict[str, Any]:
+        key = name.strip().casefold()
+        if key not in merged:
+            merged[key] = dict.fromkeys(FIELDS)
+            merged[key]["name"] = name.strip()
+        return merged[key]
+
+    # 1. Таблицы конфигурации (самый низкий приоритет)
+    order = 0
+    for pack, names in tables["packs"].items():
+        for name in names:
+            e = entry(name)
+            e["pack"] = pack
+            e["display_order"] = order
+            order += 1
+
+    # Формы склонятора - отдельные колонки verb_*; они же - значения
+    # по умолчанию для форм текстов
+    for name, (infinitive, past, genitive) in tables["verb_forms"].items():
+        e = entry(name)
+        e["verb_infinitive"] = e["infinitive"] = infinitive
+        e["verb_past"] = e["past_tense"] = past
+        e["verb_genitive"] = e["genitive_noun"] = genitive
+
+    for name, present in tables["present_forms"].items():
+        entry(name)["verb_present"] = present
+
+    # Формы текстов из конфигурации (как при переносе config.py → БД)
+    for name, forms in tables["forms"].items():
+        e = entry(name)
+        e["past_tense"] = forms.get("past") or e["past_tense"]
+        e["genitive_noun"] = forms.get("noun") or e["genitive_noun"]
+
+    for name, emoji in tables["emojis"].items():
+        entry(name)["emoji"] = emoji
+
+    for name, short_name in tables["short_names"].items():
+        entry(name)["short_name"] = short_name
+
+    # 2. actions.json: категории, шаблоны текстов
+    for action in actions_json.get("actions", []):
+        e = entry(action["name"])
+        e["json_id"] = action["id"]
+        e["emoji"] = action.get("emoji") or e["emoji"]
+        e["category"] = action.get("category")
+        e["inline_text"] = action.get("inline_text")
+        e["accepted"] = action.get("accepted")
+        e["rejected"] = action.get("rejected")
+
+    # 3. БД (самый высокий приоритет)
+    db_count = 0
+    for action in db_actions or ():
+        db_count += 1
+        e = entry(action["name"])
+        e["db_id"] = action["id"]
+        for field in ("emoji", "infinitive", "past_tense", "genitive_noun", "pack"):
+            if action.get(field):
+                e[field] = action[field]
+        if action.get("display_order") is not None:
+            e["display_order"] = action["display_order"]
+
+    # Значения по умолчанию (как в прежней миграции config.py → БД)
+    for e in merged.values():
+        lowered = e["name"].lower()
+        e["emoji"] = e["emoji"] or DEFAULT_EMOJI
+        e["infinitive"] = e["infinitive"] or lowered
+        e["past_tense"] = e["past_tense"] or lowered
+        e["genitive_noun"] = e["genitive_noun"] or lowered
+        if e["display_order"] is None:
+            e["display_order"] = order
+            order += 1
+
+    actions = sorted(merged.values(), key=lambda a: (a["display_order"], a["name"]))
+
+    packs: Dict[str, List[str]] = {}
+    for action in actions:
+        if action["pack"]:
+            packs.setdefault(action["pack"], []).append(action["name"])
+
+    payload = {
+        "format": CATALOG_FORMAT,
+        "sources": {
+            "actions_json_sha256": actions_json_sha,
+            "tables_sha256": tables_sha,
+            "actions_json_version": actions_json.get("version"),
+            "db_actions": db_count if db_actions is not None else None,
+        },
+        "packs": packs,
+        "fields": list(FIELDS),
+        "actions": [[action[field] for field in FIELDS] for action in actions],
+    }
+    payload["version"] = catalog_version(payload)
+    payload["built_at"] = time.time()
+
+    validate_payload(payload)
+    return payload
+
+
+def catalog_version(payload: Dict[str, Any]) -> str:
+    """Версия - хэш содержимого (без времени сборки)"""
+    content = {key: payload[key] for key in ("format", "packs", "fields", "actions")}
+    raw = json.dumps(content, ensure_ascii=False, sort_keys=True)
+    return _sha256(raw.encode("utf-8"))[:12]
+
+
+# ========== ПРОВЕРКА ==========
+
+
+def _check_template(name: str, template: Any) -> None:
+    if not isinstance(template, str):
+        raise ValueError(f"{name}: шаблон должен быть строкой")
+    for _, field, spec, conversion in Formatter().parse(template):
+        if field is not None and (field not in TEMPLATE_FIELDS or spec or conversion):
+            raise ValueError(f"{name}: недопустимое поле шаблона {{{field}}}")
+
+
+def validate_payload(payload: Dict[str, Any]) -> None:
+    """
+    Проверить артефакт каталога
+
+    Raises:
+        ValueError: Неверный формат, дубли, пустые поля, ошибки шаблонов
+    """
+    if payload.get("format") != CATALOG_FORMAT:
+        raise ValueError(f"Каталог: неподдерживаемый формат {payload.get('format')!r}")
+    if payload.get("fields") != list(FIELDS):
+        raise ValueError("Каталог: неожиданный набор полей, пересоберите каталог")
+
+    names = set()
+    json_ids = set()
+    db_ids = set()
+    for row in payload["actions"]:
+        if len(row) != len(FIELDS):
+            raise ValueError(f"Каталог: неверная длина строки {row!r}")
+        action = dict(zip(FIELDS, row))
+        name = action["name"]
+        if not name or not isinstance(name, str):
+            raise ValueError(f"Каталог: пустое название действия {row!r}")
+
+        key = name.casefold()
+        if key in names:
+            raise ValueError(f"Каталог: повторяется название {name!r}")
+        names.add(key)
+
+        for field in ("emoji", "infinitive", "past_tense", "genitive_noun"):
+            if not action[field]:
+                raise ValueError(f"{name}: пустое поле {field}")
+
+        if action["json_id"] is not None:
+            if action["json_id"] in json_ids:
+                raise ValueError(f"Каталог: повторяется id actions.json {action['json_id']}")
+            json_ids.add(action["json_id"])
+            _check_template(f"{name}.inline_text", action["inline_text"])
+            for key in ("accepted", "rejected"):
+                templates = action[key]
+                if not isinstance(templates, dict) or "male" not in templates:
+                    raise ValueError(f"{name}: нет шаблона {key}.male")
+                for gender, template in templates.items():
+                    _check_template(f"{name}.{key}.{gender}", template)
+
+        if action["db_id"] is not None:
+            if action["db_id"] in db_ids:
+                raise ValueError(f"Каталог: повторяется id БД {action['db_id']}")
+            db_ids.add(action["db_id"])
+
+    for pack, pack_names in payload["packs"].items():
+        for name in pack_names:
+            if name.casefold() not in names:
+                raise ValueError(f"Пак {pack!r}: неизвестное действие {name!r}")
+
+    if payload.get("version") != catalog_version(payload):
+        raise ValueError("Каталог: версия не совпадает с содержимым")
+
+
+# ========== ЧТЕНИЕ / ЗАПИСЬ ==========
+
+
+def write_catalog(payload: Dict[str, Any], path: Path = CATALOG_PATH) -> None:
+    """Атомарная запись артефакта (tmp + replace)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def read_catalog(path: Path = CATALOG_PATH) -> Dict[str, Any]:
+    """Прочитать и проверить артефакт"""
+    with open(path, "rb") as f:
+        try:
+            payload = json.loads(f.read())
+        except ValueError as e:
+            raise ValueError(f"{path.name}: ошибка парсинга JSON: {e}")
+    validate_payload(payload)
+    return payload
+
+
+def catalog_signature(
+    path: Path = CATALOG_PATH,
+    actions_json_path: Path = ACTIONS_JSON_PATH,
+    tables_path: Path = TABLES_PATH,
+) -> CatalogSignature:
+    """mtime и размер артефакта, actions.json и action_tables.json (None - файла нет)"""
+    signature = []
+    for file in (path, actions_json_path, tables_path):
+        try:
+            stat = file.stat()
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def load_catalog(
+    path: Path = CATALOG_PATH,
+    actions_json_path: Path = ACTIONS_JSON_PATH,
+    tables_path: Path = TABLES_PATH,
+) -> Catalog:
+    """
+    Загрузить каталог: артефакт, если он соответствует actions.json
+    и action_tables.json, иначе сборка из исходников в памяти
+
+    Действия из БД, вшитые в устаревший артефакт (--with-db), переносятся
+    в новую сборку. Без артефакта каталог собирается без данных БД.
+
+    Raises:
+        ValueError: Исходники содержат ошибку (артефакт устарел и не собирается)
+    """
+    db_actions = None
+    try:
+        payload = read_catalog(path)
+        sources = payload["sources"]
+        stale = [
+            source.name
+            for source, key in (
+                (actions_json_path, "actions_json_sha256"),
+                (tables_path, "tables_sha256"),
+            )
+            if sources.get(key) != _sha256(source.read_bytes())
+        ]
+        if not stale:
+            return Catalog(payload)
+        if sources.get("db_actions") is not None:
+            db_actions = Catalog(payload).db_actions()
+        logger.warning(
+            f"⚠️ {path.name} устарел (изменены: {', '.join(stale)}), собираем каталог "
+            f"в памяти (действия из БД - из артефакта: {len(db_actions or ())}). "
+            f"Пересоберите: python -m scripts.build_catalog"
+        )
+    except FileNotFoundError:
+        logger.warning(
+            f"⚠️ {path.name} не найден, собираем каталог из исходников без данных БД"
+        )
+    except (OSError, ValueError) as e:
+        logger.warning(
+            f"⚠️ {path.name} не прочитан ({e}), собираем каталог из исходников "
+            f"без данных БД"
+        )
+
+    return Catalog(
+        build_catalog(db_actions, actions_json_path=actions_json_path, tables_path=tables_path)
+    )
+
+
+# ========== ГЛОБАЛЬНЫЙ ЭКЗЕМПЛЯР ==========
+
+_catalog: Optional[Catalog] = None
+
+
+def get_catalog() -> Catalog:
+    """Каталог, загружаемый при первом обращении"""
+    global _catalog
+    if _catalog is None:
+        _catalog = load_catalog()
+        logger.debug(f"📦 Каталог {_catalog.version}: {len(_catalog)} действий")
+    return _catalog
+
+
+def set_catalog(catalog: Catalog) -> None:
+    """Атомарно заменить каталог (горячая перезагрузка)"""
+    global _catalog
+    _catalog = catalog
@@ -0,0 +1,236 @@
+"""
+Circuit breaker для внешних зависимостей (Redis)
+
+СОСТОЯНИЯ:
+- closed - запросы идут в зависимость, ошибки считаются
+- open - после N ошибок подряд запросы сразу отклоняются (fail fast)
+- half_open - после паузы пропускается пробный запрос:
+  успех закрывает breaker, ошибка снова открывает
+
+Используется кэшем, FSM хранилищем и всеми остальными вызовами Redis,
+чтобы недоступный Redis не добавлял socket timeout к каждому апдейту.
+"""
+
+import asyncio
+import logging
+import time
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from redis.exceptions import RedisError
+
+from bot.core.config import settings
+from bot.core.metrics import counter, gauge, histogram
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+BREAKER_STATE = gauge(
+    "bot_circuit_breaker_state",
+    "Состояние circuit breaker (0 - closed, 1 - half_open, 2 - open)",
+    ("breaker",),
+)
+BREAKER_TRANSITIONS = counter(
+    "bot_circuit_breaker_transitions_total",
+    "Переходы circuit breaker между состояниями",
+    ("breaker", "state"),
+)
+DEPENDENCY_CALL_DURATION = histogram(
+    "bot_dependency_call_seconds",
+    "Латентность вызовов внешних зависимостей через circuit breaker",
+    ("dependency", "result"),
+)
+BREAKER_REJECTED = counter(
+    "bot_circuit_breaker_rejected_total",
+    "Вызовы, отклонённые открытым circuit breaker",
+    ("breaker",),
+)
+
+
+class BreakerState(str, Enum):
+    """Состояние circuit breaker"""
+
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+
+
+_STATE_VALUES = {
+    BreakerState.CLOSED: 0,
+    BreakerState.HALF_OPEN: 1,
+    BreakerState.OPEN: 2,
+}
+
+
+class CircuitOpenError(Exception):
+    """Вызов отклонён: breaker открыт"""
+
+
+class CircuitBreaker:
+    """Circuit breaker с состояниями closed / open / half_open"""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        call_timeout: Optional[float] = None,
+        failure_exceptions: tuple[type[BaseException], ...] = (
+            RedisError,
+            OSError,
+            asyncio.TimeoutError,
+        ),
+    ):
+        """
+        Args:
+            name: Имя breaker (для логов и метрик)
+            failure_threshold: Ошибок подряд до открытия
+            recovery_timeout: Пауза перед пробным запросом (секунды)
+            call_timeout: Таймаут одного вызова (секунды, None - без таймаута)
+            failure_exceptions: Исключения, считающиеся отказом зависимости
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.call_timeout = call_timeout
+        self.failure_exceptions = failure_exceptions
+
+        self._state = BreakerState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+        BREAKER_STATE.set(0, breaker=name)
+
+    # ========== СОСТОЯНИЕ ==========
+
+    @property
+    def state(self) -> BreakerState:
+        """Текущее состояние (open переходит в half_open по таймауту)"""
+        if (
+            self._state == BreakerState.OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._transition(BreakerState.HALF_OPEN)
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """True если вызовы сейчас отклоняются"""
+        return self.state == BreakerState.OPEN
+
+    def _transition(self, state: BreakerState) -> None:
+        """Сменить состояние с учётом метрик и логов"""
+        if self._state == state:
+            return
+
+        self._state = state
+        BREAKER_STATE.set(_STATE_VALUES[state], breaker=self.name)
+        BREAKER_TRANSITIONS.inc(breaker=self.name, state=state.value)
+
+        if state == BreakerState.OPEN:
+            self._opened_at = time.monotonic()
+            logger.warning(
+                f"⚠️ Circuit breaker '{self.name}' открыт на {self.recovery_timeout:.0f} с"
+            )
+        elif state == BreakerState.CLOSED:
+            logger.info(f"✅ Circuit breaker '{self.name}' закрыт")
+
+    def allow_request(self) -> bool:
+        """
+        Можно ли выполнить вызов прямо сейчас
+
+        В состоянии half_open пропускается только один пробный вызов.
+        """
+        state = self.state
+
+        if state == BreakerState.CLOSED:
+            return True
+
+        if state == BreakerState.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+
+        BREAKER_REJECTED.inc(breaker=self.name)
+        return False
+
+    def record_success(self) -> None:
+        """Успешный вызов"""
+        self._failures = 0
+        self._probe_in_flight = False
+        self._transition(BreakerState.CLOSED)
+
+    def record_failure(self) -> None:
+        """Неуспешный вызов"""
+        self._probe_in_flight = False
+
+        if self._state == BreakerState.HALF_OPEN:
+            self._transition(BreakerState.OPEN)
+            return
+
+        self._failures += 1
+        if self._failures >= self.failure_threshold:
+            self._transition(BreakerState.OPEN)
+
+    # ========== ВЫЗОВ ==========
+
+    async def call(self, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Выполнить вызов через breaker
+
+        Args:
+            func: Фабрика корутины (вызывается только если breaker пропускает)
+
+        Returns:
+            Результат вызова
+
+        Raises:
+            CircuitOpenError: breaker открыт
+            asyncio.TimeoutError: вызов не уложился в call_timeout
+        """
+        if not self.allow_request():
+            raise CircuitOpenError(f"Circuit breaker '{self.name}' is open")
+
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            if self.call_timeout:
+                result = await asyncio.wait_for(func(), timeout=self.call_timeout)
+            else:
+                result = await func()
+        except self.failure_exceptions:
+            self.record_failure()
+            raise
+        except BaseException:
+            # Отмена и ошибки вызывающего кода не являются отказом зависимости
+            self._probe_in_flight = False
+            raise
+        else:
+            outcome = "ok"
+        finally:
+            DEPENDENCY_CALL_DURATION.observe(
+                time.perf_counter() - start, dependency=self.name, result=outcome
+            )
+
+        self.record_success()
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Состояние для /ready и /metrics"""
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self._failures,
+            "failure_threshold": self.failure_threshold,
+            "recovery_timeout_seconds": self.recovery_timeout,
+        }
+
+
+# ========== ОБЩИЙ BREAKER ДЛЯ REDIS ==========
+
+redis_breaker = CircuitBreaker(
+    "redis",
+    failure_threshold=settings.redis_breaker_failure_threshold,
+    recovery_timeout=settings.redis_breaker_recovery_timeout,
+    call_timeout=settings.redis_operation_timeout,
+)
@@ -3,7 +3,7 @@
 """
 
 from __future__ import annotations
-from typing import Annotated
+from typing import Annotated, Literal
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -21,6 +21,48 @@ class Settings(BaseSettings):
     bot_token: Annotated[str, Field(min_length=20)]
     admin_id: Annotated[int, Field(gt=0)]
 
+    # === UPDATES (polling / webhook) ===
+    bot_mode: Annotated[Literal["polling", "webhook"], Field(default="polling")]
+    # Публичный адрес без пути, например https://bot.example.com
+    webhook_url: Annotated[str | None, Field(default=None)]
+    webhook_path: Annotated[str, Field(default="/webhook", pattern=r"^/")]
+    webhook_secret: Annotated[
+        str | None, Field(default=None, pattern=r"^[A-Za-z0-9_-]{1,256}$")
+    ]
+    webhook_max_connections: Annotated[int, Field(default=40, ge=1, le=100)]
+    # Сбросить накопленные апдейты при установке webhook (по умолчанию
+    # Telegram хранит их на время перезапуска/деплоя)
+    webhook_drop_pending_updates: Annotated[bool, Field(default=False)]
+
+    # === SHUTDOWN ===
+    # Дедлайн drain: handlers, отложенные записи, очередь отправки
+    shutdown_drain_timeout: Annotated[float, Field(default=8.0, gt=0)]
+    # Скорость очереди рассылок (сообщений в секунду)
+    send_queue_rate: Annotated[float, Field(default=25.0, gt=0)]
+
+    # === SCHEDULER (порядок по пользователю, backpressure) ===
+    scheduler_enabled: Annotated[bool, Field(default=True)]
+    scheduler_max_in_flight: Annotated[int, Field(default=64, ge=1)]
+    # Глубина очереди, после которой апдейты сбрасываются
+    scheduler_max_queue: Annotated[int, Field(default=1000, ge=1)]
+
+    # === SCALE-OUT (Redis Streams: ingest -> workers) ===
+    # all - получать и обрабатывать в одном процессе
+    bot_role: Annotated[Literal["all", "ingest", "worker"], Field(default="all")]
+    update_stream_prefix: Annotated[str, Field(default="bot:updates")]
+    update_stream_partitions: Annotated[int, Field(default=4, ge=1)]
+    update_stream_group: Annotated[str, Field(default="workers")]
+    update_stream_maxlen: Annotated[int, Field(default=100_000, ge=1)]
+    update_stream_batch: Annotated[int, Field(default=10, ge=1)]
+    update_stream_block_ms: Annotated[int, Field(default=2000, ge=1)]
+    update_stream_claim_idle_ms: Annotated[int, Field(default=60_000, ge=1)]
+    update_stream_max_deliveries: Annotated[int, Field(default=5, ge=1)]
+    # Партиции воркера через запятую, например "0,1" (пусто - все)
+    worker_partitions: Annotated[str | None, Field(default=None)]
+
+    # === HEALTH CHECK SERVER ===
+    health_port: Annotated[int, Field(default=8080, ge=1, le=65535)]
+
     # === DATABASE SETTINGS ===
     database_url: Annotated[
         str, Field(default="sqlite+aiosqlite:///./database/cutebot.db")
@@ -30,12 +72,45 @@ class Settings(BaseSettings):
     db_pool_size: Annotated[int, Field(default=5)]
     db_max_overflow: Annotated[int, Field(default=10)]
     db_pool_timeout: Annotated[int, Field(default=30)]
+    # Ожидание соединения дольше порога (секунды) логируется
+    db_pool_wait_warn_threshold: Annotated[float, Field(default=0.1, ge=0)]
+
+    # Адаптивный max_overflow по p95 ожидания соединения
+    db_pool_adaptive: Annotated[bool, Field(default=False)]
+    db_pool_min_overflow: Annotated[int, Field(default=0, ge=0)]
+    db_pool_max_overflow_limit: Annotated[int, Field(default=30, ge=0)]
+    db_pool_adapt_step: Annotated[int, Field(default=2, ge=1)]
+    db_pool_adapt_interval: Annotated[float, Field(default=30.0, gt=0)]
+    db_pool_adapt_high_wait: Annotated[float, Field(default=0.05, gt=0)]
+    db_pool_adapt_low_wait: Annotated[float, Field(default=0.005, ge=0)]
+
+    # Деградированный режим (БД недоступна)
+    catalog_snapshot_path: Annotated[
+        str, Field(default="./database/catalog_snapshot.json")
+    ]
+    degraded_retry_interval: Annotated[float, Field(default=10.0, gt=0)]
+    degraded_write_queue_size: Annotated[int, Field(default=10_000, ge=1)]
+
+    # Запросы дольше порога (секунды) логируются с формой параметров (0 - выключено)
+    db_slow_query_threshold: Annotated[float, Field(default=0.2, ge=0)]
 
     # === REDIS SETTINGS ===
     redis_host: Annotated[str, Field(default="localhost")]
     redis_port: Annotated[int, Field(default=6379)]
     redis_db: Annotated[int, Field(default=0)]
 
+    # Circuit breaker для Redis (кэш, FSM)
+    redis_operation_timeout: Annotated[float, Field(default=0.5, gt=0)]
+    redis_breaker_failure_threshold: Annotated[int, Field(default=5, ge=1)]
+    redis_breaker_recovery_timeout: Annotated[float, Field(default=30.0, gt=0)]
+
+    # Кэш пола в памяти процесса (Redis hash - общий для процессов)
+    gender_cache_size: Annotated[int, Field(default=50_000, ge=1)]
+    gender_cache_ttl: Annotated[float, Field(default=300.0, gt=0)]
+
+    # Список админов в памяти процесса перечитывается из БД раз в N секунд
+    admin_cache_ttl: Annotated[float, Field(default=60.0, gt=0)]
+
     # === RATE LIMITING ===
     rate_limit_messages: Annotated[int, Field(default=30)]
     rate_limit_window: Annotated[int, Field(default=60)]
@@ -43,261 +118,65 @@ class Settings(BaseSettings):
     # === LOGGING ===
     log_level: Annotated[str, Field(default="INFO")]
 
-    # === ACTIONS (Пакеты действий) ===
-    action_packs: Annotated[
-        dict[str, list[str]],
-        Field(
-            default={
-                "Стандартный пак": [
-                    "Обнять",
-                    "Поцеловать",
-                    "Погладить",
-                    "Ударить",
-                    "Укусить",
-                    "Пощекотать",
-                    "Подмигнуть",
-                    "Улыбнуться",
-                    "Поклониться",
-                    "Пожать руку",
-                    "Обнять сзади",
-                    "Погладить по голове",
-                    "Шлепнуть",
-                    "Толкнуть",
-                    "Потрепать",
-                    "Прижать к себе",
-                    "Чмокнуть в щёчку",
-                    "Похлопать по плечу",
-                    "Взъерошить волосы",
-                    "Приобнять",
-                    "Потискать",
-                    "Прижаться",
-                    "Пнуть",
-                    "Треснуть",
-                    "Дать пощёчину",
-                    "Ущипнуть",
-                    "Лизнуть",
-                    "Укусить за ухо",
-                    "Поцеловать в лоб",
-                    "Поцеловать в щёку",
-                    "Поцеловать в руку",
-                    "Поцеловать в шею",
-                    "Обнять за талию",
-                    "Взять за руку",
-                    "Переплести пальцы",
-                    "Прислониться",
-                    "Положить голову на плечо",
-                    "Погладить по щеке",
-                    "Погладить по спине",
-                    "Помассировать плечи",
-                    "Потрепать по волосам",
-                    "Провести рукой по волосам",
-                    "Ткнуть в нос",
-                    "Ткнуть в бок",
-                    "Потрогать",
-                    "Пощупать",
-                    "Дёрнуть за волосы",
-                    "Дёрнуть за ухо",
-                    "Покусать",
-                    "Покусать за губу",
-                    "Схватить",
-                    "Прижать к стене",
-                    "Швырнуть",
-                    "Бросить",
-                    "Отпихнуть",
-                    "Отшвырнуть",
-                    "Дать пять",
-                    "Кулачок",
-                    "Поднять на руки",
-                    "Подхватить",
-                    "Закружить",
-                    "Потанцевать",
-                    "Спеть серенаду",
-                    "Кивнуть",
-                    "Махнуть рукой",
-                    "Послать воздушный поцелуй",
-                ]
-            }
-        ),
-    ]
+    # === TRACING (JSONL трассировки апдейтов) ===
+    trace_sample_rate: Annotated[float, Field(default=0.01, ge=0, le=1)]
+    trace_file_path: Annotated[str, Field(default="logs/traces.jsonl")]
+    trace_max_bytes: Annotated[int, Field(default=10 * 1024 * 1024, gt=0)]
+    trace_backup_count: Annotated[int, Field(default=5, ge=0)]
+
+    # === EVENT LOOP MONITOR ===
+    loop_lag_interval: Annotated[float, Field(default=0.5, gt=0)]
+    # Детектор блокировок (heartbeat + сторожевой поток) - только по запросу
+    loop_block_detector: Annotated[bool, Field(default=False)]
+    # Блокировка loop дольше порога логируется со стеком (0 - выключено)
+    loop_block_threshold: Annotated[float, Field(default=0.1, ge=0)]
+
+    # === DEBUG ENDPOINTS (/debug/*, без токена выключены) ===
+    debug_token: Annotated[str | None, Field(default=None)]
+    debug_tracemalloc_frames: Annotated[int, Field(default=10, ge=1)]
+
+    # === HEALTH CHECKS (/ready) ===
+    readiness_cache_ttl: Annotated[float, Field(default=15.0, gt=0)]
+    readiness_check_timeout: Annotated[float, Field(default=2.0, gt=0)]
+    # Интервал фоновой проверки (0 - проверять только по запросу)
+    readiness_probe_interval: Annotated[float, Field(default=5.0, ge=0)]
+
+    # === ACTIONS.JSON ===
+    # Интервал опроса bot/data/actions.json для горячей перезагрузки (0 - выключено)
+    actions_reload_interval: Annotated[float, Field(default=5.0, ge=0)]
+
+    # === ACTIONS (Пакеты действий, emoji, формы глаголов) ===
+    # Данные берутся из единого каталога (bot/core/catalog.py), который
+    # загружается при первом обращении и общий для всех сервисов
+
+    @property
+    def action_packs(self) -> dict[str, list[str]]:
+        """Паки действий: название пака → список действий"""
+        from bot.core.catalog import get_catalog
+
+        return get_catalog().packs
 
     # Совместимость: плоский список всех действий
     @property
     def actions(self) -> list[str]:
         """Получить плоский список всех действий из всех паков"""
-        all_actions = []
-        for pack_actions in self.action_packs.values():
-            all_actions.extend(pack_actions)
-        return all_actions
-
-    # === ACTION EMOJIS ===
-    action_emojis: dict[str, str] = {
-        "Обнять": "🤗",
-        "Поцеловать": "💋",
-        "Погладить": "🤲",
-        "Ударить": "👊",
-        "Укусить": "🦷",
-        "Пощекотать": "🤭",
-        "Подмигнуть": "😉",
-        "Улыбнуться": "😊",
-        "Поклониться": "🙇",
-        "Пожать руку": "🤝",
-        "Обнять сзади": "🫂",
-        "Погладить по голове": "✋",
-        "Шлепнуть": "👋",
-        "Толкнуть": "🫸",
-        "Потрепать": "🤚",
-        "Прижать к себе": "🫂",
-        "Чмокнуть в щёчку": "😘",
-        "Похлопать по плечу": "🤛",
-        "Взъерошить волосы": "💆",
-        "Приобнять": "🤗",
-        "Потискать": "🫂",
-        "Прижаться": "🫂",
-        "Пнуть": "🦶",
-        "Треснуть": "💥",
-        "Дать пощёчину": "✋",
-        "Ущипнуть": "🤏",
-        "Лизнуть": "👅",
-        "Укусить за ухо": "👂",
-        "Поцеловать в лоб": "💋",
-        "Поцеловать в щёку": "😘",
-        "Поцеловать в руку": "💋",
-        "Поцеловать в шею": "💋",
-        "Обнять за талию": "🫂",
-        "Взять за руку": "🤝",
-        "Переплести пальцы": "🤞",
-        "Прислониться": "🫂",
-        "Положить голову на плечо": "🫂",
-        "Погладить по щеке": "🤲",
-        "Погладить по спине": "🤲",
-        "Помассировать плечи": "💆",
-        "Потрепать по волосам": "💆",
-        "Провести рукой по волосам": "💆",
-        "Ткнуть в нос": "👆",
-        "Ткнуть в бок": "👉",
-        "Потрогать": "👆",
-        "Пощупать": "🤚",
-        "Дёрнуть за волосы": "💆",
-        "Дёрнуть за ухо": "👂",
-        "Покусать": "🦷",
-        "Покусать за губу": "💋",
-        "Схватить": "✊",
-        "Прижать к стене": "🫸",
-        "Швырнуть": "🫳",
-        "Бросить": "🫳",
-        "Отпихнуть": "🫸",
-        "Отшвырнуть": "🫳",
-        "Дать пять": "🙌",
-        "Кулачок": "👊",
-        "Поднять на руки": "🫂",
-        "Подхватить": "🫂",
-        "Закружить": "💫",
-        "Потанцевать": "💃",
-        "Спеть серенаду": "🎤",
-        "Кивнуть": "🙂",
-        "Махнуть рукой": "👋",
-        "Послать воздушный поцелуй": "😘",
-    }
-
-    # === ACTION FORMS (спряжения) ===
-    action_forms: dict[str, dict[str, str]] = {
-        "Обнять": {"past": "обнял", "noun": "объятия"},
-        "Поцеловать": {"past": "поцеловал", "noun": "поцелуя"},
-        "Погладить": {"past": "погладил", "noun": "поглаживания"},
-        "Ударить": {"past": "ударил", "noun": "удара"},
-        "Укусить": {"past": "укусил", "noun": "укуса"},
-        "Пощекотать": {"past": "пощекотал", "noun": "щекотки"},
-        "Подмигнуть": {"past": "подмигнул", "noun": "подмигивания"},
-        "Улыбнуться": {"past": "улыбнулся", "noun": "улыбки"},
-        "Поклониться": {"past": "поклонился", "noun": "поклона"},
-        "Пожать руку": {"past": "пожал руку", "noun": "рукопожатия"},
-        "Обнять сзади": {"past": "обнял сзади", "noun": "объятия сзади"},
-        "Погладить по голове": {
-            "past": "погладил по голове",
-            "noun": "поглаживания по голове",
-        },
-        "Шлепнуть": {"past": "шлепнул", "noun": "шлепка"},
-        "Толкнуть": {"past": "толкнул", "noun": "толчка"},
-        "Потрепать": {"past": "потрепал", "noun": "трепки"},
-        "Прижать к себе": {"past": "прижал к себе", "noun": "прижимания"},
-        "Чмокнуть в щёчку": {"past": "чмокнул в щёчку", "noun": "чмока в щёчку"},
-        "Похлопать по плечу": {
-            "past": "похлопал по плечу",
-            "noun": "похлопывания по плечу",
-        },
-        "Взъерошить волосы": {
-            "past": "взъерошил волосы",
-            "noun": "взъерошивания волос",
-        },
-        "Приобнять": {"past": "приобнял", "noun": "приобнимания"},
-        "Потискать": {"past": "потискал", "noun": "тисканья"},
-        "Прижаться": {"past": "прижался", "noun": "прижимания"},
-        "Пнуть": {"past": "пнул", "noun": "пинка"},
-        "Треснуть": {"past": "треснул", "noun": "треска"},
-        "Дать пощёчину": {"past": "дал пощёчину", "noun": "пощёчины"},
-        "Ущипнуть": {"past": "ущипнул", "noun": "щипка"},
-        "Лизнуть": {"past": "лизнул", "noun": "лизания"},
-        "Укусить за ухо": {"past": "укусил за ухо", "noun": "укуса за ухо"},
-        "Поцеловать в лоб": {"past": "поцеловал в лоб", "noun": "поцелуя в лоб"},
-        "Поцеловать в щёку": {"past": "поцеловал в щёку", "noun": "поцелуя в щёку"},
-        "Поцеловать в руку": {"past": "поцеловал в руку", "noun": "поцелуя в руку"},
-        "Поцеловать в шею": {"past": "поцеловал в шею", "noun": "поцелуя в шею"},
-        "Обнять за талию": {"past": "обнял за талию", "noun": "объятия за талию"},
-        "Взять за руку": {"past": "взял за руку", "noun": "взятия за руку"},
-        "Переплести пальцы": {
-            "past": "переплёл пальцы",
-            "noun": "переплетения пальцев",
-        },
-        "Прислониться": {"past": "прислонился", "noun": "прислонения"},
-        "Положить голову на плечо": {
-            "past": "положил голову на плечо",
-            "noun": "положения головы на плечо",
-        },
-        "Погладить по щеке": {
-            "past": "погладил по щеке",
-            "noun": "поглаживания по щеке",
-        },
-        "Погладить по спине": {
-            "past": "погладил по спине",
-            "noun": "поглаживания по спине",
-        },
-        "Помассировать плечи": {"past": "помассировал плечи", "noun": "массажа плеч"},
-        "Потрепать по волосам": {
-            "past": "потрепал по волосам",
-            "noun": "трепки по волосам",
-        },
-        "Провести рукой по волосам": {
-            "past": "провёл рукой по волосам",
-            "noun": "проведения рукой по волосам",
-        },
-        "Ткнуть в нос": {"past": "ткнул в нос", "noun": "тыка в нос"},
-        "Ткнуть в бок": {"past": "ткнул в бок", "noun": "тыка в бок"},
-        "Потрогать": {"past": "потрогал", "noun": "трогания"},
-        "Пощупать": {"past": "пощупал", "noun": "щупания"},
-        "Дёрнуть за волосы": {"past": "дёрнул за волосы", "noun": "дёргания за волосы"},
-        "Дёрнуть за ухо": {"past": "дёрнул за ухо", "noun": "дёргания за ухо"},
-        "Покусать": {"past": "покусал", "noun": "покусывания"},
-        "Покусать за губу": {"past": "покусал за губу", "noun": "покусывания за губу"},
-        "Схватить": {"past": "схватил", "noun": "схватывания"},
-        "Прижать к стене": {"past": "прижал к стене", "noun": "прижимания к стене"},
-        "Швырнуть": {"past": "швырнул", "noun": "швыряния"},
-        "Бросить": {"past": "бросил", "noun": "бросания"},
-        "Отпихнуть": {"past": "отпихнул", "noun": "отпихивания"},
-        "Отшвырнуть": {"past": "отшвырнул", "noun": "отшвыривания"},
-        "Дать пять": {"past": "дал пять", "noun": "дачи пяти"},
-        "Кулачок": {"past": "стукнул кулачком", "noun": "кулачка"},
-        "Поднять на руки": {"past": "поднял на руки", "noun": "поднятия на руки"},
-        "Подхватить": {"past": "подхватил", "noun": "подхватывания"},
-        "Закружить": {"past": "закружил", "noun": "закруживания"},
-        "Потанцевать": {"past": "потанцевал", "noun": "танца"},
-        "Спеть серенаду": {"past": "спел серенаду", "noun": "серенады"},
-        "Кивнуть": {"past": "кивнул", "noun": "кивка"},
-        "Махнуть рукой": {"past": "махнул рукой", "noun": "махания рукой"},
-        "Послать воздушный поцелуй": {
-            "past": "послал воздушный поцелуй",
-            "noun": "воздушного поцелуя",
-        },
-    }
+        from bot.core.catalog import get_catalog
+
+        return get_catalog().names
+
+    @property
+    def action_emojis(self) -> dict[str, str]:
+        """Emoji действий"""
+        from bot.core.catalog import get_catalog
+
+        return get_catalog().emojis
+
+    @property
+    def action_forms(self) -> dict[str, dict[str, str]]:
+        """Формы глаголов (спряжения)"""
+        from bot.core.catalog import get_catalog
+
+        return get_catalog().forms
 
 
 # Глобальный экземпляр настроек
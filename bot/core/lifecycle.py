@@ -0,0 +1,139 @@
+"""
+Корректное завершение: drain апдейтов и буферов перед закрытием соединений
+
+ПОРЯДОК (bot/main.py по SIGTERM):
+1. Перестать получать апдейты (stop_polling / остановить воркер stream)
+2. Дождаться handlers, которые уже работают (DrainMiddleware их считает)
+3. Выполнить drain hooks: отложенные записи в БД, очередь отправки сообщений
+4. Только после этого закрыть Redis и engine
+
+Всё укладывается в общий дедлайн SHUTDOWN_DRAIN_TIMEOUT; то, что
+не успело, логируется.
+
+Регистрация hook:
+    lifecycle.on_drain("send_queue", send_queue.drain)
+    # hook получает оставшееся до дедлайна время (секунды)
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from bot.core.metrics import gauge
+
+logger = logging.getLogger(__name__)
+
+DrainHook = Callable[[float], Awaitable[None]]
+
+IN_FLIGHT_UPDATES = gauge(
+    "bot_in_flight_updates",
+    "Апдейты, которые сейчас обрабатываются (для drain при остановке)",
+)
+
+
+class Lifecycle:
+    """Учёт апдейтов в обработке и порядок завершения"""
+
+    def __init__(self):
+        self.draining = False
+        self.in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._hooks: List[Tuple[str, DrainHook]] = []
+
+        IN_FLIGHT_UPDATES.set_function(lambda: self.in_flight)
+
+    # ========== УЧЁТ АПДЕЙТОВ ==========
+
+    def update_started(self) -> None:
+        self.in_flight += 1
+        self._idle.clear()
+
+    def update_finished(self) -> None:
+        self.in_flight -= 1
+        if self.in_flight <= 0:
+            self.in_flight = 0
+            self._idle.set()
+
+    async def wait_idle(self, timeout: float) -> bool:
+        """
+        Дождаться завершения всех апдейтов
+
+        Returns:
+            bool: True если все апдейты завершились до таймаута
+        """
+        if timeout <= 0:
+            return self._idle.is_set()
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    # ========== DRAIN ==========
+
+    def on_drain(self, name: str, hook: DrainHook) -> None:
+        """Зарегистрировать сброс буфера (выполняется в порядке регистрации)"""
+        self._hooks.append((name, hook))
+
+    async def drain(
+        self,
+        timeout: float,
+        stop_fetching: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> bool:
+        """
+        Остановить приём апдейтов, дождаться handlers и сбросить буферы
+
+        Args:
+            timeout: Общий дедлайн (секунды)
+            stop_fetching: Остановка получения апдейтов (polling / stream)
+
+        Returns:
+            bool: True если всё завершилось до дедлайна
+        """
+        self.draining = True
+        deadline = time.monotonic() + timeout
+
+        def remaining() -> float:
+            """Остаток времени до дедлайна"""
+            return max(deadline - time.monotonic(), 0.0)
+
+        clean = True
+
+        logger.info(f"🔄 Drain: дедлайн {timeout:.0f}с, в обработке {self.in_flight}")
+
+        # 1. Перестаём получать апдейты
+        if stop_fetching is not None:
+            try:
+                await asyncio.wait_for(stop_fetching(), remaining())
+            except asyncio.TimeoutError:
+                logger.warning("⚠️ Drain: получение апдейтов не остановилось вовремя")
+                clean = False
+            except Exception as e:
+                logger.warning(f"⚠️ Drain: ошибка остановки получения апдейтов: {e}")
+
+        # 2. Ждём handlers, которые уже работают
+        if await self.wait_idle(remaining()):
+            logger.info("✅ Drain: все handlers завершены")
+        else:
+            logger.warning(f"⚠️ Drain: не дождались {self.in_flight} handlers")
+            clean = False
+
+        # 3. Сбрасываем буферы (каждый hook получает остаток времени)
+        for name, hook in self._hooks:
+            try:
+                await asyncio.wait_for(hook(remaining()), remaining())
+                logger.info(f"✅ Drain: {name} сброшен")
+            except asyncio.TimeoutError:
+                logger.warning(f"⚠️ Drain: {name} не успел до дедлайна")
+                clean = False
+            except Exception as e:
+                logger.error(f"❌ Drain: ошибка {name}: {e}")
+                clean = False
+
+        return clean
+
+
+# Глобальный экземпляр
+lifecycle = Lifecycle()
@@ -0,0 +1,234 @@
+"""
+Мониторинг задержки event loop
+
+Фоновая задача засыпает на фиксированный интервал и измеряет,
+насколько позже запланированного она проснулась. Эта задержка (lag)
+показывает, как долго loop был занят синхронной работой.
+
+Детектор блокировок включается отдельно (LOOP_BLOCK_DETECTOR): это
+диагностика, которая работает постоянно. Loop обновляет heartbeat раз
+в половину порога, сторожевой поток (watchdog) с тем же периодом
+сравнивает текущее время с последним heartbeat: если очередной
+heartbeat опаздывает дольше порога, значит loop заблокирован прямо
+сейчас - поток снимает стек потока event loop и пишет его в лог. Так
+находятся синхронные вызовы (sync Session, open(), requests) внутри
+handlers, даже если они короче интервала замера задержки. Надёжно
+ловятся блокировки от двух порогов; более короткие видны в lag.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Deque, Dict, Optional
+
+from bot.core.config import settings
+from bot.core.metrics import counter, gauge, histogram
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+LOOP_LAG_QUANTILES = (0.5, 0.9, 0.99)
+
+LOOP_LAG = histogram(
+    "bot_event_loop_lag_seconds",
+    "Задержка event loop (опоздание пробуждения фоновой задачи)",
+    buckets=LOOP_LAG_BUCKETS,
+)
+LOOP_LAG_QUANTILE = gauge(
+    "bot_event_loop_lag_quantile_seconds",
+    "Перцентили задержки event loop по последним замерам",
+    ("quantile",),
+)
+LOOP_BLOCKED = counter(
+    "bot_event_loop_blocked_total",
+    "Блокировки event loop дольше порога (со снятым стеком)",
+)
+
+
+@dataclass
+class BlockedCall:
+    """Снятый стек заблокированного event loop"""
+
+    detected_at: datetime
+    blocked_for: float
+    stack: str
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "detected_at": self.detected_at.isoformat(),
+            "blocked_for_seconds": round(self.blocked_for, 4),
+            "stack": self.stack,
+        }
+
+
+class LoopLagMonitor:
+    """Периодический замер задержки event loop и детектор блокировок"""
+
+    def __init__(
+        self,
+        interval: float = 0.5,
+        block_threshold: float = 0.1,
+        window: int = 600,
+        keep_blocked: int = 20,
+        detect_blocks: bool = False,
+    ):
+        """
+        Args:
+            interval: Интервал между замерами (секунды)
+            block_threshold: Опоздание, после которого снимается стек (секунды)
+            window: Сколько последних замеров учитывать в перцентилях
+            keep_blocked: Сколько последних стеков хранить в памяти
+            detect_blocks: Запускать детектор блокировок (heartbeat + watchdog)
+        """
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.detect_blocks = detect_blocks
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.blocked_calls: Deque[BlockedCall] = deque(maxlen=keep_blocked)
+
+        self._task: Optional[asyncio.Task] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop_watchdog = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        # Период heartbeat и проверок watchdog - половина порога блокировки
+        self.heartbeat_interval = max(block_threshold / 2, 0.005)
+        # Последний heartbeat (perf_counter), None - loop не отслеживается
+        self._last_beat: Optional[float] = None
+
+        for q in LOOP_LAG_QUANTILES:
+            LOOP_LAG_QUANTILE.set_function(
+                lambda q=q: self.percentile(q), quantile=str(q)
+            )
+
+    # ========== ЗАМЕР ЗАДЕРЖКИ ==========
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - expected)
+            LOOP_LAG.observe(lag)
+            self._samples.append(lag)
+
+    def percentile(self, q: float) -> float:
+        """Перцентиль задержки по последним замерам (0 если замеров нет)"""
+        samples = sorted(self._samples)
+        if not samples:
+            return 0.0
+        index = min(len(samples) - 1, int(q * len(samples)))
+        return samples[index]
+
+    def percentiles(self) -> Dict[str, float]:
+        """Все публикуемые перцентили"""
+        return {f"p{int(q * 100)}": round(self.percentile(q), 6) for q in LOOP_LAG_QUANTILES}
+
+    # ========== WATCHDOG ==========
+
+    async def _heartbeat(self) -> None:
+        """Отметка "loop жив" каждые heartbeat_interval секунд"""
+        while True:
+            self._last_beat = time.perf_counter()
+            await asyncio.sleep(self.heartbeat_interval)
+
+    def _capture_stack(self) -> Optional[str]:
+        """Стек потока event loop в момент блокировки"""
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return None
+        return "".join(traceback.format_stack(frame))
+
+    def _watch(self) -> None:
+        """Цикл сторожевого потока"""
+        # Один стек на одну блокировку: запоминаем heartbeat, по которому уже сообщили
+        reported_beat: Optional[float] = None
+
+        while not self._stop_watchdog.wait(self.heartbeat_interval):
+            last_beat = self._last_beat
+            if last_beat is None or last_beat == reported_beat:
+                continue
+
+            # Опоздание следующего heartbeat относительно расписания
+            blocked_for = time.perf_counter() - last_beat - self.heartbeat_interval
+            if blocked_for < self.block_threshold:
+                continue
+
+            stack = self._capture_stack()
+            if stack is None:
+                continue
+
+            reported_beat = last_beat
+            self.blocked_calls.append(
+                BlockedCall(detected_at=datetime.now(), blocked_for=blocked_for, stack=stack)
+            )
+            LOOP_BLOCKED.inc()
+            logger.warning(
+                f"⚠️ Event loop заблокирован > {blocked_for * 1000:.0f} мс, стек:\n{stack}"
+            )
+
+    # ========== ЗАПУСК / ОСТАНОВКА ==========
+
+    def start(self) -> None:
+        """Запустить мониторинг в текущем event loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="loop-lag-monitor")
+            logger.info("✅ Мониторинг задержки event loop запущен")
+
+        if self.detect_blocks and self.block_threshold > 0 and self._watchdog is None:
+            self._heartbeat_task = asyncio.create_task(
+                self._heartbeat(), name="loop-heartbeat"
+            )
+            self._loop_thread_id = threading.get_ident()
+            self._stop_watchdog.clear()
+            self._watchdog = threading.Thread(
+                target=self._watch, name="loop-watchdog", daemon=True
+            )
+            self._watchdog.start()
+            logger.info(
+                f"✅ Детектор блокировок event loop запущен "
+                f"(порог {self.block_threshold * 1000:.0f} мс)"
+            )
+
+    async def stop(self) -> None:
+        """Остановить мониторинг"""
+        if self._watchdog is not None:
+            self._stop_watchdog.set()
+            self._watchdog.join(timeout=1.0)
+            self._watchdog = None
+
+        for task in (self._heartbeat_task, self._task):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self._heartbeat_task = None
+        self._last_beat = None
+
+    def snapshot(self) -> Dict[str, object]:
+        """Состояние для /metrics/json"""
+        return {
+            "lag_seconds": self.percentiles(),
+            "samples": len(self._samples),
+            "block_detector": self._watchdog is not None,
+            "block_threshold_seconds": self.block_threshold,
+            "blocked_calls": [call.to_dict() for call in list(self.blocked_calls)[-5:]],
+        }
+
+
+# Глобальный экземпляр
+loop_monitor = LoopLagMonitor(
+    interval=settings.loop_lag_interval,
+    block_threshold=settings.loop_block_threshold,
+    detect_blocks=settings.loop_block_detector,
+)
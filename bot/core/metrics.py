@@ -0,0 +1,318 @@
+"""
+Простой реестр метрик без внешних зависимостей
+
+ВОЗМОЖНОСТИ:
+- Counter - монотонно растущие счётчики
+- Gauge - текущие значения (состояния, размеры очередей)
+- Histogram - распределения (латентность, размеры)
+- Метки (labels) для разбивки по семействам ключей, операциям и т.д.
+- Снимок всех метрик в виде словаря (JSON)
+- Текстовый формат экспозиции Prometheus (text/plain; version=0.0.4)
+"""
+
+import threading
+from typing import Callable, Dict, Iterable, Optional
+
+# Границы бакетов по умолчанию (секунды) - от 0.5 мс до 10 с
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+LabelValues = tuple[str, ...]
+
+# Content-Type текстового формата Prometheus
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape_label(value: str) -> str:
+    """Экранирование значения метки для текстового формата"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    """Сформировать {name="value",...} (пустая строка если меток нет)"""
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Число в формате Prometheus"""
+    if value == float("inf"):
+        return "+Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Базовый класс метрики с поддержкой меток"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames: tuple[str, ...] = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        """Преобразовать метки в ключ (порядок как в labelnames)"""
+        if len(labels) != len(self.labelnames):
+            raise ValueError(
+                f"Метрика {self.name} ожидает метки {self.labelnames}, получено {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+
+class Counter(_Metric):
+    """Монотонный счётчик"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Увеличить счётчик"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels: str) -> float:
+        """Текущее значение для набора меток"""
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Dict[LabelValues, float]:
+        """Копия всех значений"""
+        with self._lock:
+            return dict(self._values)
+
+
+class Gauge(_Metric):
+    """Текущее значение (может расти и уменьшаться)"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._functions: Dict[LabelValues, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        """Установить значение"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Увеличить значение"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        """Уменьшить значение"""
+        self.inc(-amount, **labels)
+
+    def set_function(self, func: Callable[[], float], **labels: str) -> None:
+        """Вычислять значение при каждом чтении метрики"""
+        key = self._key(labels)
+        with self._lock:
+            self._functions[key] = func
+
+    def get(self, **labels: str) -> float:
+        """Текущее значение для набора меток"""
+        key = self._key(labels)
+        func = self._functions.get(key)
+        if func is not None:
+            return float(func())
+        return self._values.get(key, 0.0)
+
+    def samples(self) -> Dict[LabelValues, float]:
+        """Копия всех значений (включая вычисляемые)"""
+        with self._lock:
+            values = dict(self._values)
+            functions = dict(self._functions)
+        for key, func in functions.items():
+            try:
+                values[key] = float(func())
+            except Exception:
+                continue
+        return values
+
+
+class Histogram(_Metric):
+    """Гистограмма с фиксированными бакетами"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        # Значение: [счётчики по бакетам..., +Inf], сумма
+        self._counts: Dict[LabelValues, list[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Зарегистрировать наблюдение"""
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = [0] * (len(self.buckets) + 1)
+                self._counts[key] = counts
+                self._sums[key] = 0.0
+
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[idx] += 1
+                    break
+            else:
+                counts[-1] += 1
+
+            self._sums[key] += value
+
+    def samples(self) -> Dict[LabelValues, tuple[list[int], float]]:
+        """Копия всех значений: (счётчики по бакетам, сумма)"""
+        with self._lock:
+            return {
+                key: (list(counts), self._sums[key])
+                for key, counts in self._counts.items()
+            }
+
+
+class MetricsRegistry:
+    """Реестр всех метрик процесса"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Зарегистрировать метрику (повторная регистрация возвращает существующую)"""
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def get(self, name: str) -> Optional[_Metric]:
+        """Получить метрику по имени"""
+        return self._metrics.get(name)
+
+    def metrics(self) -> list[_Metric]:
+        """Список всех зарегистрированных метрик"""
+        with self._lock:
+            return list(self._metrics.values())
+
+    def snapshot(self) -> Dict[str, list[dict]]:
+        """
+        Снимок всех метрик в JSON-совместимом виде
+
+        Returns:
+            dict: {имя_метрики: [{"labels": {...}, ...значения}]}
+        """
+        result: Dict[str, list[dict]] = {}
+
+        for metric in self.metrics():
+            series = []
+            if isinstance(metric, (Counter, Gauge)):
+                for key, value in metric.samples().items():
+                    series.append(
+                        {"labels": dict(zip(metric.labelnames, key)), "value": value}
+                    )
+            elif isinstance(metric, Histogram):
+                for key, (counts, total) in metric.samples().items():
+                    count = sum(counts)
+                    series.append(
+                        {
+                            "labels": dict(zip(metric.labelnames, key)),
+                            "count": count,
+                            "sum": round(total, 6),
+                            "avg": round(total / count, 6) if count else 0.0,
+                        }
+                    )
+            result[metric.name] = series
+
+        return result
+
+    def render_text(self) -> str:
+        """
+        Все метрики в текстовом формате экспозиции Prometheus
+
+        Returns:
+            str: Тело ответа для GET /metrics
+        """
+        lines: list[str] = []
+
+        for metric in self.metrics():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+
+            if isinstance(metric, (Counter, Gauge)):
+                for key, value in sorted(metric.samples().items()):
+                    labels = _format_labels(metric.labelnames, key)
+                    lines.append(f"{metric.name}{labels} {_format_value(value)}")
+
+            elif isinstance(metric, Histogram):
+                bounds = [*metric.buckets, float("inf")]
+                for key, (counts, total) in sorted(metric.samples().items()):
+                    cumulative = 0
+                    for bound, count in zip(bounds, counts):
+                        cumulative += count
+                        labels = _format_labels(
+                            (*metric.labelnames, "le"), (*key, _format_value(bound))
+                        )
+                        lines.append(f"{metric.name}_bucket{labels} {cumulative}")
+
+                    labels = _format_labels(metric.labelnames, key)
+                    lines.append(f"{metric.name}_sum{labels} {_format_value(total)}")
+                    lines.append(f"{metric.name}_count{labels} {cumulative}")
+
+        return "\n".join(lines) + "\n"
+
+
+# ========== ГЛОБАЛЬНЫЙ РЕЕСТР ==========
+
+REGISTRY = MetricsRegistry()
+
+
+def counter(name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+    """Создать (или получить существующий) счётчик в глобальном реестре"""
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+    """Создать (или получить существующий) gauge в глобальном реестре"""
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: Iterable[str] = (),
+    buckets: Iterable[float] = DEFAULT_BUCKETS,
+) -> Histogram:
+    """Создать (или получить существующую) гистограмму в глобальном реестре"""
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
@@ -0,0 +1,71 @@
+"""
+Фазы запуска бота с замером времени
+
+Каждая фаза логируется и экспортируется в /metrics
+(bot_startup_phase_seconds{phase}); общее время до начала приёма
+апдейтов - bot_startup_seconds.
+
+Фаза отсчитывается от предыдущей отметки:
+    redis, db_ok = await asyncio.gather(get_redis(), check_database_health())
+    startup.mark("dependencies")
+    ...
+    startup.finish()
+"""
+
+import logging
+import time
+from typing import Dict, Optional
+
+from bot.core.metrics import gauge
+
+logger = logging.getLogger(__name__)
+
+STARTUP_PHASE = gauge(
+    "bot_startup_phase_seconds",
+    "Длительность фаз запуска",
+    ("phase",),
+)
+STARTUP_TOTAL = gauge(
+    "bot_startup_seconds",
+    "Время от старта процесса до начала приёма апдейтов",
+)
+
+
+class StartupPhases:
+    """Замер фаз запуска"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._last = self.started
+        self.phases: Dict[str, float] = {}
+        self.total: Optional[float] = None
+
+    def mark(self, name: str) -> float:
+        """Завершить фазу: время от предыдущей отметки до текущего момента"""
+        now = time.perf_counter()
+        seconds = now - self._last
+        self._last = now
+        self.record(name, seconds)
+        return seconds
+
+    def record(self, name: str, seconds: float) -> None:
+        self.phases[name] = seconds
+        STARTUP_PHASE.set(seconds, phase=name)
+        logger.info(f"⏱ Запуск: {name} - {seconds * 1000:.0f} мс")
+
+    def finish(self) -> float:
+        """Зафиксировать момент начала приёма апдейтов"""
+        now = time.perf_counter()
+        self.total = now - self.started
+        self._last = now
+        STARTUP_TOTAL.set(self.total)
+
+        summary = ", ".join(
+            f"{name} {seconds * 1000:.0f}" for name, seconds in self.phases.items()
+        )
+        logger.info(f"⏱ Бот принимает апдейты через {self.total:.2f}с ({summary} мс)")
+        return self.total
+
+
+# Глобальный экземпляр (время считается с импорта bot.main)
+startup = StartupPhases()
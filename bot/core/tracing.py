@@ -0,0 +1,251 @@
+"""
+Трассировка обработки апдейтов
+
+Для каждого сэмплированного апдейта создаётся trace с корневым span.
+Вложенные span (handler, БД, Redis, Bot API) привязываются к текущему
+span через contextvars и записываются одной JSON строкой на trace
+в ротируемый файл (запись идёт в отдельном потоке через QueueListener).
+
+Файл можно превратить в folded stacks для flame graph:
+    python -m scripts.traces_to_folded logs/traces.jsonl > traces.folded
+"""
+
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from bot.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:
+    """Один замер внутри trace"""
+
+    trace: "Trace"
+    name: str
+    span_id: int
+    parent_id: Optional[int]
+    start: float = field(default_factory=time.perf_counter)
+    duration: Optional[float] = None
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+    def set(self, **attrs: Any) -> None:
+        """Добавить атрибуты"""
+        self.attrs.update(attrs)
+
+    def finish(self) -> None:
+        """Завершить span"""
+        if self.duration is None:
+            self.duration = time.perf_counter() - self.start
+
+
+@dataclass
+class Trace:
+    """Все span одного апдейта"""
+
+    trace_id: str
+    started_at: float = field(default_factory=time.time)
+    spans: list[Span] = field(default_factory=list)
+
+    def new_span(self, name: str, parent: Optional[Span], attrs: Dict[str, Any]) -> Span:
+        span = Span(
+            trace=self,
+            name=name,
+            span_id=len(self.spans) + 1,
+            parent_id=parent.span_id if parent else None,
+            attrs=attrs,
+        )
+        self.spans.append(span)
+        return span
+
+    def to_record(self) -> Dict[str, Any]:
+        """JSON запись для файла трассировок"""
+        root = self.spans[0]
+        return {
+            "trace_id": self.trace_id,
+            "name": root.name,
+            "ts": round(self.started_at, 6),
+            "duration_ms": round((root.duration or 0.0) * 1000, 3),
+            "attrs": root.attrs,
+            "spans": [
+                {
+                    "id": span.span_id,
+                    "parent": span.parent_id,
+                    "name": span.name,
+                    "offset_ms": round((span.start - root.start) * 1000, 3),
+                    "duration_ms": round((span.duration or 0.0) * 1000, 3),
+                    "attrs": span.attrs,
+                }
+                for span in self.spans
+            ],
+        }
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    """Текущий span (None если апдейт не сэмплирован)"""
+    return _current_span.get()
+
+
+# ========== ЗАПИСЬ В ФАЙЛ ==========
+
+
+class TraceSink:
+    """Запись трассировок в ротируемый JSONL файл из отдельного потока"""
+
+    def __init__(self, path: Path, max_bytes: int, backup_count: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._logger: Optional[logging.Logger] = None
+        self._listener: Optional[logging.handlers.QueueListener] = None
+
+    def start(self) -> None:
+        """Открыть файл и запустить поток записи"""
+        if self._listener is not None:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            self.path,
+            maxBytes=self.max_bytes,
+            backupCount=self.backup_count,
+            encoding="utf-8",
+        )
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        self._listener = logging.handlers.QueueListener(records, file_handler)
+        self._listener.start()
+
+        # Отдельный логгер без propagate - трассировки не попадают в bot.log
+        self._logger = logging.getLogger("bot.traces")
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._logger.handlers.clear()
+        self._logger.addHandler(logging.handlers.QueueHandler(records))
+
+        logger.info(f"✅ Трассировка включена: {self.path}")
+
+    def stop(self) -> None:
+        """Дописать очередь и закрыть файл"""
+        if self._listener is not None:
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
+        self._logger = None
+
+    def write(self, trace: Trace) -> None:
+        if self._logger is None:
+            return
+        self._logger.info(
+            json.dumps(trace.to_record(), ensure_ascii=False, separators=(",", ":"))
+        )
+
+
+class Tracer:
+    """Создание trace и span с сэмплированием"""
+
+    def __init__(self, sample_rate: float, sink: TraceSink):
+        self.sample_rate = sample_rate
+        self.sink = sink
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0
+
+    def start(self) -> None:
+        if self.enabled:
+            self.sink.start()
+
+    def stop(self) -> None:
+        self.sink.stop()
+
+    @contextmanager
+    def trace(self, name: str, **attrs: Any) -> Iterator[Optional[Span]]:
+        """
+        Корневой span апдейта (с вероятностью sample_rate)
+
+        Yields:
+            Span | None: Корневой span или None если не сэмплирован
+        """
+        if not self.enabled or random.random() >= self.sample_rate:
+            yield None
+            return
+
+        trace = Trace(trace_id=uuid.uuid4().hex)
+        root = trace.new_span(name, None, attrs)
+        token = _current_span.set(root)
+        try:
+            yield root
+        except BaseException as e:
+            root.set(error=type(e).__name__)
+            raise
+        finally:
+            _current_span.reset(token)
+            root.finish()
+            self.sink.write(trace)
+
+
+tracer = Tracer(
+    sample_rate=settings.trace_sample_rate,
+    sink=TraceSink(
+        Path(settings.trace_file_path),
+        max_bytes=settings.trace_max_bytes,
+        backup_count=settings.trace_backup_count,
+    ),
+)
+
+
+# ========== ВЛОЖЕННЫЕ SPAN ==========
+
+
+def start_span(name: str, **attrs: Any) -> Optional[Span]:
+    """
+    Начать дочерний span без смены текущего (для листовых замеров,
+    например в событиях SQLAlchemy). Завершается вызовом span.finish().
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return None
+    return parent.trace.new_span(name, parent, attrs)
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Optional[Span]]:
+    """
+    Дочерний span текущего trace (no-op если апдейт не сэмплирован)
+
+    Example:
+        with span("catalog_load"):
+            actions = await action_service.get_all_actions()
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    child = parent.trace.new_span(name, parent, attrs)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.set(error=type(e).__name__)
+        raise
+    finally:
+        _current_span.reset(token)
+        child.finish()
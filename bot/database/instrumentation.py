@@ -0,0 +1,192 @@
+"""
+Инструментирование SQLAlchemy engine через события
+
+Подключается один раз к engine из bot.database.connection:
+    instrument_engine(get_engine())
+
+- латентность и ошибки запросов по типу операции
+- лог медленных запросов (дольше DB_SLOW_QUERY_THRESHOLD) с формой
+  параметров - типами, без значений
+- число запросов на апдейт: DatabaseMiddleware открывает счётчик
+  через count_queries(), события engine его увеличивают
+"""
+
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from bot.core.config import settings
+from bot.core.metrics import counter, histogram
+from bot.core.tracing import start_span
+
+logger = logging.getLogger(__name__)
+
+DB_QUERY_DURATION = histogram(
+    "bot_db_query_seconds",
+    "Латентность SQL запросов по типу операции",
+    ("operation",),
+)
+DB_QUERY_ERRORS = counter(
+    "bot_db_query_errors_total",
+    "Ошибки SQL запросов по типу операции",
+    ("operation",),
+)
+DB_SLOW_QUERIES = counter(
+    "bot_db_slow_queries_total",
+    "SQL запросы дольше порога DB_SLOW_QUERY_THRESHOLD",
+    ("operation",),
+)
+DB_QUERIES_PER_UPDATE = histogram(
+    "bot_db_queries_per_update",
+    "Количество SQL запросов на один апдейт",
+    ("type",),
+    buckets=(0, 1, 2, 3, 4, 6, 8, 10, 15, 20, 30, 50),
+)
+
+# Ключ в connection.info для стека (время начала, span) выполняемых запросов
+_START_KEY = "bot_query_start"
+
+
+def get_operation(statement: str) -> str:
+    """Тип SQL операции по первому слову (select, insert, ...)"""
+    head = statement.lstrip().split(None, 1)
+    return head[0].lower() if head else "unknown"
+
+
+# ========== СЧЁТЧИК ЗАПРОСОВ НА АПДЕЙТ ==========
+
+
+@dataclass
+class QueryCounter:
+    """Количество и суммарное время запросов в рамках одного апдейта"""
+
+    count: int = 0
+    total_seconds: float = 0.0
+
+
+_query_counter: ContextVar[Optional[QueryCounter]] = ContextVar(
+    "db_query_counter", default=None
+)
+
+
+@contextmanager
+def count_queries(update_type: str = "unknown") -> Iterator[QueryCounter]:
+    """
+    Считать SQL запросы внутри блока и записать итог в гистограмму
+
+    Example:
+        with count_queries("callback_query") as queries:
+            await handler(event, data)
+    """
+    query_counter = QueryCounter()
+    token = _query_counter.set(query_counter)
+    try:
+        yield query_counter
+    finally:
+        _query_counter.reset(token)
+        DB_QUERIES_PER_UPDATE.observe(query_counter.count, type=update_type)
+
+
+# ========== МЕДЛЕННЫЕ ЗАПРОСЫ ==========
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def describe_parameters(parameters: Any, executemany: bool) -> str:
+    """Форма параметров запроса: имена и типы без значений"""
+    if executemany and isinstance(parameters, (list, tuple)):
+        if not parameters:
+            return "[]"
+        return f"{len(parameters)} x {describe_parameters(parameters[0], False)}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(
+            f"{key}: {type(value).__name__}" for key, value in parameters.items()
+        ) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return type(parameters).__name__
+
+
+def _log_slow_query(statement: str, parameters: Any, executemany: bool, elapsed: float) -> None:
+    operation = get_operation(statement)
+    DB_SLOW_QUERIES.inc(operation=operation)
+
+    sql = _WHITESPACE.sub(" ", statement).strip()
+    if len(sql) > 500:
+        sql = sql[:500] + "..."
+    logger.warning(
+        f"🐢 Медленный запрос {elapsed * 1000:.1f} мс: {sql} "
+        f"| params: {describe_parameters(parameters, executemany)}"
+    )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    query_counter = _query_counter.get()
+    if query_counter is not None:
+        query_counter.count += 1
+
+    trace_span = start_span(f"db.{get_operation(statement)}")
+    conn.info.setdefault(_START_KEY, []).append((time.perf_counter(), trace_span))
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get(_START_KEY)
+    if not starts:
+        return
+    started, trace_span = starts.pop()
+    elapsed = time.perf_counter() - started
+    DB_QUERY_DURATION.observe(elapsed, operation=get_operation(statement))
+    if trace_span is not None:
+        trace_span.finish()
+
+    query_counter = _query_counter.get()
+    if query_counter is not None:
+        query_counter.total_seconds += elapsed
+
+    threshold = settings.db_slow_query_threshold
+    if threshold > 0 and elapsed >= threshold:
+        _log_slow_query(statement, parameters, executemany, elapsed)
+
+
+def _handle_error(exception_context):
+    statement = exception_context.statement or ""
+    DB_QUERY_ERRORS.inc(operation=get_operation(statement))
+
+    conn = exception_context.connection
+    if conn is not None:
+        starts = conn.info.get(_START_KEY)
+        if starts:
+            _, trace_span = starts.pop()
+            if trace_span is not None:
+                trace_span.set(error=type(exception_context.original_exception).__name__)
+                trace_span.finish()
+
+
+def instrument_engine(engine: AsyncEngine) -> AsyncEngine:
+    """
+    Подключить метрики, лог медленных запросов и счётчик запросов к engine
+
+    Args:
+        engine: Async engine приложения
+
+    Returns:
+        AsyncEngine: Тот же engine
+    """
+    sync_engine = engine.sync_engine
+
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return engine
+
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+    logger.info("✅ Метрики SQL запросов подключены")
+    return engine
@@ -0,0 +1,256 @@
+"""
+Телеметрия пула соединений БД и адаптивный max_overflow
+
+Подключается к engine из bot.database.connection:
+    pool_monitor.attach(engine)
+    pool_monitor.start()
+
+Метрики: размер пула, занятые соединения, overflow, время ожидания
+соединения. Если handler ждёт соединение дольше порога - warning в лог.
+
+Ожидание измеряется событиями сессий ORM: от создания внешней
+транзакции (after_transaction_create, соединения ещё нет) до начала
+транзакции на соединении из пула (after_begin) - очередь пула, pre-ping
+и открытие нового соединения. Запросы в обход Session (engine.connect)
+не учитываются.
+
+Адаптивный режим (DB_POOL_ADAPTIVE=true) раз в интервал смотрит p95
+времени ожидания и двигает max_overflow в заданных границах: растёт,
+когда handlers ждут, и уменьшается, когда пул простаивает. Базовый
+pool_size не меняется - очередь пула создаётся один раз.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session, SessionTransaction
+from sqlalchemy.pool import Pool, QueuePool
+
+from bot.core.config import settings
+from bot.core.metrics import counter, gauge, histogram
+
+logger = logging.getLogger(__name__)
+
+POOL_SIZE = gauge("bot_db_pool_size", "Базовый размер пула соединений")
+POOL_CHECKED_OUT = gauge("bot_db_pool_checked_out", "Соединения, занятые handlers")
+POOL_OVERFLOW = gauge("bot_db_pool_overflow", "Соединения сверх pool_size")
+POOL_MAX_OVERFLOW = gauge("bot_db_pool_max_overflow", "Текущий лимит overflow")
+POOL_WAIT = histogram(
+    "bot_db_pool_wait_seconds",
+    "Время получения соединения из пула",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+POOL_SLOW_WAITS = counter(
+    "bot_db_pool_slow_waits_total",
+    "Ожидания соединения дольше DB_POOL_WAIT_WARN_THRESHOLD",
+)
+POOL_RESIZES = counter(
+    "bot_db_pool_resizes_total",
+    "Изменения max_overflow в адаптивном режиме",
+    ("direction",),
+)
+
+# Не чаще одного warning о долгом ожидании за этот интервал (секунды)
+SLOW_WAIT_LOG_INTERVAL = 10.0
+
+# Ключ в session.info: perf_counter создания внешней транзакции
+_WAIT_START_KEY = "bot_pool_wait_start"
+
+
+# ========== max_overflow ==========
+# У QueuePool нет публичного API для лимита overflow: чтение и запись
+# идут через атрибут _max_overflow (проверено на SQLAlchemy 2.0.36,
+# версия закреплена в requirements.txt). При обновлении SQLAlchemy
+# проверить только эти две функции.
+
+
+def get_max_overflow(pool: QueuePool) -> int:
+    """Текущий лимит overflow (-1 - без лимита)"""
+    return pool._max_overflow
+
+
+def set_max_overflow(pool: QueuePool, value: int) -> None:
+    """Изменить лимит overflow (лишние соединения закроются при возврате)"""
+    pool._max_overflow = value
+
+
+class PoolMonitor:
+    """Метрики пула соединений и адаптивная подстройка max_overflow"""
+
+    def __init__(self, window: int = 1000):
+        """
+        Args:
+            window: Сколько последних ожиданий учитывать в перцентилях
+        """
+        self._pool: Optional[Pool] = None
+        self._engine = None
+        self._waits: Deque[float] = deque(maxlen=window)
+        self._last_slow_log = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    # ========== ПОДКЛЮЧЕНИЕ ==========
+
+    def attach(self, engine: AsyncEngine) -> None:
+        """Подключить замер ожидания и gauges к пулу engine"""
+        pool = engine.sync_engine.pool
+        if self._pool is pool:
+            return
+        if self._engine is None:
+            event.listen(Session, "after_transaction_create", self._on_transaction_create)
+            event.listen(Session, "after_begin", self._on_begin)
+        self._pool = pool
+        self._engine = engine.sync_engine
+
+        if isinstance(pool, QueuePool):
+            POOL_SIZE.set_function(pool.size)
+            POOL_CHECKED_OUT.set_function(pool.checkedout)
+            POOL_OVERFLOW.set_function(lambda: max(pool.overflow(), 0))
+            POOL_MAX_OVERFLOW.set_function(lambda: get_max_overflow(pool))
+
+        logger.info(f"✅ Метрики пула соединений подключены ({type(pool).__name__})")
+
+    def _on_transaction_create(self, session: Session, transaction: SessionTransaction) -> None:
+        # Вложенные транзакции (savepoint) работают на уже полученном соединении
+        if transaction.parent is None:
+            session.info[_WAIT_START_KEY] = time.perf_counter()
+
+    def _on_begin(self, session: Session, transaction: SessionTransaction, connection) -> None:
+        if transaction.parent is not None:
+            return
+        # Отметку перезаписывает следующая внешняя транзакция
+        start = session.info.get(_WAIT_START_KEY)
+        if start is not None and connection.engine is self._engine:
+            self._record_wait(time.perf_counter() - start)
+
+    def _record_wait(self, elapsed: float) -> None:
+        POOL_WAIT.observe(elapsed)
+        self._waits.append(elapsed)
+
+        threshold = settings.db_pool_wait_warn_threshold
+        if threshold <= 0 or elapsed < threshold:
+            return
+
+        POOL_SLOW_WAITS.inc()
+        now = time.monotonic()
+        if now - self._last_slow_log >= SLOW_WAIT_LOG_INTERVAL:
+            self._last_slow_log = now
+            logger.warning(
+                f"⚠️ Handler ждал соединение с БД {elapsed * 1000:.0f} мс "
+                f"({self._describe_pool()})"
+            )
+
+    def _describe_pool(self) -> str:
+        pool = self._pool
+        if isinstance(pool, QueuePool):
+            return (
+                f"занято {pool.checkedout()}, size {pool.size()}, "
+                f"overflow {max(pool.overflow(), 0)}/{get_max_overflow(pool)}"
+            )
+        return type(pool).__name__
+
+    # ========== ПЕРЦЕНТИЛИ ==========
+
+    def percentile(self, q: float) -> float:
+        """Перцентиль времени ожидания по последним замерам"""
+        waits = sorted(self._waits)
+        if not waits:
+            return 0.0
+        return waits[min(len(waits) - 1, int(q * len(waits)))]
+
+    def snapshot(self) -> Dict[str, object]:
+        """Состояние пула для /metrics/json"""
+        data: Dict[str, object] = {
+            "wait_p50_ms": round(self.percentile(0.5) * 1000, 3),
+            "wait_p95_ms": round(self.percentile(0.95) * 1000, 3),
+            "adaptive": self._task is not None,
+        }
+        pool = self._pool
+        if isinstance(pool, QueuePool):
+            data.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                overflow=max(pool.overflow(), 0),
+                max_overflow=get_max_overflow(pool),
+            )
+        return data
+
+    # ========== АДАПТИВНЫЙ РЕЖИМ ==========
+
+    def adjust(self) -> None:
+        """Один шаг подстройки max_overflow по p95 ожидания"""
+        pool = self._pool
+        # max_overflow = -1 означает "без лимита" - подстраивать нечего
+        if not isinstance(pool, QueuePool) or get_max_overflow(pool) < 0:
+            return
+        if not self._waits:
+            return
+
+        p95 = self.percentile(0.95)
+        current = get_max_overflow(pool)
+        step = settings.db_pool_adapt_step
+        limit = settings.db_pool_max_overflow_limit
+
+        if p95 >= settings.db_pool_adapt_high_wait and current < limit:
+            new_value = min(current + step, limit)
+            direction = "up"
+        elif (
+            p95 <= settings.db_pool_adapt_low_wait
+            and current > settings.db_pool_min_overflow
+            and max(pool.overflow(), 0) < current
+        ):
+            new_value = max(current - step, settings.db_pool_min_overflow)
+            direction = "down"
+        else:
+            return
+
+        set_max_overflow(pool, new_value)
+        POOL_RESIZES.inc(direction=direction)
+        logger.info(
+            f"🔄 max_overflow пула: {current} → {new_value} (p95 ожидания {p95 * 1000:.1f} мс)"
+        )
+
+        # Новое окно - оцениваем уже с новым лимитом
+        self._waits.clear()
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.adjust()
+            except Exception as e:
+                logger.error(f"❌ Ошибка подстройки пула: {e}")
+
+    def start(self) -> None:
+        """Запустить адаптивный режим (если включён DB_POOL_ADAPTIVE)"""
+        if not settings.db_pool_adaptive or self._task is not None:
+            return
+        if not isinstance(self._pool, QueuePool):
+            logger.info("ℹ️ Адаптивный пул доступен только для QueuePool, пропускаем")
+            return
+
+        self._task = asyncio.create_task(
+            self._run(settings.db_pool_adapt_interval), name="db-pool-adapter"
+        )
+        logger.info(
+            f"✅ Адаптивный max_overflow: {settings.db_pool_min_overflow}"
+            f"..{settings.db_pool_max_overflow_limit}"
+        )
+
+    async def stop(self) -> None:
+        """Остановить адаптивный режим"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Глобальный экземпляр
+pool_monitor = PoolMonitor()
@@ -0,0 +1,87 @@
+"""
+FSM хранилище с защитой от недоступного Redis
+
+Все вызовы RedisStorage идут через общий circuit breaker.
+Пока breaker открыт (или Redis отвечает ошибкой), состояния читаются
+и пишутся в локальное MemoryStorage - апдейты не ждут socket timeout.
+Состояния, записанные во время сбоя, живут только в памяти процесса.
+"""
+
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from redis.exceptions import RedisError
+
+from bot.core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from bot.core.tracing import span
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_FAILURES = (RedisError, CircuitOpenError, TimeoutError, OSError)
+
+
+class BreakerStorage(BaseStorage):
+    """Обёртка над FSM хранилищем с circuit breaker и локальным fallback"""
+
+    def __init__(
+        self,
+        primary: BaseStorage,
+        breaker: CircuitBreaker,
+        fallback: Optional[BaseStorage] = None,
+    ):
+        """
+        Args:
+            primary: Основное хранилище (RedisStorage)
+            breaker: Circuit breaker для Redis
+            fallback: Локальное хранилище (по умолчанию MemoryStorage)
+        """
+        self.primary = primary
+        self.breaker = breaker
+        self.fallback = fallback or MemoryStorage()
+
+    async def _call(
+        self,
+        primary_call: Callable[[], Awaitable[T]],
+        fallback_call: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Вызвать основное хранилище, при отказе - локальное"""
+        try:
+            with span("redis.fsm"):
+                return await self.breaker.call(primary_call)
+        except _FAILURES as e:
+            if not isinstance(e, CircuitOpenError):
+                logger.warning(f"⚠️ FSM storage недоступен, используем память: {e}")
+            return await fallback_call()
+
+    async def set_state(self, key: StorageKey, state: str | State | None = None) -> None:
+        await self._call(
+            lambda: self.primary.set_state(key, state),
+            lambda: self.fallback.set_state(key, state),
+        )
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        return await self._call(
+            lambda: self.primary.get_state(key),
+            lambda: self.fallback.get_state(key),
+        )
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        await self._call(
+            lambda: self.primary.set_data(key, data),
+            lambda: self.fallback.set_data(key, data),
+        )
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        return await self._call(
+            lambda: self.primary.get_data(key),
+            lambda: self.fallback.get_data(key),
+        )
+
+    async def close(self) -> None:
+        await self.primary.close()
+        await self.fallback.close()
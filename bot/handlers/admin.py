@@ -2,12 +2,14 @@
 Админские команды для управления ботом
 """
 
+import asyncio
 import logging
 from aiogram import Router, F
 from aiogram.filters import Command
 from aiogram.types import Message
 from aiogram.fsm.context import FSMContext
 
+from bot.core.action_index import action_index
 from bot.core.config import settings
 from bot.database.repositories import (
     UserRepository,
@@ -16,8 +18,11 @@ from bot.database.repositories import (
     AdminRepository,
 )
 from bot.services.action import ActionService
-from bot.services.cache import get_cache_service
+from bot.services.cache import CacheService
+from bot.services.container import get_container
+from bot.services.send_queue import send_queue
 from bot.fsm.admin_states import ActionAddStates, BroadcastStates
+from bot.utils.validators import is_valid_action, is_valid_emoji
 
 logger = logging.getLogger(__name__)
 router = Router(name="admin")
@@ -27,6 +32,20 @@ async def is_admin(user_id: int, admin_repo: AdminRepository) -> bool:
     """Проверка прав администратора"""
     if user_id == settings.admin_id:
         return True
+
+    # Быстрый путь: список админов в памяти (перечитывается раз в ADMIN_CACHE_TTL)
+    container = get_container()
+    if container is not None and container.warmed_up:
+        if container.admins_stale:
+            try:
+                await container.refresh_admins(admin_repo.session)
+            except Exception as e:
+                logger.warning(f"⚠️ Не удалось обновить список админов: {e}")
+                await admin_repo.session.rollback()
+        if container.is_admin(user_id):
+            return True
+
+    # Промах - возможно, админ добавлен в БД после загрузки списка
     return await admin_repo.is_admin(user_id)
 
 
@@ -107,7 +126,20 @@ async def process_name(message: Message, state: FSMContext):
         await message.answer("❌ Добавление действия отменено")
         return
 
-    await state.update_data(name=message.text.strip())
+    name = (message.text or "").strip()
+    if not name:
+        await message.answer("❌ Отправьте название текстом")
+        return
+
+    # Уникальность имени в БД учитывает регистр - проверяем без него
+    if is_valid_action(name):
+        await message.answer(
+            f"❌ Действие <b>{name}</b> уже существует, введите другое название",
+            parse_mode="HTML",
+        )
+        return
+
+    await state.update_data(name=name)
     await state.set_state(ActionAddStates.waiting_for_emoji)
     await message.answer(
         "✨ Отправьте <b>эмодзи</b> для действия:\nПример: 🤗", parse_mode="HTML"
@@ -122,8 +154,18 @@ async def process_emoji(message: Message, state: FSMContext):
         await message.answer("❌ Добавление действия отменено")
         return
 
-    await state.update_data(emoji=message.text.strip())
+    emoji = (message.text or "").strip()
+    if not emoji:
+        await message.answer("❌ Отправьте эмодзи текстом")
+        return
+
+    await state.update_data(emoji=emoji)
     await state.set_state(ActionAddStates.waiting_for_infinitive)
+
+    # Эмодзи не обязаны быть уникальными - только предупреждаем
+    if is_valid_emoji(emoji):
+        await message.answer(f"ℹ️ Эмодзи {emoji} уже используется другими действиями")
+
     await message.answer(
         "🔄 Введите форму <b>инфинитива</b> (что сделать?):\n"
         "Пример: <code>обнять</code> (строчными буквами)",
@@ -168,7 +210,10 @@ async def process_past(message: Message, state: FSMContext):
 
 @router.message(ActionAddStates.waiting_for_noun)
 async def process_noun(
-    message: Message, state: FSMContext, action_repo: ActionRepository
+    message: Message,
+    state: FSMContext,
+    action_repo: ActionRepository,
+    cache: CacheService,
 ):
     """Финальный шаг - сохранение действия"""
     if message.text and message.text.startswith("/cancel"):
@@ -188,10 +233,9 @@ async def process_noun(
             genitive_noun=genitive_noun,
         )
 
-        # Очищаем кэш
-        cache = await get_cache_service()
-        if cache:
-            await cache.invalidate_actions()
+        # Очищаем кэш и сразу учитываем действие в индексе валидации
+        await cache.invalidate_actions()
+        action_index.add(new_action)
 
         await message.answer(
             f"✅ Действие <b>{new_action['name']}</b> успешно добавлено!\n\n"
@@ -212,12 +256,12 @@ async def cmd_list_actions(
     message: Message,
     admin_repo: AdminRepository,
     action_repo: ActionRepository,
+    cache: CacheService,
 ):
     """Список всех действий"""
     if not await is_admin(message.from_user.id, admin_repo):
         return
 
-    cache = await get_cache_service()
     action_service = ActionService(action_repo, cache)
     all_actions = await action_service.get_all_actions()
 
@@ -259,17 +303,41 @@ async def cmd_list_actions(
 async def cmd_cache_clear(
     message: Message,
     admin_repo: AdminRepository,
+    cache: CacheService,
 ):
     """Очистка кэша"""
     if not await is_admin(message.from_user.id, admin_repo):
         return
 
-    cache = await get_cache_service()
-    if cache:
-        await cache.invalidate_actions()
+    if await cache.invalidate_actions():
         await message.answer("✅ Кэш действий успешно очищен!")
     else:
-        await message.answer("⚠️ Redis не подключен, кэш не используется")
+        await message.answer("⚠️ Redis недоступен, кэш не очищен")
+
+
+@router.message(Command("sync_commands"))
+async def cmd_sync_commands(message: Message, admin_repo: AdminRepository):
+    """Принудительно обновить меню команд во всех областях"""
+    if not await is_admin(message.from_user.id, admin_repo):
+        return
+
+    container = get_container()
+    if container is None:
+        await message.answer("⚠️ Сервисы ещё не инициализированы")
+        return
+
+    # Импорт по требованию: команда нужна редко, модуль не грузится на старте
+    from bot.services.bot_commands import BotCommandsService
+
+    try:
+        summary = await BotCommandsService(container.redis).sync(message.bot, force=True)
+    except Exception as e:
+        logger.error(f"❌ Ошибка синхронизации команд: {e}")
+        await message.answer("❌ Не удалось обновить команды, подробности в логах")
+        return
+
+    scopes = "\n".join(f"• <code>{name}</code>" for name in summary)
+    await message.answer(f"✅ Меню команд обновлено:\n{scopes}", parse_mode="HTML")
 
 
 # ============================================
@@ -328,30 +396,39 @@ async def process_broadcast(
         f"📤 Начинаю рассылку для {len(all_users)} пользователей..."
     )
 
-    # Рассылка
-    success_count = 0
-    failed_count = 0
-
-    for user in all_users:
-        try:
-            # ✅ ИСПРАВЛЕНО: используем user.id вместо user.telegram_id
-            await message.bot.send_message(
-                chat_id=user.id,
-                text=broadcast_text,
-                parse_mode="HTML",
-            )
-            success_count += 1
-        except Exception as e:
-            logger.warning(f"Failed to send to {user.id}: {e}")
-            failed_count += 1
-
-    # Итоги
-    await confirmation.edit_text(
-        f"✅ <b>Рассылка завершена</b>\n\n"
-        f"✅ Успешно: {success_count}\n"
-        f"❌ Ошибок: {failed_count}\n"
-        f"📊 Всего: {len(all_users)}",
-        parse_mode="HTML",
-    )
-
+    # Рассылка через очередь отправки (лимит скорости, дописывается при остановке).
+    # Handler не ждёт отправки: сессия БД, слот планировщика и блокировка
+    # пользователя освобождаются сразу, итоги пишет фоновая задача
+    results = [
+        send_queue.enqueue(user.id, broadcast_text, parse_mode="HTML")
+        for user in all_users
+    ]
     await state.clear()
+
+    task = asyncio.create_task(report_broadcast(confirmation, results))
+    _broadcast_reports.add(task)
+    task.add_done_callback(_broadcast_reports.discard)
+
+
+# Фоновые задачи с итогами рассылок (ссылки, чтобы задачи не собрал GC)
+_broadcast_reports: set[asyncio.Task] = set()
+
+
+async def report_broadcast(
+    confirmation: Message, results: list["asyncio.Future[bool]"]
+) -> None:
+    """Дождаться отправки рассылки и показать итоги"""
+    sent = await asyncio.gather(*results, return_exceptions=True)
+    success_count = sum(1 for ok in sent if ok is True)
+    failed_count = len(sent) - success_count
+
+    try:
+        await confirmation.edit_text(
+            f"✅ <b>Рассылка завершена</b>\n\n"
+            f"✅ Успешно: {success_count}\n"
+            f"❌ Ошибок: {failed_count}\n"
+            f"📊 Всего: {len(sent)}",
+            parse_mode="HTML",
+        )
+    except Exception as e:
+        logger.warning(f"⚠️ Не удалось показать итоги рассылки: {e}")
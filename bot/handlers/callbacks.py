@@ -3,6 +3,8 @@
 """
 
 import logging
+from typing import Dict, Optional
+
 from aiogram import Router, Bot
 from aiogram.types import CallbackQuery
 
@@ -13,6 +15,9 @@ from bot.database.repositories import (
     ActionRepository,
     ActionStatRepository,
 )
+from bot.services.action_service import action_service
+from bot.services.container import ServiceContainer
+from bot.services.gender import gender_value
 from bot.services.user import UserService
 from bot.services.interaction import InteractionService
 
@@ -21,6 +26,51 @@ logger = logging.getLogger(__name__)
 router = Router(name="callbacks")
 
 
+async def resolve_genders(
+    container: ServiceContainer, *users
+) -> Dict[int, Optional[str]]:
+    """
+    Пол участников из кэша пола
+
+    Промах кэша заполняется полем gender уже загруженных строк users
+    (без дополнительного запроса к БД).
+    """
+    genders = await container.genders.get_many(user.id for user in users)
+    for user in users:
+        if genders[user.id] is None:
+            genders[user.id] = gender_value(getattr(user, "gender", None))
+            await container.genders.remember(user.id, genders[user.id])
+    return genders
+
+
+def render_result_text(
+    action_name: str,
+    is_accept: bool,
+    sender_name: str,
+    receiver_name: str,
+    sender_gender: Optional[str],
+    receiver_gender: Optional[str],
+) -> Optional[str]:
+    """
+    Текст результата по шаблонам actions.json с учётом пола
+
+    Returns:
+        Optional[str]: None если действия нет в actions.json
+    """
+    action = action_service.get_action_by_name(action_name)
+    if action is None:
+        return None
+
+    if is_accept:
+        text = action_service.get_accepted_text(
+            action["id"], sender_name, receiver_name, sender_gender
+        )
+        return f"{text} {action.get('emoji', '')}".rstrip()
+
+    text = action_service.get_rejected_text(action["id"], receiver_name, receiver_gender)
+    return f"{text} ❌"
+
+
 @router.callback_query(lambda c: c.data.startswith("iact:"))
 async def handle_interaction_callback(
     callback: CallbackQuery,
@@ -29,6 +79,7 @@ async def handle_interaction_callback(
     interaction_repo: InteractionRepository,
     action_repo: ActionRepository,
     action_stat_repo: ActionStatRepository,
+    container: ServiceContainer,
 ):
     """
     Обработка нажатий на кнопки Принять/Отказаться для взаимодействий.
@@ -85,7 +136,7 @@ async def handle_interaction_callback(
             await callback.answer()
             return
 
-        await user_service.register_or_update_user(receiver)
+        receiver_user = await user_service.register_or_update_user(receiver)
 
         # Получаем message_id если доступен
         message_id = callback.message.message_id if callback.message else None
@@ -123,10 +174,22 @@ async def handle_interaction_callback(
         sender_name = sender.full_name
         receiver_name = receiver.full_name
 
-        if is_accept:
+        # Тексты с учётом пола (пол - из кэша, без запроса к users)
+        genders = await resolve_genders(container, sender, receiver_user)
+        new_text = render_result_text(
+            action_name,
+            is_accept,
+            sender_name,
+            receiver_name,
+            genders[sender_id],
+            genders[receiver.id],
+        )
+
+        # Действия нет в actions.json - формы из БД
+        if new_text is None and is_accept:
             # Формат: {sender} {past_tense} {receiver} {emoji}
             new_text = f"{sender_name} {past_tense} {receiver_name} {emoji}"
-        else:
+        elif new_text is None:
             # Формат: {receiver} отказался от {genitive_noun} ❌
             new_text = f"{receiver_name} отказался от {genitive_noun} ❌"
 
@@ -13,7 +13,10 @@ from bot.database.repositories import (
     ActionStatRepository,
 )
 from bot.services.user import UserService
+from bot.services.action import ActionService
+from bot.services.cache import CacheService
 from bot.utils.formatters import format_stats_message
+from bot.utils.validators import is_valid_pack
 from bot.keyboards.reply_kb import get_user_main_keyboard, get_admin_main_keyboard
 from bot.core.config import settings
 
@@ -61,11 +64,13 @@ async def cmd_start(message: Message, user_repo: UserRepository):
 
 @router.message(Command("help"))
 @router.message(F.text == "📖 Помощь")
-async def cmd_help(message: Message, action_repo: ActionRepository):
+async def cmd_help(
+    message: Message, action_repo: ActionRepository, cache: CacheService
+):
     """Показать доступные паки действий"""
 
-    # Получаем все паки
-    packs = await action_repo.get_all_packs()
+    # Получаем все паки (индекс прогревается в кэше при старте)
+    packs = await ActionService(action_repo, cache).get_packs()
 
     text_parts = ["<b>📦 Доступные паки действий:</b>\n"]
 
@@ -93,15 +98,19 @@ async def cmd_help(message: Message, action_repo: ActionRepository):
 
 
 @router.message(Command("pack"))
-async def cmd_pack(message: Message, action_repo: ActionRepository):
+async def cmd_pack(
+    message: Message, action_repo: ActionRepository, cache: CacheService
+):
     """Показать все действия в конкретном паке"""
 
     # Получаем аргументы команды
     args = message.text.split(maxsplit=1)
 
+    packs = await ActionService(action_repo, cache).get_packs()
+
     if len(args) < 2:
         # Показываем список паков
-        pack_names = await action_repo.get_pack_names()
+        pack_names = list(packs)
         text = (
             "<b>📦 Доступные паки:</b>\n\n"
             + "\n".join([f"• {name}" for name in pack_names])
@@ -111,7 +120,10 @@ async def cmd_pack(message: Message, action_repo: ActionRepository):
         return
 
     pack_name = args[1]
-    pack_actions = await action_repo.get_pack_actions(pack_name)
+    pack_actions = packs.get(pack_name)
+    if pack_actions is None and is_valid_pack(pack_name):
+        # Индекс хранит точные названия - регистр решает репозиторий
+        pack_actions = await action_repo.get_pack_actions(pack_name)
 
     if not pack_actions:
         await message.answer(
@@ -188,6 +200,7 @@ async def cmd_admin(message: Message, action_stat_repo: ActionStatRepository):
         f"🔄 Всего действий: <b>{stats.get('total_actions', 0)}</b>\n\n"
         "<b>Доступные команды:</b>\n"
         "• <code>/broadcast</code> - Рассылка сообщений\n"
+        "• <code>/sync_commands</code> - Обновить меню команд\n"
         "• <code>/stats</code> - Ваша статистика\n"
     )
     await message.answer(text, parse_mode="HTML")
@@ -3,15 +3,13 @@
 """
 
 import logging
-from datetime import datetime
 
 from aiogram import Router, F
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Message, CallbackQuery
-from sqlalchemy.orm import Session
 
-from bot.database.models import User, GenderType
+from bot.database.repositories import UserRepository
 from bot.fsm.gender_states import GenderSelectionStates
 from bot.keyboards.gender import (
     get_gender_selection_keyboard,
@@ -20,10 +18,11 @@ from bot.keyboards.gender import (
     get_gender_settings_keyboard,
     get_gender_limit_keyboard,
 )
-from bot.services.user_service import UserService
+from bot.services.container import ServiceContainer
+from bot.services.gender import GENDER_CHANGE_LIMIT, GENDERS, GenderService
 
 logger = logging.getLogger(__name__)
-router = Router(name="gender_router")
+router = Router(name="gender")
 
 
 # ============================================================
@@ -47,43 +46,43 @@ def get_gender_text(gender: str) -> str:
 
 
 @router.message(Command("gender"))
-async def cmd_gender_settings(message: Message, session: Session, state: FSMContext):
+async def cmd_gender_settings(
+    message: Message, user_repo: UserRepository, state: FSMContext
+):
     """
     Команда для просмотра и изменения пола
 
     Args:
         message: Сообщение от пользователя
-        session: Сессия БД
+        user_repo: Репозиторий пользователей
         state: FSM контекст
     """
-    user_id = message.from_user.id
-
-    # Получаем пользователя
-    user = session.query(User).filter(User.user_id == user_id).first()
+    # Статус пола - один запрос
+    status = await GenderService(user_repo).get_status(message.from_user.id)
 
-    if not user:
+    if status is None:
         await message.answer(
             "❌ Ошибка: пользователь не найден.\nИспользуйте /start для регистрации."
         )
         return
 
     # Если пол не установлен - показываем выбор
-    if user.gender is None:
+    if status.gender is None:
         await show_gender_selection(message, state)
         return
 
     # Показываем настройки пола
-    remaining = user.remaining_gender_changes
+    remaining = status.remaining()
 
-    gender_emoji = get_gender_emoji(user.gender_value)
-    gender_text = get_gender_text(user.gender_value)
+    gender_emoji = get_gender_emoji(status.gender)
+    gender_text = get_gender_text(status.gender)
 
     text = f"""
 ⚙️ <b>Настройки пола</b>
 
 {gender_emoji} <b>Текущий пол:</b> {gender_text}
 
-📊 <b>Изменений осталось:</b> {remaining} из 3
+📊 <b>Изменений осталось:</b> {remaining} из {GENDER_CHANGE_LIMIT}
 ⏰ <b>Обновление лимита:</b> каждые 30 дней
 
 <i>Пол влияет на правильное склонение действий в боте.</i>
@@ -91,7 +90,7 @@ async def cmd_gender_settings(message: Message, session: Session, state: FSMCont
 
     await message.answer(
         text,
-        reply_markup=get_gender_settings_keyboard(user.gender_value, remaining),
+        reply_markup=get_gender_settings_keyboard(status.gender, remaining),
     )
 
 
@@ -133,14 +132,18 @@ async def show_gender_selection(message: Message, state: FSMContext):
 
 @router.callback_query(F.data.startswith("gender:select:"))
 async def callback_select_gender(
-    callback: CallbackQuery, session: Session, state: FSMContext
+    callback: CallbackQuery,
+    user_repo: UserRepository,
+    container: ServiceContainer,
+    state: FSMContext,
 ):
     """
     Обработка выбора пола при первой регистрации
 
     Args:
         callback: Callback от inline-кнопки
-        session: Сессия БД
+        user_repo: Репозиторий пользователей
+        container: Контейнер сервисов (кэш пола)
         state: FSM контекст
     """
     await callback.answer()
@@ -148,23 +151,15 @@ async def callback_select_gender(
     # Парсим выбранный пол
     _, _, gender = callback.data.split(":")
 
-    if gender not in ["male", "female"]:
+    if gender not in GENDERS:
         await callback.message.edit_text("❌ Ошибка: неверный пол.")
         return
 
     user_id = callback.from_user.id
 
-    # Получаем или создаём пользователя
-    user = UserService.get_or_create_user(
-        session=session,
-        user_id=user_id,
-        username=callback.from_user.username,
-        full_name=callback.from_user.full_name or "User",
-    )
-
-    # Устанавливаем пол
-    success = UserService.set_gender(
-        session=session, user_id=user_id, gender=gender, is_first_time=True
+    # Устанавливаем пол (пользователь создаётся, если ещё не зарегистрирован)
+    success = await GenderService(user_repo, container.genders).set_initial(
+        callback.from_user, gender
     )
 
     if success:
@@ -190,8 +185,10 @@ async def callback_select_gender(
         logger.info(f"✅ User {user_id} выбрал пол: {gender}")
 
     else:
+        # Повторное нажатие: пол уже выбран
+        await state.clear()
         await callback.message.edit_text(
-            "❌ Ошибка при установке пола. Попробуйте позже."
+            "ℹ️ Пол уже выбран. Изменить его можно через /gender."
         )
 
 
@@ -201,52 +198,48 @@ async def callback_select_gender(
 
 
 @router.callback_query(F.data == "gender:request_change")
-async def callback_request_gender_change(callback: CallbackQuery, session: Session):
+async def callback_request_gender_change(
+    callback: CallbackQuery, user_repo: UserRepository
+):
     """
     Запрос на изменение пола
 
     Args:
         callback: Callback от inline-кнопки
-        session: Сессия БД
+        user_repo: Репозиторий пользователей
     """
     await callback.answer()
 
-    user_id = callback.from_user.id
-    user = session.query(User).filter(User.user_id == user_id).first()
+    status = await GenderService(user_repo).get_status(callback.from_user.id)
 
-    if not user:
+    if status is None:
         await callback.message.edit_text("❌ Пользователь не найден.")
         return
 
     # Проверяем возможность изменения
-    if not user.can_change_gender:
-        remaining_days = 30
-        if user.last_gender_change:
-            days_passed = (datetime.utcnow() - user.last_gender_change).days
-            remaining_days = max(0, 30 - days_passed)
-
+    if not status.can_change():
         await callback.message.edit_text(
             f"""
 🚫 <b>Лимит изменений исчерпан</b>
 
-Вы уже изменили пол {user.gender_changes_count} раза за последние 30 дней.
+Вы уже изменили пол {status.changes_count} раза за последние 30 дней.
 
-⏰ <b>Лимит обновится через:</b> {remaining_days} дней
+⏰ <b>Лимит обновится через:</b> {status.days_until_reset()} дней
 
-<i>Лимит: 3 изменения в месяц</i>
+<i>Лимит: {GENDER_CHANGE_LIMIT} изменения в месяц</i>
 """,
             reply_markup=get_gender_limit_keyboard(),
         )
         return
 
     # Показываем выбор нового пола
-    current_gender = user.gender_value
-    remaining = user.remaining_gender_changes
+    current_gender = status.gender
+    remaining = status.remaining()
 
     text = f"""
 🔄 <b>Изменение пола</b>
 
-📊 <b>Осталось изменений:</b> {remaining} из 3
+📊 <b>Осталось изменений:</b> {remaining} из {GENDER_CHANGE_LIMIT}
 
 Выберите новый пол:
 """
@@ -262,32 +255,31 @@ async def callback_request_gender_change(callback: CallbackQuery, session: Sessi
 
 
 @router.callback_query(F.data.startswith("gender:change:"))
-async def callback_change_gender(callback: CallbackQuery, session: Session):
+async def callback_change_gender(callback: CallbackQuery, user_repo: UserRepository):
     """
     Обработка запроса на изменение пола
 
     Args:
         callback: Callback от inline-кнопки
-        session: Сессия БД
+        user_repo: Репозиторий пользователей
     """
     await callback.answer()
 
     # Парсим новый пол
     _, _, new_gender = callback.data.split(":")
 
-    if new_gender not in ["male", "female"]:
+    if new_gender not in GENDERS:
         await callback.message.edit_text("❌ Ошибка: неверный пол.")
         return
 
-    user_id = callback.from_user.id
-    user = session.query(User).filter(User.user_id == user_id).first()
+    status = await GenderService(user_repo).get_status(callback.from_user.id)
 
-    if not user:
+    if status is None:
         await callback.message.edit_text("❌ Пользователь не найден.")
         return
 
     # Проверяем лимит
-    if not user.can_change_gender:
+    if not status.can_change():
         await callback.message.edit_text(
             "❌ Лимит изменений исчерпан. Попробуйте позже."
         )
@@ -297,7 +289,7 @@ async def callback_change_gender(callback: CallbackQuery, session: Session):
     new_gender_emoji = get_gender_emoji(new_gender)
     new_gender_text = get_gender_text(new_gender)
 
-    remaining = user.remaining_gender_changes - 1  # После изменения
+    remaining = status.remaining() - 1  # После изменения
 
     text = f"""
 ⚠️ <b>Подтверждение изменения</b>
@@ -305,7 +297,7 @@ async def callback_change_gender(callback: CallbackQuery, session: Session):
 {new_gender_emoji} <b>Новый пол:</b> {new_gender_text}
 
 После изменения у вас останется:
-📊 <b>{remaining}</b> из 3 изменений
+📊 <b>{remaining}</b> из {GENDER_CHANGE_LIMIT} изменений
 
 Вы уверены?
 """
@@ -321,33 +313,35 @@ async def callback_change_gender(callback: CallbackQuery, session: Session):
 
 
 @router.callback_query(F.data.startswith("gender:confirm:"))
-async def callback_confirm_gender_change(callback: CallbackQuery, session: Session):
+async def callback_confirm_gender_change(
+    callback: CallbackQuery, user_repo: UserRepository, container: ServiceContainer
+):
     """
     Подтверждение и применение изменения пола
 
     Args:
         callback: Callback от inline-кнопки
-        session: Сессия БД
+        user_repo: Репозиторий пользователей
+        container: Контейнер сервисов (кэш пола)
     """
     await callback.answer()
 
     # Парсим новый пол
     _, _, new_gender = callback.data.split(":")
 
-    if new_gender not in ["male", "female"]:
+    if new_gender not in GENDERS:
         await callback.message.edit_text("❌ Ошибка: неверный пол.")
         return
 
     user_id = callback.from_user.id
 
-    # Применяем изменение
-    success = UserService.set_gender(
-        session=session, user_id=user_id, gender=new_gender, is_first_time=False
+    # Проверка лимита и изменение - один условный UPDATE
+    status = await GenderService(user_repo, container.genders).change(
+        user_id, new_gender
     )
 
-    if success:
-        user = session.query(User).filter(User.user_id == user_id).first()
-        remaining = user.remaining_gender_changes
+    if status is not None:
+        remaining = status.remaining()
 
         new_gender_emoji = get_gender_emoji(new_gender)
         new_gender_text = get_gender_text(new_gender)
@@ -358,7 +352,7 @@ async def callback_confirm_gender_change(callback: CallbackQuery, session: Sessi
 
 {new_gender_emoji} <b>Новый пол:</b> {new_gender_text}
 
-📊 <b>Осталось изменений:</b> {remaining} из 3
+📊 <b>Осталось изменений:</b> {remaining} из {GENDER_CHANGE_LIMIT}
 ⏰ <b>Лимит обновится через:</b> 30 дней
 
 Теперь все действия будут склоняться правильно!
@@ -413,24 +407,22 @@ async def callback_gender_info(callback: CallbackQuery):
 
 
 @router.callback_query(F.data == "gender:limit_reached")
-async def callback_gender_limit_reached(callback: CallbackQuery, session: Session):
+async def callback_gender_limit_reached(
+    callback: CallbackQuery, user_repo: UserRepository
+):
     """
     Обработка нажатия на кнопку исчерпанного лимита
 
     Args:
         callback: Callback от inline-кнопки
-        session: Сессия БД
+        user_repo: Репозиторий пользователей
     """
-    user_id = callback.from_user.id
-    user = session.query(User).filter(User.user_id == user_id).first()
+    status = await GenderService(user_repo).get_status(callback.from_user.id)
 
-    if not user or not user.last_gender_change:
+    if status is None or status.last_change is None:
         await callback.answer("Информация недоступна")
         return
 
-    days_passed = (datetime.utcnow() - user.last_gender_change).days
-    remaining_days = max(0, 30 - days_passed)
-
     await callback.answer(
-        f"Лимит обновится через {remaining_days} дней", show_alert=True
+        f"Лимит обновится через {status.days_until_reset()} дней", show_alert=True
     )
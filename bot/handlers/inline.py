@@ -5,6 +5,7 @@
 - Топ-3 самых часто используемых действия пользователя
 - Если меньше 3 - дополняется из стандартного пака
 - Поиск без заголовка
+- Деградированный режим: при недоступной БД ответы из снимка каталога
 """
 
 import logging
@@ -26,7 +27,13 @@ from bot.database.repositories import (
     ActionStatRepository,
     InteractionRepository,
 )
-from bot.services.cache import get_cache_service
+from bot.services.cache import CacheService
+from bot.core.tracing import span
+from bot.services.degraded import (
+    DB_UNAVAILABLE_ERRORS,
+    DEGRADED_UPDATES,
+    degraded_mode,
+)
 from bot.utils.conjugator import get_short_name
 
 router = Router(name="inline")
@@ -105,16 +112,17 @@ async def get_user_most_used_actions(
         .limit(limit)
     )
 
-    result = await interaction_repo.session.execute(query)
-    most_used_actions_data = result.all()
+    with span("top_actions_query"):
+        result = await interaction_repo.session.execute(query)
+        most_used_actions_data = result.all()
 
     if not most_used_actions_data:
         return []
 
     # Загружаем полные данные действий
-    all_actions_dict = {
-        action["name"]: action for action in await action_service.get_all_actions()
-    }
+    with span("catalog_load"):
+        all_actions = await action_service.get_all_actions()
+    all_actions_dict = {action["name"]: action for action in all_actions}
 
     most_used_actions = []
     for action_name, usage_count in most_used_actions_data:
@@ -151,7 +159,8 @@ async def show_user_top_actions(
 
     # Если меньше 3 действий - дополняем из стандартного пака
     if len(top_actions) < 3:
-        all_actions = await action_service.get_all_actions()
+        with span("catalog_load"):
+            all_actions = await action_service.get_all_actions()
 
         # Получаем названия уже добавленных действий
         used_action_names = {action["name"] for action in top_actions}
@@ -208,6 +217,34 @@ async def search_actions(
     return results
 
 
+def build_degraded_results(
+    query: InlineQuery, search_query: str
+) -> list[InlineQueryResultArticle]:
+    """
+    Ответ на inline запрос без БД - из последнего снимка каталога
+
+    Пустой запрос → первые 3 действия каталога (действия по умолчанию),
+    иначе поиск по названию.
+    """
+    sender = query.from_user
+    actions = degraded_mode.snapshot.get_actions()
+
+    if not search_query:
+        return [create_action_result(action, sender) for action in actions[:3]]
+
+    found = [action for action in actions if search_query in action["name"].lower()]
+    return [create_action_result(action, sender) for action in found[:50]]
+
+
+async def answer_degraded(query: InlineQuery, query_text: str) -> None:
+    """Ответить из снимка каталога и отложить регистрацию пользователя"""
+    DEGRADED_UPDATES.inc(handler="inline")
+    degraded_mode.queue_user_upsert(query.from_user)
+
+    results = build_degraded_results(query, query_text)
+    await query.answer(results, cache_time=5, is_personal=True)
+
+
 @router.inline_query()
 async def inline_query_handler(
     query: InlineQuery,
@@ -215,6 +252,7 @@ async def inline_query_handler(
     action_repo: ActionRepository,
     action_stat_repo: ActionStatRepository,
     interaction_repo: InteractionRepository,
+    cache: CacheService,
 ):
     """
     Главный обработчик inline запросов
@@ -222,19 +260,33 @@ async def inline_query_handler(
     ЛОГИКА:
     1. Пустой запрос → Топ-3 действия пользователя (дополненные до 3)
     2. Любой текст → Поиск по действиям (без заголовка)
+    3. БД недоступна → ответ из снимка каталога
     """
+    query_text = query.query.lower().strip()
+
+    # БД уже известна как недоступная - не ждём таймаутов подключения
+    if degraded_mode.active:
+        await answer_degraded(query, query_text)
+        return
+
     try:
         # Регистрируем пользователя
         user_service = UserService(user_repo)
-        await user_service.register_or_update_user(query.from_user)
+        try:
+            with span("user_upsert"):
+                await user_service.register_or_update_user(query.from_user)
+        except DB_UNAVAILABLE_ERRORS as e:
+            degraded_mode.mark_failure(e)
+            try:
+                await user_repo.session.rollback()
+            except DB_UNAVAILABLE_ERRORS:
+                pass
+            await answer_degraded(query, query_text)
+            return
 
         # Получаем сервисы
-        cache = await get_cache_service()
         action_service = ActionService(action_repo, cache, action_stat_repo)
 
-        # Получаем запрос пользователя
-        query_text = query.query.lower().strip()
-
         # === РЕЖИМ 1: Пустой запрос - показать топ действия ===
         if not query_text:
             results = await show_user_top_actions(
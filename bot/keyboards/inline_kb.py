@@ -9,7 +9,7 @@ Inline клавиатуры для бота
 
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
-from bot.core.config import settings
+from bot.core.catalog import get_catalog
 
 
 def get_actions_keyboard(receiver_id: int) -> InlineKeyboardMarkup:
@@ -26,20 +26,10 @@ def get_actions_keyboard(receiver_id: int) -> InlineKeyboardMarkup:
     """
     builder = InlineKeyboardBuilder()
 
-    # Эмодзи для действий
-    action_emojis = {
-        "погладить": "🤗",
-        "обнять": "🫂",
-        "поцеловать": "💋",
-        "ударить": "👊",
-        "похвалить": "👏",
-        "подмигнуть": "😉",
-        "улыбнуться": "😊",
-        "пнуть": "🦶",
-    }
-
-    for action in settings.actions:
-        emoji = action_emojis.get(action.lower(), "✨")
+    # Действия паков и их эмодзи - из каталога
+    catalog = get_catalog()
+    for action in catalog.names:
+        emoji = catalog.get(action)["emoji"]
         callback_data = f"action:{receiver_id}:{action}"
         builder.button(
             text=f"{emoji} {action.capitalize()}", callback_data=callback_data
@@ -12,24 +12,54 @@ from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
 from aiogram.fsm.storage.redis import RedisStorage
-from aiogram.types import BotCommand, BotCommandScopeDefault, BotCommandScopeChat
+from redis.asyncio import Redis
 
 # Конфигурация и логирование
 from bot.core.config import settings
 from bot.core.logging import setup_logging
+from bot.core.circuit_breaker import redis_breaker
+from bot.core.lifecycle import lifecycle
+from bot.core.loop_monitor import loop_monitor
+from bot.core.startup import startup
+from bot.core.tracing import tracer
+from bot.fsm.storage import BreakerStorage
 
 # База данных и Redis
-from bot.database.connection import get_engine, get_redis, close_redis
+from bot.database.connection import (
+    check_database_health,
+    close_redis,
+    get_engine,
+    get_redis,
+)
+from bot.database.instrumentation import instrument_engine
+from bot.database.pool import pool_monitor
 
 # Middleware
 from bot.middlewares.database import DatabaseMiddleware
+from bot.middlewares.drain import DrainMiddleware
 from bot.middlewares.throttling import ThrottlingMiddleware
+from bot.middlewares.metrics import UpdateMetricsMiddleware, instrument_router
+from bot.middlewares.scheduler import UpdateSchedulerMiddleware
+from bot.middlewares.telegram_api import TelegramApiMetricsMiddleware
+from bot.middlewares.tracing import TracingMiddleware
 
 # Роутеры
 from bot.handlers import commands, callbacks, inline, admin, gender
 
 # Health Check API
-from bot.api.health import setup_routes
+from bot.api.health import readiness_probe, setup_routes
+
+# Контейнер сервисов
+from bot.services.actions_watcher import actions_watcher
+from bot.services.container import init_container, warm_up
+
+# Отложенные записи и очередь отправки (сбрасываются при остановке)
+from bot.services.degraded import degraded_mode
+from bot.services.send_queue import send_queue
+
+# Редко нужные модули (webhook, /debug, Redis Streams, команды бота)
+# импортируются по требованию: их стоимость не входит в запуск,
+# если режим выключен. Профиль импорта: python -m scripts.profile_imports
 
 # Инициализация логирования
 setup_logging()
@@ -39,41 +69,6 @@ logger = logging.getLogger(__name__)
 shutdown_event = asyncio.Event()
 
 
-async def set_bot_commands(bot: Bot):
-    """Установка списка команд бота для разных пользователей"""
-
-    # === КОМАНДЫ ДЛЯ ОБЫЧНЫХ ПОЛЬЗОВАТЕЛЕЙ ===
-    user_commands = [
-        BotCommand(command="start", description="🏠 Главное меню"),
-        BotCommand(command="help", description="📖 Список действий"),
-        BotCommand(command="pack", description="📦 Паки действий"),
-        BotCommand(command="stats", description="📊 Моя статистика"),
-        BotCommand(command="gender", description="⚧️ Настройки пола"),
-    ]
-
-    await bot.set_my_commands(user_commands, scope=BotCommandScopeDefault())
-    logger.info("✅ Команды для обычных пользователей установлены")
-
-    # === КОМАНДЫ ДЛЯ АДМИНА ===
-    admin_commands = [
-        BotCommand(command="start", description="🏠 Главное меню"),
-        BotCommand(command="help", description="📖 Список действий"),
-        BotCommand(command="pack", description="📦 Паки действий"),
-        BotCommand(command="stats", description="📊 Моя статистика"),
-        BotCommand(command="gender", description="⚧️ Настройки пола"),
-        BotCommand(command="stats_global", description="📊 Глобальная статистика"),
-        BotCommand(command="add_action", description="➕ Добавить действие"),
-        BotCommand(command="list_actions", description="📋 Список действий"),
-        BotCommand(command="cache_clear", description="🗑 Очистить кэш"),
-        BotCommand(command="broadcast", description="📢 Рассылка"),
-    ]
-
-    await bot.set_my_commands(
-        admin_commands, scope=BotCommandScopeChat(chat_id=settings.admin_id)
-    )
-    logger.info("✅ Команды для администратора установлены")
-
-
 async def send_admin_notification(bot: Bot, message: str):
     """Отправка уведомления администратору"""
     try:
@@ -84,14 +79,12 @@ async def send_admin_notification(bot: Bot, message: str):
         logger.error(f"⚠️ Не удалось отправить уведомление админу: {e}")
 
 
-async def on_startup(bot: Bot):
-    """Действия при запуске бота"""
+async def on_startup(bot: Bot, redis: Redis):
+    """
+    Некритичные действия после начала приёма апдейтов:
+    команды бота (только изменённые области) и уведомление админу
+    """
     try:
-        logger.info("⏳ Запуск систем бота...")
-
-        # Устанавливаем команды бота
-        await set_bot_commands(bot)
-
         # Форматирование времени
         start_time = datetime.now().strftime("%d.%m.%Y %H:%M:%S")
 
@@ -101,14 +94,25 @@ async def on_startup(bot: Bot):
 ✅ Все системы активны
 ✅ База данных подключена
 ✅ Redis FSM Storage активен
-✅ Health Check API: http://localhost:8080/health
+✅ Health Check API: http://localhost:{settings.health_port}/health
 ✅ Обработчики загружены
 ✅ Система выбора пола активна
 
 ⏰ Время запуска: {start_time}
+⏱ Запуск занял: {startup.total or 0:.1f} с
 🤖 Бот готов к работе!
 """
-        await send_admin_notification(bot, startup_message)
+        from bot.services.bot_commands import BotCommandsService
+
+        results = await asyncio.gather(
+            BotCommandsService(redis).sync(bot),
+            send_admin_notification(bot, startup_message),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"❌ Ошибка при запуске: {result}")
+        startup.mark("post_start")
 
     except Exception as e:
         logger.error(f"❌ Ошибка при запуске: {e}")
@@ -139,26 +143,46 @@ def handle_signal(signum, frame):
     shutdown_event.set()
 
 
-async def start_health_check_server() -> web.AppRunner:
+async def start_health_check_server(dp: Dispatcher, bot: Bot) -> web.AppRunner:
     """
-    Запуск HTTP сервера для health checks
+    Запуск HTTP сервера для health checks (и webhook при BOT_MODE=webhook)
+
+    Args:
+        dp: Диспетчер (для webhook)
+        bot: Бот (для webhook)
 
     Returns:
         web.AppRunner: Runner для корректного завершения
     """
     app = web.Application()
     setup_routes(app)
+    if settings.debug_token:
+        from bot.api.debug import setup_debug_routes
+
+        setup_debug_routes(app)
+
+    # Маршруты регистрируются до runner.setup() - после него роутер заморожен
+    if settings.bot_mode == "webhook" and settings.bot_role != "worker":
+        from bot.api.webhook import setup_webhook_routes
+
+        setup_webhook_routes(app, dp, bot)
 
     runner = web.AppRunner(app)
     await runner.setup()
 
-    site = web.TCPSite(runner, host="0.0.0.0", port=8080)
+    site = web.TCPSite(runner, host="0.0.0.0", port=settings.health_port)
     await site.start()
 
-    logger.info("✅ Health Check API запущен на http://0.0.0.0:8080")
+    # Фоновая проверка готовности - /ready отвечает из памяти
+    readiness_probe.start()
+
+    logger.info(f"✅ Health Check API запущен на http://0.0.0.0:{settings.health_port}")
     logger.info("   - GET /health  - базовая проверка")
     logger.info("   - GET /ready   - проверка готовности (БД + Redis)")
-    logger.info("   - GET /metrics - базовые метрики")
+    logger.info("   - GET /metrics - метрики Prometheus")
+    logger.info("   - GET /metrics/json - базовые метрики в JSON")
+    if settings.debug_token:
+        logger.info("   - GET /debug/profile|tracemalloc|tasks - профилирование")
 
     return runner
 
@@ -171,59 +195,174 @@ async def main():
     signal.signal(signal.SIGINT, handle_signal)
     signal.signal(signal.SIGTERM, handle_signal)
 
-    # 1. Инициализация зависимостей
-    engine = get_engine()
+    startup.mark("imports")
 
-    # Подключаем Redis для FSM и кэша
-    redis = await get_redis()
+    # 1. Инициализация зависимостей
+    engine = instrument_engine(get_engine())
+    pool_monitor.attach(engine)
+    pool_monitor.start()
+    loop_monitor.start()
+    tracer.start()
+    startup.mark("init")
+
+    # Подключаем Redis для FSM и кэша, открываем первое соединение с БД
+    # и читаем снимок каталога для деградированного режима (параллельно)
+    redis, db_ok, _ = await asyncio.gather(
+        get_redis(), check_database_health(), degraded_mode.snapshot.load()
+    )
+    if not db_ok:
+        logger.warning("⚠️ БД недоступна при запуске")
+    startup.mark("dependencies")
 
-    # 2. Запуск Health Check API сервера
-    health_runner = await start_health_check_server()
+    # Контейнер сервисов: тот же Redis клиент для кэша
+    container = init_container(redis)
+    # Горячая перезагрузка actions.json (инвалидирует кэш действий)
+    actions_watcher.start(container.cache)
 
-    # 3. Настройка бота и диспетчера
+    # 2. Настройка бота и диспетчера
     bot = Bot(
         token=settings.bot_token,
         default=DefaultBotProperties(parse_mode=ParseMode.HTML),
     )
+    bot.session.middleware(TelegramApiMetricsMiddleware())
 
-    # Используем RedisStorage для FSM (состояний)
-    storage = RedisStorage(redis=redis)
+    # Используем RedisStorage для FSM (состояний) через circuit breaker
+    storage = BreakerStorage(RedisStorage(redis=redis), redis_breaker)
     dp = Dispatcher(storage=storage)
 
-    # 4. Регистрация Middleware (порядок важен!)
+    # Зависимости для handlers (доступны как аргументы cache / container)
+    dp["container"] = container
+    dp["cache"] = container.cache
+
+    # 3. Регистрация Middleware (порядок важен!)
+    dp.update.outer_middleware(TracingMiddleware())
+    dp.update.outer_middleware(UpdateMetricsMiddleware())
+    # Учёт апдейтов в обработке - остановка дождётся их завершения
+    dp.update.outer_middleware(DrainMiddleware())
+    if settings.bot_role == "ingest":
+        from bot.services.update_stream import (
+            StreamIngestMiddleware,
+            UpdateStreamProducer,
+        )
+
+        # Апдейт уходит в Redis Stream, следующие middleware и handlers не вызываются
+        dp.update.outer_middleware(
+            StreamIngestMiddleware(
+                UpdateStreamProducer(
+                    redis,
+                    partitions=settings.update_stream_partitions,
+                    maxlen=settings.update_stream_maxlen,
+                )
+            )
+        )
+    if settings.scheduler_enabled:
+        # Порядок по пользователю и лимит параллельных handlers (до сессий БД)
+        dp.update.outer_middleware(
+            UpdateSchedulerMiddleware(
+                max_in_flight=settings.scheduler_max_in_flight,
+                max_queue=settings.scheduler_max_queue,
+            )
+        )
     dp.update.outer_middleware(ThrottlingMiddleware())
     dp.update.outer_middleware(DatabaseMiddleware())
 
-    # 5. Регистрация Роутеров
-    dp.include_router(admin.router)
-    dp.include_router(gender.router)
-    dp.include_router(commands.router)
-    dp.include_router(callbacks.router)
-    dp.include_router(inline.router)
-
-    # 6. Запуск polling
-    try:
-        await bot.delete_webhook(drop_pending_updates=True)
+    # 4. Регистрация Роутеров (с замером времени handlers)
+    for module in (admin, gender, commands, callbacks, inline):
+        dp.include_router(instrument_router(module.router))
+
+    startup.mark("dispatcher")
+
+    # 5. Запуск Health Check API сервера (/ready = 503 до конца прогрева)
+    health_runner = await start_health_check_server(dp, bot)
+    startup.mark("health_server")
+    warmup_task = None
+    post_start_task = None
+    polling_task = None
+    stream_worker = None
+
+    # Очередь рассылок и буферы, которые нужно сбросить при остановке
+    send_queue.start(bot)
+    lifecycle.on_drain("degraded_replay_queue", degraded_mode.flush)
+    lifecycle.on_drain("send_queue", send_queue.drain)
+
+    async def stop_fetching() -> None:
+        """
+        Перестать получать апдейты
+
+        Webhook остаётся установленным: с lifecycle.draining handler
+        отвечает 503, и Telegram придержит апдейты до перезапуска.
+        """
+        if stream_worker is not None:
+            stream_worker.stop()
+            await polling_task
+        elif polling_task is not None:
+            await dp.stop_polling()
+            await polling_task
 
-        # Отправляем уведомление админу о запуске
-        await on_startup(bot)
+    async def prepare_updates() -> None:
+        """Настроить источник апдейтов в Telegram (webhook или его удаление)"""
+        if settings.bot_role == "worker":
+            return
+        if settings.bot_mode == "webhook":
+            from bot.api.webhook import set_webhook
 
-        logger.info("✅ Бот успешно запущен и готов к работе!")
+            # Апдейты приходят на POST WEBHOOK_PATH health check сервера
+            await set_webhook(bot, dp)
+        else:
+            await bot.delete_webhook(drop_pending_updates=True)
 
-        # Запускаем polling с проверкой shutdown_event
-        polling_task = asyncio.create_task(
-            dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
+    # 6. Запуск polling, webhook или воркера очереди
+    try:
+        # Прогрев кэша (БД + Redis) и настройка webhook (Telegram) независимы
+        warmed, _ = await asyncio.gather(warm_up(container), prepare_updates())
+        if not warmed:
+            logger.warning("⚠️ Кэш не прогрет, продолжаем прогрев в фоне")
+            warmup_task = asyncio.create_task(
+                warm_up(container, attempts=None, retry_delay=30.0)
+            )
+        startup.mark("warmup_and_webhook")
+
+        if settings.bot_role == "worker":
+            from bot.services.update_stream import UpdateStreamWorker, parse_partitions
+
+            # Апдейты читаются из Redis Stream, получением занимается ingest
+            stream_worker = UpdateStreamWorker(
+                redis,
+                dp,
+                bot,
+                partitions=parse_partitions(
+                    settings.worker_partitions, settings.update_stream_partitions
+                ),
+            )
+            polling_task = asyncio.create_task(stream_worker.run())
+        elif settings.bot_mode == "polling":
+            # Сигналы обрабатывает main (shutdown_event), сессию бота закрывает finally
+            polling_task = asyncio.create_task(
+                dp.start_polling(
+                    bot,
+                    allowed_updates=dp.resolve_used_update_types(),
+                    handle_signals=False,
+                    close_bot_session=False,
+                )
+            )
+
+        startup.finish()
+        logger.info(
+            f"✅ Бот успешно запущен и готов к работе! "
+            f"(роль: {settings.bot_role}, режим: {settings.bot_mode})"
         )
 
+        # Команды и уведомление админу - после начала приёма апдейтов.
+        # Отправляет только процесс, получающий апдейты
+        if settings.bot_role != "worker":
+            post_start_task = asyncio.create_task(on_startup(bot, redis))
+
         # Ждем сигнала остановки
         await shutdown_event.wait()
 
-        # Останавливаем polling
-        polling_task.cancel()
-        try:
-            await polling_task
-        except asyncio.CancelledError:
-            pass
+        # Drain: перестаём получать апдейты, ждём handlers, сбрасываем буферы.
+        # Необработанные записи stream остаются в нём для других воркеров
+        await lifecycle.drain(settings.shutdown_drain_timeout, stop_fetching)
 
     except KeyboardInterrupt:
         logger.info("⚠️ Получен сигнал остановки...")
@@ -233,14 +372,35 @@ async def main():
         # 7. Корректное завершение
         logger.info("🛑 Остановка бота...")
 
+        if warmup_task is not None:
+            warmup_task.cancel()
+        if post_start_task is not None and not post_start_task.done():
+            post_start_task.cancel()
+
+        # Polling / воркер, не остановившиеся за дедлайн drain
+        if polling_task is not None and not polling_task.done():
+            polling_task.cancel()
+            try:
+                await polling_task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+        await send_queue.stop()
+        await actions_watcher.stop()
+        await loop_monitor.stop()
+        await pool_monitor.stop()
+        tracer.stop()
+
         # Отправляем уведомление админу об остановке
-        try:
-            await on_shutdown(bot)
-        except Exception as e:
-            logger.warning(f"⚠️ Не удалось отправить уведомление об остановке: {e}")
+        if settings.bot_role != "worker":
+            try:
+                await on_shutdown(bot)
+            except Exception as e:
+                logger.warning(f"⚠️ Не удалось отправить уведомление об остановке: {e}")
 
         # Останавливаем Health Check сервер
         try:
+            await readiness_probe.stop()
             await health_runner.cleanup()
             logger.info("✅ Health Check API остановлен")
         except Exception as e:
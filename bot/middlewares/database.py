@@ -6,9 +6,11 @@ import logging
 from typing import Callable, Dict, Any, Awaitable
 
 from aiogram import BaseMiddleware
-from aiogram.types import TelegramObject
+from aiogram.types import TelegramObject, Update
 
+from bot.core.tracing import span
 from bot.database.connection import get_session_maker
+from bot.database.instrumentation import count_queries
 from bot.database.repositories import (
     UserRepository,
     InteractionRepository,
@@ -16,6 +18,7 @@ from bot.database.repositories import (
     ActionStatRepository,
     AdminRepository,
 )
+from bot.middlewares.metrics import get_update_type
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +26,8 @@ logger = logging.getLogger(__name__)
 class DatabaseMiddleware(BaseMiddleware):
     """
     Middleware для предоставления DB сессии и репозиториев в handlers.
-    Автоматически управляет транзакциями (commit/rollback).
+    Автоматически управляет транзакциями (commit/rollback)
+    и считает SQL запросы каждого апдейта.
     """
 
     async def __call__(
@@ -34,28 +38,32 @@ class DatabaseMiddleware(BaseMiddleware):
     ) -> Any:
         # Получаем фабрику сессий
         session_maker = get_session_maker()
+        update_type = get_update_type(event) if isinstance(event, Update) else "unknown"
 
-        # Создаём сессию
-        async with session_maker() as session:
-            # Внедряем сессию и все репозитории в data
-            data["db_session"] = session
-            data["user_repo"] = UserRepository(session)
-            data["interaction_repo"] = InteractionRepository(session)
-            data["action_repo"] = ActionRepository(session)
-            data["action_stat_repo"] = ActionStatRepository(session)
-            data["admin_repo"] = AdminRepository(session)
-
-            try:
-                # Вызываем handler
-                result = await handler(event, data)
-                # Если всё ок — коммитим
-                await session.commit()
-                return result
-            except Exception as e:
-                # Если ошибка — откатываем
-                await session.rollback()
-                logger.error(f"Database error in handler: {e}", exc_info=True)
-                raise
-            finally:
-                # Закрываем сессию
-                await session.close()
+        # Запросы апдейта считаются до закрытия сессии (включая commit)
+        with count_queries(update_type):
+            # Создаём сессию
+            async with session_maker() as session:
+                # Внедряем сессию и все репозитории в data
+                data["db_session"] = session
+                data["user_repo"] = UserRepository(session)
+                data["interaction_repo"] = InteractionRepository(session)
+                data["action_repo"] = ActionRepository(session)
+                data["action_stat_repo"] = ActionStatRepository(session)
+                data["admin_repo"] = AdminRepository(session)
+
+                try:
+                    # Вызываем handler
+                    result = await handler(event, data)
+                    # Если всё ок — коммитим
+                    with span("db.session_commit"):
+                        await session.commit()
+                    return result
+                except Exception as e:
+                    # Если ошибка — откатываем
+                    await session.rollback()
+                    logger.error(f"Database error in handler: {e}", exc_info=True)
+                    raise
+                finally:
+                    # Закрываем сессию
+                    await session.close()
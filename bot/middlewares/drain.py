@@ -0,0 +1,26 @@
+"""
+Middleware учёта апдейтов в обработке для drain при остановке
+"""
+
+from typing import Callable, Dict, Any, Awaitable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from bot.core.lifecycle import lifecycle
+
+
+class DrainMiddleware(BaseMiddleware):
+    """Считает апдейты в обработке, чтобы остановка могла их дождаться"""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        lifecycle.update_started()
+        try:
+            return await handler(event, data)
+        finally:
+            lifecycle.update_finished()
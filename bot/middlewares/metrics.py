@@ -0,0 +1,110 @@
+"""
+Middleware для сбора метрик обработки апдейтов
+
+- UpdateMetricsMiddleware (outer, на dp.update) - апдейты по типам
+  и полное время обработки
+- HandlerTimingMiddleware (inner, на observers роутера) - время работы
+  handlers конкретного роутера
+"""
+
+import time
+from typing import Callable, Dict, Any, Awaitable
+
+from aiogram import BaseMiddleware, Router
+from aiogram.types import TelegramObject, Update
+
+from bot.core.metrics import counter, histogram
+from bot.core.tracing import span
+
+UPDATES_TOTAL = counter(
+    "bot_updates_total",
+    "Полученные апдейты по типам",
+    ("type",),
+)
+UPDATE_DURATION = histogram(
+    "bot_update_duration_seconds",
+    "Полное время обработки апдейта (включая middleware)",
+    ("type",),
+)
+HANDLER_DURATION = histogram(
+    "bot_handler_duration_seconds",
+    "Время работы handler по роутерам",
+    ("router", "event"),
+)
+HANDLER_ERRORS = counter(
+    "bot_handler_errors_total",
+    "Исключения в handlers по роутерам",
+    ("router", "event"),
+)
+
+
+def get_update_type(update: Update) -> str:
+    """Тип апдейта (message, callback_query, inline_query, ...)"""
+    try:
+        return update.event_type
+    except Exception:
+        return "unknown"
+
+
+class UpdateMetricsMiddleware(BaseMiddleware):
+    """Счётчик апдейтов по типам и полное время обработки"""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        update_type = get_update_type(event) if isinstance(event, Update) else "unknown"
+        UPDATES_TOTAL.inc(type=update_type)
+
+        start = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            UPDATE_DURATION.observe(time.perf_counter() - start, type=update_type)
+
+
+class HandlerTimingMiddleware(BaseMiddleware):
+    """Время работы handlers одного роутера"""
+
+    def __init__(self, router_name: str, event_name: str):
+        self.router_name = router_name
+        self.event_name = event_name
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        start = time.perf_counter()
+        try:
+            with span(f"handler.{self.router_name}", event=self.event_name):
+                return await handler(event, data)
+        except Exception:
+            HANDLER_ERRORS.inc(router=self.router_name, event=self.event_name)
+            raise
+        finally:
+            HANDLER_DURATION.observe(
+                time.perf_counter() - start,
+                router=self.router_name,
+                event=self.event_name,
+            )
+
+
+def instrument_router(router: Router) -> Router:
+    """
+    Подключить замер времени handlers ко всем типам событий роутера
+
+    Args:
+        router: Роутер (имя роутера станет меткой router)
+
+    Returns:
+        Router: Тот же роутер
+    """
+    for event_name, observer in router.observers.items():
+        if event_name in ("update", "error"):
+            continue
+        observer.middleware(HandlerTimingMiddleware(router.name, event_name))
+    return router
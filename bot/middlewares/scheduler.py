@@ -0,0 +1,148 @@
+"""
+Планировщик обработки апдейтов (outer middleware на dp.update)
+
+ПРАВИЛА:
+- апдейты одного пользователя обрабатываются строго по очереди
+  (двойные нажатия и быстрые шаги выбора пола не гоняются друг с другом)
+- апдейты разных пользователей обрабатываются параллельно
+- одновременно работает не больше SCHEDULER_MAX_IN_FLIGHT handlers
+- если в очереди больше SCHEDULER_MAX_QUEUE апдейтов, новые апдейты
+  сбрасываются: inline запрос получает дешёвый ответ из снимка каталога,
+  callback - короткое уведомление, остальное отбрасывается
+
+Регистрируется до ThrottlingMiddleware и DatabaseMiddleware, чтобы
+ожидающие апдейты не держали сессии БД.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Any, Awaitable
+
+from aiogram import BaseMiddleware
+from aiogram.types import CallbackQuery, InlineQuery, TelegramObject, Update
+
+from bot.core.metrics import counter, gauge, histogram
+from bot.middlewares.metrics import get_update_type
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_IN_FLIGHT = gauge(
+    "bot_scheduler_in_flight",
+    "Апдейты, которые сейчас обрабатываются",
+)
+SCHEDULER_WAITING = gauge(
+    "bot_scheduler_waiting",
+    "Апдейты в очереди (ждут пользователя или свободный слот)",
+)
+SCHEDULER_WAIT = histogram(
+    "bot_scheduler_wait_seconds",
+    "Время ожидания апдейта в очереди планировщика",
+)
+SCHEDULER_SHED = counter(
+    "bot_scheduler_shed_total",
+    "Апдейты, сброшенные при переполнении очереди",
+    ("type",),
+)
+
+OVERLOAD_TEXT = "⏳ Бот сейчас перегружен, попробуйте ещё раз"
+
+
+@dataclass
+class _UserSlot:
+    """Очередь апдейтов одного пользователя"""
+
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    # Сколько апдейтов пользователя сейчас в планировщике
+    refs: int = 0
+
+
+class UpdateSchedulerMiddleware(BaseMiddleware):
+    """Порядок по пользователю, параллельность между пользователями, backpressure"""
+
+    def __init__(self, max_in_flight: int, max_queue: int):
+        """
+        Args:
+            max_in_flight: Максимум одновременно работающих handlers
+            max_queue: Глубина очереди, после которой апдейты сбрасываются
+        """
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._users: Dict[int, _UserSlot] = {}
+        self.waiting = 0
+        self.in_flight = 0
+
+        SCHEDULER_WAITING.set_function(lambda: self.waiting)
+        SCHEDULER_IN_FLIGHT.set_function(lambda: self.in_flight)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        if self.waiting >= self.max_queue:
+            return await self._shed(event)
+
+        user = data.get("event_from_user")
+        slot = self._enter_user(user.id) if user is not None else None
+
+        # waiting считается с момента входа: и ожидание пользователя, и слота
+        start = time.perf_counter()
+        self.waiting += 1
+        queued = True
+        try:
+            async with slot.lock if slot is not None else nullcontext():
+                async with self._semaphore:
+                    self.waiting -= 1
+                    queued = False
+                    SCHEDULER_WAIT.observe(time.perf_counter() - start)
+
+                    self.in_flight += 1
+                    try:
+                        return await handler(event, data)
+                    finally:
+                        self.in_flight -= 1
+        finally:
+            if queued:
+                self.waiting -= 1
+            if slot is not None:
+                self._leave_user(user.id, slot)
+
+    def _enter_user(self, user_id: int) -> _UserSlot:
+        slot = self._users.get(user_id)
+        if slot is None:
+            slot = self._users[user_id] = _UserSlot()
+        slot.refs += 1
+        return slot
+
+    def _leave_user(self, user_id: int, slot: _UserSlot) -> None:
+        slot.refs -= 1
+        if slot.refs == 0:
+            del self._users[user_id]
+
+    async def _shed(self, event: TelegramObject) -> None:
+        """Дешёвый ответ вместо обработки при переполнении очереди"""
+        update_type = get_update_type(event) if isinstance(event, Update) else "unknown"
+        SCHEDULER_SHED.inc(type=update_type)
+
+        if not isinstance(event, Update):
+            return None
+
+        try:
+            if isinstance(event.event, InlineQuery):
+                # Импорт здесь: handlers зависят от middleware, а не наоборот
+                from bot.handlers.inline import build_degraded_results
+
+                query = event.event
+                results = build_degraded_results(query, query.query.lower().strip())
+                await query.answer(results, cache_time=5, is_personal=True)
+            elif isinstance(event.event, CallbackQuery):
+                await event.event.answer(OVERLOAD_TEXT)
+        except Exception as e:
+            logger.debug(f"Не удалось ответить на сброшенный апдейт: {e}")
+
+        return None
@@ -0,0 +1,51 @@
+"""
+Middleware сессии бота для метрик и трассировки исходящих запросов
+к Telegram Bot API
+"""
+
+import time
+from typing import Any
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import Response, TelegramType
+
+from bot.core.metrics import counter, histogram
+from bot.core.tracing import span
+
+TELEGRAM_REQUESTS = counter(
+    "bot_telegram_api_requests_total",
+    "Запросы к Telegram Bot API по методам и результату",
+    ("method", "result"),
+)
+TELEGRAM_DURATION = histogram(
+    "bot_telegram_api_request_seconds",
+    "Латентность запросов к Telegram Bot API",
+    ("method",),
+)
+
+
+class TelegramApiMetricsMiddleware(BaseRequestMiddleware):
+    """Считает вызовы Bot API и их латентность, добавляет span в trace"""
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        method_name = type(method).__name__
+        start = time.perf_counter()
+        result = "error"
+        try:
+            with span(f"telegram.{method_name}"):
+                response: Any = await make_request(bot, method)
+            result = "ok"
+            return response
+        finally:
+            TELEGRAM_DURATION.observe(time.perf_counter() - start, method=method_name)
+            TELEGRAM_REQUESTS.inc(method=method_name, result=result)
@@ -0,0 +1,39 @@
+"""
+Middleware трассировки апдейтов
+
+Регистрируется первым outer middleware на dp.update, чтобы корневой span
+включал время остальных middleware (throttling, БД).
+"""
+
+from typing import Callable, Dict, Any, Awaitable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+
+from bot.core.tracing import tracer
+from bot.middlewares.metrics import get_update_type
+
+
+class TracingMiddleware(BaseMiddleware):
+    """Создаёт trace для каждого сэмплированного апдейта"""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        if not tracer.enabled:
+            return await handler(event, data)
+
+        attrs: Dict[str, Any] = {}
+        if isinstance(event, Update):
+            attrs["update_id"] = event.update_id
+            attrs["type"] = get_update_type(event)
+
+        with tracer.trace("update", **attrs) as root:
+            if root is not None:
+                user = data.get("event_from_user")
+                if user is not None:
+                    root.set(user_id=user.id)
+            return await handler(event, data)
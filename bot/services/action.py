@@ -9,8 +9,10 @@
 
 import logging
 from typing import Optional
+from bot.core.action_index import action_index
 from bot.database.repositories import ActionRepository, ActionStatRepository
 from bot.services.cache import CacheService
+from bot.services.degraded import degraded_mode
 from bot.database.models import Action
 
 logger = logging.getLogger(__name__)
@@ -50,6 +52,8 @@ class ActionService:
         if self.cache:
             cached = await self.cache.get_actions()
             if cached:
+                # Кэш общий для процессов: действие могли добавить в другом
+                action_index.sync_db(cached)
                 logger.debug(f"📦 Загружено {len(cached)} действий из кэша")
                 return cached
 
@@ -61,6 +65,10 @@ class ActionService:
         if self.cache:
             await self.cache.set_actions(actions)
 
+        # Снимок для деградированного режима (пишется только при изменениях)
+        await degraded_mode.snapshot.save(actions)
+        action_index.sync_db(actions)
+
         logger.debug(f"💾 Загружено {len(actions)} действий из БД")
         return actions
 
@@ -91,6 +99,25 @@ class ActionService:
 
         return action
 
+    async def get_packs(self) -> dict[str, list[dict]]:
+        """
+        Получить индекс паков (с кэшированием)
+
+        Returns:
+            dict: {название пака: [действия]}
+        """
+        if self.cache:
+            cached = await self.cache.get_packs()
+            if cached:
+                return cached
+
+        packs = await self.action_repo.get_all_packs()
+
+        if self.cache:
+            await self.cache.set_packs(packs)
+
+        return packs
+
     async def search_actions(self, query: str) -> list[dict]:
         """
         Поиск действий по части названия
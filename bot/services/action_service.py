@@ -1,38 +1,214 @@
-"""Сервис для работы с действиями из actions.json"""
+"""
+Сервис для работы с действиями из actions.json
 
-import json
-from pathlib import Path
-from typing import Optional, List, Dict
-from functools import lru_cache
+Действия берутся из единого каталога (bot/core/catalog.py) и
+компилируются в ActionCatalog:
+- индексы по id, по названию (casefold) и по категории - поиск O(1)
+- шаблоны текстов ("{user1} обнял {user2}") заранее разбиты на части,
+  рендеринг - только склейка строк без разбора str.format
+
+Каталог заменяется целиком (одно присваивание) - при горячей
+перезагрузке файла (bot/services/actions_watcher.py) читатели видят
+либо старый, либо новый каталог, но не смесь.
+
+Бенчмарк: python -m scripts.bench_action_service
+"""
+
+from dataclasses import dataclass
+from string import Formatter
+from typing import Optional, List, Dict, Tuple
+
+from bot.core.catalog import (
+    Catalog,
+    CatalogSignature,
+    catalog_signature,
+    get_catalog,
+    load_catalog,
+    set_catalog,
+)
+
+GENDERS = ("male", "female")
+DEFAULT_GENDER = "male"
+
+# Поля, допустимые в шаблонах
+TEMPLATE_FIELDS = frozenset({"user1", "user2"})
+
+# Подпись файлов каталога для отслеживания изменений
+FileSignature = CatalogSignature
+
+
+# ========== СКОМПИЛИРОВАННЫЕ ШАБЛОНЫ ==========
+
+
+class CompiledTemplate:
+    """
+    Шаблон, разбитый на литералы и поля
+
+    "{user1} обнял {user2}" → (("user1", False), (" обнял ", True), ("user2", False))
+    """
+
+    __slots__ = ("source", "_chunks")
+
+    def __init__(self, source: str):
+        chunks: List[Tuple[str, bool]] = []
+        for literal, field, spec, conversion in Formatter().parse(source):
+            if literal:
+                chunks.append((literal, True))
+            if field is None:
+                continue
+            if field not in TEMPLATE_FIELDS or spec or conversion:
+                raise ValueError(f"Недопустимое поле шаблона {{{field}}}: {source!r}")
+            chunks.append((field, False))
+
+        self.source = source
+        self._chunks: Tuple[Tuple[str, bool], ...] = tuple(chunks)
+
+    def render(self, values: Dict[str, str]) -> str:
+        """Подставить значения полей (эквивалент source.format(**values))"""
+        return "".join(
+            [text if is_literal else values[text] for text, is_literal in self._chunks]
+        )
+
+
+@dataclass(frozen=True)
+class CompiledAction:
+    """Шаблоны одного действия по полу"""
+
+    inline: CompiledTemplate
+    accepted: Dict[str, CompiledTemplate]
+    rejected: Dict[str, CompiledTemplate]
+
+
+def _compile_gendered(action: Dict, key: str) -> Dict[str, CompiledTemplate]:
+    templates = action.get(key)
+    if not isinstance(templates, dict) or DEFAULT_GENDER not in templates:
+        raise ValueError(f"Действие {action.get('id')}: нет шаблона {key}.{DEFAULT_GENDER}")
+    compiled = {gender: CompiledTemplate(templates[gender]) for gender in templates}
+    # Отсутствующий пол - шаблон по умолчанию (как .get(gender, male))
+    for gender in GENDERS:
+        compiled.setdefault(gender, compiled[DEFAULT_GENDER])
+    return compiled
+
+
+# ========== КАТАЛОГ ==========
+
+
+class ActionCatalog:
+    """Неизменяемый скомпилированный каталог actions.json"""
+
+    def __init__(self, data: Dict, source: Optional[Catalog] = None):
+        """
+        Args:
+            data: Содержимое actions.json
+            source: Единый каталог, из которого получены данные
+
+        Raises:
+            ValueError: Некорректная структура, дубли id / названий, ошибки шаблонов
+        """
+        actions = data.get("actions")
+        if not isinstance(actions, list):
+            raise ValueError("actions.json: ожидается список 'actions'")
+
+        self.data = data
+        self.source = source
+        self.version: Optional[str] = data.get("version")
+        self.actions: List[Dict] = actions
+        self.by_id: Dict[int, Dict] = {}
+        self.by_name: Dict[str, Dict] = {}
+        self.by_category: Dict[str, List[Dict]] = {}
+        self.compiled: Dict[int, CompiledAction] = {}
+        # (название casefold, действие) для поиска по подстроке
+        self.search_keys: Tuple[Tuple[str, Dict], ...] = ()
+
+        search_keys = []
+        for action in actions:
+            try:
+                action_id = action["id"]
+                name = action["name"]
+            except (KeyError, TypeError):
+                raise ValueError(f"actions.json: действие без id или name: {action!r}")
+
+            key = name.casefold()
+            if action_id in self.by_id:
+                raise ValueError(f"actions.json: повторяется id {action_id}")
+            if key in self.by_name:
+                raise ValueError(f"actions.json: повторяется название {name!r}")
+
+            self.compiled[action_id] = CompiledAction(
+                inline=CompiledTemplate(action.get("inline_text", "")),
+                accepted=_compile_gendered(action, "accepted"),
+                rejected=_compile_gendered(action, "rejected"),
+            )
+            self.by_id[action_id] = action
+            self.by_name[key] = action
+            self.by_category.setdefault(action.get("category"), []).append(action)
+            search_keys.append((key, action))
+
+        self.search_keys = tuple(search_keys)
+
+    @classmethod
+    def from_catalog(cls, catalog: Catalog) -> "ActionCatalog":
+        """Скомпилировать действия с шаблонами из единого каталога"""
+        data = {
+            "version": catalog.sources.get("actions_json_version"),
+            "actions": catalog.json_actions(),
+        }
+        return cls(data, source=catalog)
+
+    def __len__(self) -> int:
+        return len(self.actions)
 
 
 class ActionService:
     """Сервис для работы с действиями бота"""
 
     def __init__(self):
-        self.actions_path = Path(__file__).parent.parent / "data" / "actions.json"
-        self._actions_data = None
+        self._catalog: Optional[ActionCatalog] = None
+        # Подпись файлов, из которых собран текущий каталог
+        self.signature: Optional[FileSignature] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._catalog is not None
+
+    @property
+    def catalog(self) -> ActionCatalog:
+        """Ленивая компиляция действий из общего каталога"""
+        if self._catalog is None:
+            self._catalog = ActionCatalog.from_catalog(get_catalog())
+            self.signature = self.file_signature()
+        return self._catalog
+
+    def file_signature(self) -> Optional[FileSignature]:
+        """mtime и размер файлов каталога (None если все недоступны)"""
+        signature = catalog_signature()
+        return signature if any(signature) else None
+
+    def load(self) -> Tuple[Optional[FileSignature], ActionCatalog]:
+        """
+        Прочитать и скомпилировать каталог, не меняя текущий
+
+        Подпись снимается до чтения: если файл изменится во время чтения,
+        следующая проверка увидит новую подпись и перечитает его.
+        """
+        signature = self.file_signature()
+        return signature, ActionCatalog.from_catalog(load_catalog())
+
+    def swap(self, catalog: ActionCatalog, signature: Optional[FileSignature]) -> None:
+        """Атомарно заменить каталог (и общий каталог для остальных потребителей)"""
+        if catalog.source is not None:
+            set_catalog(catalog.source)
+        self._catalog = catalog
+        self.signature = signature
 
     @property
     def actions_data(self) -> dict:
-        """Ленивая загрузка данных о действиях"""
-        if self._actions_data is None:
-            self._load_actions()
-        return self._actions_data
-
-    def _load_actions(self):
-        """Загрузить действия из JSON файла"""
-        try:
-            with open(self.actions_path, "r", encoding="utf-8") as f:
-                self._actions_data = json.load(f)
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Файл actions.json не найден: {self.actions_path}")
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Ошибка парсинга JSON: {e}")
+        """Исходное содержимое actions.json"""
+        return self.catalog.data
 
     def get_all_actions(self) -> List[Dict]:
         """Получить все действия"""
-        return self.actions_data.get("actions", [])
+        return self.catalog.actions
 
     def get_action_by_id(self, action_id: int) -> Optional[Dict]:
         """
@@ -44,14 +220,11 @@ class ActionService:
         Returns:
             Словарь с данными действия или None
         """
-        for action in self.get_all_actions():
-            if action["id"] == action_id:
-                return action
-        return None
+        return self.catalog.by_id.get(action_id)
 
     def get_action_by_name(self, action_name: str) -> Optional[Dict]:
         """
-        Получить действие по названию
+        Получить действие по названию (без учёта регистра)
 
         Args:
             action_name: Название действия
@@ -59,10 +232,7 @@ class ActionService:
         Returns:
             Словарь с данными действия или None
         """
-        for action in self.get_all_actions():
-            if action["name"].lower() == action_name.lower():
-                return action
-        return None
+        return self.catalog.by_name.get(action_name.casefold())
 
     def get_actions_by_category(self, category: str) -> List[Dict]:
         """
@@ -74,11 +244,7 @@ class ActionService:
         Returns:
             Список действий в категории
         """
-        return [
-            action
-            for action in self.get_all_actions()
-            if action.get("category") == category
-        ]
+        return list(self.catalog.by_category.get(category, ()))
 
     def get_inline_text(self, action_id: int, user1_name: str) -> str:
         """
@@ -91,11 +257,11 @@ class ActionService:
         Returns:
             Форматированный текст
         """
-        action = self.get_action_by_id(action_id)
-        if not action:
+        compiled = self.catalog.compiled.get(action_id)
+        if not compiled:
             return ""
 
-        return action["inline_text"].format(user1=user1_name)
+        return compiled.inline.render({"user1": user1_name})
 
     def get_accepted_text(
         self, action_id: int, user1_name: str, user2_name: str, user1_gender: str
@@ -112,14 +278,12 @@ class ActionService:
         Returns:
             Форматированный текст
         """
-        action = self.get_action_by_id(action_id)
-        if not action:
+        compiled = self.catalog.compiled.get(action_id)
+        if not compiled:
             return ""
 
-        gender = user1_gender if user1_gender in ["male", "female"] else "male"
-        text_template = action["accepted"].get(gender, action["accepted"]["male"])
-
-        return text_template.format(user1=user1_name, user2=user2_name)
+        template = compiled.accepted.get(user1_gender) or compiled.accepted[DEFAULT_GENDER]
+        return template.render({"user1": user1_name, "user2": user2_name})
 
     def get_rejected_text(
         self, action_id: int, user2_name: str, user2_gender: str
@@ -135,18 +299,16 @@ class ActionService:
         Returns:
             Форматированный текст
         """
-        action = self.get_action_by_id(action_id)
-        if not action:
+        compiled = self.catalog.compiled.get(action_id)
+        if not compiled:
             return ""
 
-        gender = user2_gender if user2_gender in ["male", "female"] else "male"
-        text_template = action["rejected"].get(gender, action["rejected"]["male"])
-
-        return text_template.format(user2=user2_name)
+        template = compiled.rejected.get(user2_gender) or compiled.rejected[DEFAULT_GENDER]
+        return template.render({"user2": user2_name})
 
     def get_action_emoji(self, action_id: int) -> str:
         """Получить emoji действия"""
-        action = self.get_action_by_id(action_id)
+        action = self.catalog.by_id.get(action_id)
         return action.get("emoji", "❓") if action else "❓"
 
     def search_actions(self, query: str) -> List[Dict]:
@@ -159,14 +321,8 @@ class ActionService:
         Returns:
             Список найденных действий
         """
-        query = query.lower()
-        results = []
-
-        for action in self.get_all_actions():
-            if query in action["name"].lower():
-                results.append(action)
-
-        return results
+        query = query.casefold()
+        return [action for key, action in self.catalog.search_keys if query in key]
 
 
 # Глобальный экземпляр сервиса
@@ -0,0 +1,114 @@
+"""
+Горячая перезагрузка каталога действий
+
+Отслеживаются bot/data/catalog.json, bot/data/actions.json и
+bot/data/action_tables.json.
+
+Фоновая задача раз в ACTIONS_RELOAD_INTERVAL секунд сравнивает mtime
+и размер файлов с подписью текущего каталога. Если файл изменился:
+1. Каталог читается и компилируется в отдельном потоке (loop не блокируется)
+2. Новый каталог атомарно подменяет старый (ActionService.swap) - и для
+   ActionService, и для остальных потребителей get_catalog()
+3. Кэш действий инвалидируется (CacheService.invalidate_actions)
+
+Ошибка разбора или валидации не прерывает работу: остаётся прежний
+каталог, ошибка логируется один раз для этой версии файлов.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from bot.core.config import settings
+from bot.core.metrics import counter
+from bot.services.action_service import ActionService, FileSignature, action_service
+from bot.services.cache import CacheService
+
+logger = logging.getLogger(__name__)
+
+ACTIONS_RELOADS = counter(
+    "bot_actions_reloads_total",
+    "Перезагрузки каталога действий (ok / error)",
+    ("result",),
+)
+
+
+class ActionsFileWatcher:
+    """Опрос файлов каталога и атомарная замена каталога"""
+
+    def __init__(self, service: ActionService):
+        self.service = service
+        self.cache: Optional[CacheService] = None
+        # Подпись файлов, которые не удалось загрузить (не перечитываем его)
+        self._failed: Optional[FileSignature] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def check(self) -> bool:
+        """
+        Перезагрузить каталог, если файлы изменились
+
+        Returns:
+            bool: True если каталог заменён
+        """
+        signature = self.service.file_signature()
+        if signature is None or signature in (self.service.signature, self._failed):
+            return False
+
+        first_load = not self.service.loaded
+        try:
+            new_signature, catalog = await asyncio.to_thread(self.service.load)
+        except (OSError, ValueError) as e:
+            self._failed = signature
+            ACTIONS_RELOADS.inc(result="error")
+            logger.error(f"❌ Каталог не перезагружен, остаётся прежний: {e}")
+            return False
+
+        self.service.swap(catalog, new_signature)
+        self._failed = None
+        if first_load:
+            return True
+
+        ACTIONS_RELOADS.inc(result="ok")
+        logger.info(
+            f"🔄 Каталог перезагружен: {len(catalog)} действий с шаблонами "
+            f"(версия {catalog.source.version if catalog.source else '-'})"
+        )
+        if self.cache is not None:
+            await self.cache.invalidate_actions()
+        return True
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"❌ Ошибка проверки каталога: {e}")
+
+    def start(self, cache: Optional[CacheService] = None) -> None:
+        """
+        Запустить опрос файлов (ACTIONS_RELOAD_INTERVAL=0 - выключено)
+
+        Args:
+            cache: Кэш, который инвалидируется после замены каталога
+        """
+        self.cache = cache
+        interval = settings.actions_reload_interval
+        if not interval or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run(interval), name="actions-watcher")
+        logger.info(f"✅ Горячая перезагрузка каталога: опрос каждые {interval:g}с")
+
+    async def stop(self) -> None:
+        """Остановить опрос"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Глобальный экземпляр
+actions_watcher = ActionsFileWatcher(action_service)
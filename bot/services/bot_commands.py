@@ -0,0 +1,155 @@
+"""
+Сервис синхронизации команд бота (set_my_commands)
+
+Для каждой области (пользователи, админ) считается хэш списка команд
+и хранится в Redis. При запуске set_my_commands вызывается только для
+областей, у которых хэш изменился - перезапуски и rolling deploy
+не тратят квоту Bot API.
+
+Принудительная синхронизация: админская команда /sync_commands.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from aiogram import Bot
+from aiogram.types import (
+    BotCommand,
+    BotCommandScope,
+    BotCommandScopeChat,
+    BotCommandScopeDefault,
+)
+from redis.asyncio import Redis
+
+from bot.core.circuit_breaker import redis_breaker
+from bot.core.config import settings
+from bot.services.cache import REDIS_ERRORS
+
+logger = logging.getLogger(__name__)
+
+# Ключ хэша команд: bot:commands:{bot_id}:{scope}
+COMMANDS_HASH_PREFIX = "bot:commands"
+
+
+# ========== СПИСКИ КОМАНД ==========
+
+# === КОМАНДЫ ДЛЯ ОБЫЧНЫХ ПОЛЬЗОВАТЕЛЕЙ ===
+USER_COMMANDS = [
+    BotCommand(command="start", description="🏠 Главное меню"),
+    BotCommand(command="help", description="📖 Список действий"),
+    BotCommand(command="pack", description="📦 Паки действий"),
+    BotCommand(command="stats", description="📊 Моя статистика"),
+    BotCommand(command="gender", description="⚧️ Настройки пола"),
+]
+
+# === КОМАНДЫ ДЛЯ АДМИНА ===
+ADMIN_COMMANDS = [
+    *USER_COMMANDS,
+    BotCommand(command="stats_global", description="📊 Глобальная статистика"),
+    BotCommand(command="add_action", description="➕ Добавить действие"),
+    BotCommand(command="list_actions", description="📋 Список действий"),
+    BotCommand(command="cache_clear", description="🗑 Очистить кэш"),
+    BotCommand(command="broadcast", description="📢 Рассылка"),
+    BotCommand(command="sync_commands", description="🔄 Обновить меню команд"),
+]
+
+
+@dataclass
+class CommandScope:
+    """Область видимости команд"""
+
+    name: str
+    scope: BotCommandScope
+    commands: List[BotCommand]
+
+    def digest(self) -> str:
+        """Хэш команд и области (любое изменение описания меняет хэш)"""
+        payload = {
+            "scope": self.scope.model_dump(exclude_none=True),
+            "commands": [[c.command, c.description] for c in self.commands],
+        }
+        raw = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def get_command_scopes() -> List[CommandScope]:
+    """Все области, для которых устанавливаются команды"""
+    return [
+        CommandScope("default", BotCommandScopeDefault(), USER_COMMANDS),
+        CommandScope(
+            f"admin:{settings.admin_id}",
+            BotCommandScopeChat(chat_id=settings.admin_id),
+            ADMIN_COMMANDS,
+        ),
+    ]
+
+
+# ========== СИНХРОНИЗАЦИЯ ==========
+
+
+class BotCommandsService:
+    """Установка команд бота с пропуском неизменённых областей"""
+
+    def __init__(self, redis: Redis):
+        self.redis = redis
+
+    @staticmethod
+    def _key(bot: Bot, scope: CommandScope) -> str:
+        return f"{COMMANDS_HASH_PREFIX}:{bot.id}:{scope.name}"
+
+    async def _get_stored(self, key: str) -> Optional[str]:
+        try:
+            value = await redis_breaker.call(lambda: self.redis.get(key))
+        except REDIS_ERRORS as e:
+            # Без Redis считаем, что команды могли измениться
+            logger.debug(f"Хэш команд недоступен ({key}): {e}")
+            return None
+        if isinstance(value, bytes):
+            value = value.decode()
+        return value
+
+    async def _store(self, key: str, digest: str) -> None:
+        try:
+            await redis_breaker.call(lambda: self.redis.set(key, digest))
+        except REDIS_ERRORS as e:
+            logger.warning(f"⚠️ Не удалось сохранить хэш команд {key}: {e}")
+
+    async def _sync_scope(self, bot: Bot, scope: CommandScope, force: bool) -> str:
+        key = self._key(bot, scope)
+        digest = scope.digest()
+
+        if not force and await self._get_stored(key) == digest:
+            return "unchanged"
+
+        await bot.set_my_commands(scope.commands, scope=scope.scope)
+        await self._store(key, digest)
+        return "updated"
+
+    async def sync(self, bot: Bot, force: bool = False) -> Dict[str, str]:
+        """
+        Установить команды для всех областей
+
+        Args:
+            bot: Бот
+            force: Установить даже если хэш не изменился
+
+        Returns:
+            Dict[str, str]: Область → "updated" / "unchanged"
+        """
+        scopes = get_command_scopes()
+        # Области независимы - синхронизируем параллельно
+        results = await asyncio.gather(
+            *(self._sync_scope(bot, scope, force) for scope in scopes)
+        )
+        summary = {scope.name: result for scope, result in zip(scopes, results)}
+
+        updated = [name for name, result in summary.items() if result == "updated"]
+        if updated:
+            logger.info(f"✅ Команды бота обновлены: {', '.join(updated)}")
+        else:
+            logger.info("✅ Команды бота не изменились, set_my_commands пропущен")
+        return summary
@@ -5,17 +5,53 @@
 - Кэширование списка активных действий
 - Автоматическое обновление при изменениях
 - Fallback на БД если Redis недоступен
+- Метрики по семействам ключей (hit/miss/error, байты, латентность)
+- Circuit breaker: при недоступном Redis - мгновенный fallback
+  на последние значения в памяти процесса
 """
 
+import asyncio
 import json
 import logging
-from typing import Optional, Any
+import time
+from typing import Optional, Any, Awaitable, Callable, Dict, List, TypeVar
 from redis.asyncio import Redis
 from redis.exceptions import RedisError
 from bot.core.config import settings
+from bot.core.circuit_breaker import CircuitOpenError, redis_breaker
+from bot.core.metrics import counter, histogram
+from bot.core.tracing import span
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Отказы Redis, после которых работаем без кэша
+REDIS_ERRORS = (RedisError, CircuitOpenError, asyncio.TimeoutError, OSError)
+
+# ========== МЕТРИКИ ==========
+
+CACHE_LOOKUPS = counter(
+    "bot_cache_lookups_total",
+    "Чтения из кэша по семействам ключей (hit/miss/fallback)",
+    ("family", "result"),
+)
+CACHE_ERRORS = counter(
+    "bot_cache_errors_total",
+    "Ошибки Redis по семействам ключей и операциям",
+    ("family", "operation"),
+)
+CACHE_BYTES = counter(
+    "bot_cache_bytes_total",
+    "Объём прочитанных/записанных данных кэша",
+    ("family", "direction"),
+)
+CACHE_LATENCY = histogram(
+    "bot_cache_operation_seconds",
+    "Латентность операций Redis в кэше",
+    ("family", "operation"),
+)
+
 
 class CacheService:
     """Сервис для работы с Redis кэшем"""
@@ -23,10 +59,12 @@ class CacheService:
     # Ключи кэша
     ACTIONS_KEY = "bot:actions:all"
     ACTION_BY_NAME_PREFIX = "bot:action:name:"
+    PACKS_KEY = "bot:actions:packs"
 
     # Время жизни кэша (секунды)
     ACTIONS_TTL = 300  # 5 минут
     ACTION_TTL = 600  # 10 минут
+    PACKS_TTL = 300  # 5 минут
 
     def __init__(self, redis_client: Optional[Redis] = None):
         """
@@ -35,6 +73,94 @@ class CacheService:
         """
         self.redis = redis_client
         self._enabled = redis_client is not None
+        # Последние известные значения (fallback при недоступном Redis)
+        self._local: Dict[str, Any] = {}
+
+    async def _call(
+        self, family: str, operation: str, func: Callable[[], Awaitable[T]]
+    ) -> T:
+        """
+        Выполнить операцию Redis через circuit breaker с замером латентности
+
+        Args:
+            family: Семейство ключей (actions, action, ...)
+            operation: Операция Redis (get, setex, delete, scan)
+            func: Фабрика корутины с вызовом Redis
+        """
+        start = time.perf_counter()
+        try:
+            with span(f"redis.{operation}", family=family):
+                return await redis_breaker.call(func)
+        except REDIS_ERRORS:
+            CACHE_ERRORS.inc(family=family, operation=operation)
+            raise
+        finally:
+            CACHE_LATENCY.observe(
+                time.perf_counter() - start, family=family, operation=operation
+            )
+
+    async def hmget(self, family: str, key: str, fields: List[Any]) -> List[Optional[bytes]]:
+        """
+        HMGET через circuit breaker и метрики
+
+        Raises:
+            REDIS_ERRORS: Redis недоступен (обрабатывает вызывающий)
+        """
+        return await self._call(family, "hmget", lambda: self.redis.hmget(key, fields))
+
+    async def hset(self, family: str, key: str, field: str, value: str) -> None:
+        """
+        HSET через circuit breaker и метрики
+
+        Raises:
+            REDIS_ERRORS: Redis недоступен (обрабатывает вызывающий)
+        """
+        await self._call(family, "hset", lambda: self.redis.hset(key, field, value))
+
+    async def _get(self, family: str, key: str) -> Optional[Any]:
+        """
+        Прочитать и декодировать JSON значение с учётом hit/miss
+
+        Если Redis недоступен (или breaker открыт), возвращается последняя
+        копия значения из памяти процесса.
+        """
+        try:
+            data = await self._call(family, "get", lambda: self.redis.get(key))
+        except REDIS_ERRORS:
+            local = self._local.get(key)
+            if local is None:
+                raise
+            CACHE_LOOKUPS.inc(family=family, result="fallback")
+            return local
+
+        if not data:
+            CACHE_LOOKUPS.inc(family=family, result="miss")
+            return None
+
+        CACHE_LOOKUPS.inc(family=family, result="hit")
+        CACHE_BYTES.inc(len(data), family=family, direction="read")
+        value = json.loads(data)
+        self._local[key] = value
+        return value
+
+    async def _setex(self, family: str, key: str, ttl: int, value: Any) -> None:
+        """Закодировать значение в JSON и записать с TTL"""
+        self._local[key] = value
+        payload = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        await self._call(family, "setex", lambda: self.redis.setex(key, ttl, payload))
+        CACHE_BYTES.inc(len(payload), family=family, direction="write")
+
+    async def _scan_keys(self, pattern: str) -> list:
+        """Собрать все ключи по шаблону"""
+        return [key async for key in self.redis.scan_iter(match=pattern)]
+
+    @staticmethod
+    def _log_error(message: str, error: BaseException) -> None:
+        """Логировать ошибку Redis (открытый breaker - только debug)"""
+        if isinstance(error, CircuitOpenError):
+            logger.debug(f"{message}: {error}")
+        else:
+            logger.warning(f"⚠️ {message}: {error}")
 
     async def get_actions(self) -> Optional[list[dict]]:
         """
@@ -47,13 +173,12 @@ class CacheService:
             return None
 
         try:
-            data = await self.redis.get(self.ACTIONS_KEY)
-            if data:
+            actions = await self._get("actions", self.ACTIONS_KEY)
+            if actions is not None:
                 logger.debug("✅ Действия загружены из кэша")
-                return json.loads(data)
-            return None
-        except RedisError as e:
-            logger.warning(f"⚠️ Redis error при чтении действий: {e}")
+            return actions
+        except REDIS_ERRORS as e:
+            self._log_error("Redis error при чтении действий", e)
             return None
 
     async def set_actions(self, actions: list[dict]) -> bool:
@@ -70,15 +195,11 @@ class CacheService:
             return False
 
         try:
-            await self.redis.setex(
-                self.ACTIONS_KEY,
-                self.ACTIONS_TTL,
-                json.dumps(actions, ensure_ascii=False),
-            )
+            await self._setex("actions", self.ACTIONS_KEY, self.ACTIONS_TTL, actions)
             logger.debug(f"✅ {len(actions)} действий сохранены в кэш")
             return True
-        except RedisError as e:
-            logger.warning(f"⚠️ Redis error при записи действий: {e}")
+        except REDIS_ERRORS as e:
+            self._log_error("Redis error при записи действий", e)
             return False
 
     async def get_action_by_name(self, name: str) -> Optional[dict]:
@@ -96,12 +217,9 @@ class CacheService:
 
         try:
             key = f"{self.ACTION_BY_NAME_PREFIX}{name}"
-            data = await self.redis.get(key)
-            if data:
-                return json.loads(data)
-            return None
-        except RedisError as e:
-            logger.warning(f"⚠️ Redis error при чтении действия {name}: {e}")
+            return await self._get("action", key)
+        except REDIS_ERRORS as e:
+            self._log_error(f"Redis error при чтении действия {name}", e)
             return None
 
     async def set_action(self, name: str, action_data: dict) -> bool:
@@ -120,12 +238,46 @@ class CacheService:
 
         try:
             key = f"{self.ACTION_BY_NAME_PREFIX}{name}"
-            await self.redis.setex(
-                key, self.ACTION_TTL, json.dumps(action_data, ensure_ascii=False)
-            )
+            await self._setex("action", key, self.ACTION_TTL, action_data)
             return True
-        except RedisError as e:
-            logger.warning(f"⚠️ Redis error при записи действия {name}: {e}")
+        except REDIS_ERRORS as e:
+            self._log_error(f"Redis error при записи действия {name}", e)
+            return False
+
+    async def get_packs(self) -> Optional[dict[str, list[dict]]]:
+        """
+        Получить индекс паков из кэша
+
+        Returns:
+            dict | None: {название пака: [действия]} или None
+        """
+        if not self._enabled:
+            return None
+
+        try:
+            return await self._get("packs", self.PACKS_KEY)
+        except REDIS_ERRORS as e:
+            self._log_error("Redis error при чтении паков", e)
+            return None
+
+    async def set_packs(self, packs: dict[str, list[dict]]) -> bool:
+        """
+        Сохранить индекс паков в кэш
+
+        Args:
+            packs: {название пака: [действия]}
+
+        Returns:
+            bool: Успешность операции
+        """
+        if not self._enabled:
+            return False
+
+        try:
+            await self._setex("packs", self.PACKS_KEY, self.PACKS_TTL, packs)
+            return True
+        except REDIS_ERRORS as e:
+            self._log_error("Redis error при записи паков", e)
             return False
 
     async def invalidate_actions(self) -> bool:
@@ -139,19 +291,27 @@ class CacheService:
         if not self._enabled:
             return False
 
+        # Локальные копии устаревают сразу, даже если Redis недоступен
+        self._local.clear()
+
         try:
-            # Удаляем общий список
-            await self.redis.delete(self.ACTIONS_KEY)
+            # Удаляем общий список и индекс паков
+            await self._call(
+                "actions",
+                "delete",
+                lambda: self.redis.delete(self.ACTIONS_KEY, self.PACKS_KEY),
+            )
 
             # Удаляем все индивидуальные действия
             pattern = f"{self.ACTION_BY_NAME_PREFIX}*"
-            async for key in self.redis.scan_iter(match=pattern):
-                await self.redis.delete(key)
+            keys = await self._call("action", "scan", lambda: self._scan_keys(pattern))
+            if keys:
+                await self._call("action", "delete", lambda: self.redis.delete(*keys))
 
             logger.info("🔄 Кэш действий инвалидирован")
             return True
-        except RedisError as e:
-            logger.warning(f"⚠️ Redis error при инвалидации: {e}")
+        except REDIS_ERRORS as e:
+            self._log_error("Redis error при инвалидации", e)
             return False
 
     async def ping(self) -> bool:
@@ -165,21 +325,95 @@ class CacheService:
             return False
 
         try:
-            await self.redis.ping()
+            await self._call("ping", "ping", self.redis.ping)
             return True
-        except RedisError:
+        except REDIS_ERRORS:
             return False
 
 
+# ========== СТАТИСТИКА ==========
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    Сводная статистика кэша по семействам ключей
+
+    Используется в /metrics для подбора ACTIONS_TTL / ACTION_TTL.
+
+    Returns:
+        dict: {семейство: {hits, misses, errors, hit_ratio, bytes_*, latency}}
+    """
+    families: Dict[str, Dict[str, Any]] = {}
+
+    def family_stats(family: str) -> Dict[str, Any]:
+        return families.setdefault(
+            family,
+            {
+                "hits": 0,
+                "misses": 0,
+                "fallbacks": 0,
+                "errors": 0,
+                "hit_ratio": 0.0,
+                "bytes_read": 0,
+                "bytes_written": 0,
+                "latency": {},
+            },
+        )
+
+    lookup_fields = {"hit": "hits", "miss": "misses", "fallback": "fallbacks"}
+    for (family, result), value in CACHE_LOOKUPS.samples().items():
+        family_stats(family)[lookup_fields[result]] += int(value)
+
+    for (family, _operation), value in CACHE_ERRORS.samples().items():
+        family_stats(family)["errors"] += int(value)
+
+    for (family, direction), value in CACHE_BYTES.samples().items():
+        key = "bytes_read" if direction == "read" else "bytes_written"
+        family_stats(family)[key] += int(value)
+
+    for (family, operation), (counts, total) in CACHE_LATENCY.samples().items():
+        count = sum(counts)
+        family_stats(family)["latency"][operation] = {
+            "count": count,
+            "avg_ms": round(total / count * 1000, 3) if count else 0.0,
+        }
+
+    for stats in families.values():
+        lookups = stats["hits"] + stats["misses"]
+        if lookups:
+            stats["hit_ratio"] = round(stats["hits"] / lookups, 4)
+
+    return {
+        "ttl": {
+            "actions": CacheService.ACTIONS_TTL,
+            "action": CacheService.ACTION_TTL,
+            "packs": CacheService.PACKS_TTL,
+        },
+        "families": families,
+    }
+
+
 # ========== ГЛОБАЛЬНЫЙ ЭКЗЕМПЛЯР ==========
 
 _cache_service: Optional[CacheService] = None
 
 
+def set_cache_service(cache: CacheService) -> None:
+    """
+    Установить глобальный экземпляр CacheService
+    (вызывается контейнером сервисов при старте)
+    """
+    global _cache_service
+    _cache_service = cache
+
+
 async def get_cache_service(redis: Optional[Redis] = None) -> CacheService:
     """
     Получить глобальный экземпляр CacheService
 
+    Предпочтительно получать кэш через DI (параметр ``cache`` в handlers),
+    который заполняется контейнером сервисов в bot/main.py.
+
     Args:
         redis: Redis клиент (опционально, для инициализации)
 
@@ -189,6 +423,11 @@ async def get_cache_service(redis: Optional[Redis] = None) -> CacheService:
     global _cache_service
 
     if _cache_service is None:
+        if redis is None:
+            logger.warning(
+                "⚠️ CacheService создан без Redis клиента - кэш отключён, "
+                "все запросы пойдут в БД"
+            )
         _cache_service = CacheService(redis)
 
     return _cache_service
@@ -0,0 +1,187 @@
+"""
+Контейнер сервисов приложения
+
+Создаётся один раз в bot/main.py из Redis клиента, который используется
+для FSM, и передаётся в handlers через workflow data диспетчера.
+
+ВОЗМОЖНОСТИ:
+- Явная передача Redis клиента в CacheService (без скрытых синглтонов)
+- Прогрев кэша при старте: каталог действий, индекс паков, список админов
+- Флаг готовности для /ready
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from redis.asyncio import Redis
+from sqlalchemy import select
+
+from bot.core.action_index import action_index
+from bot.core.config import settings
+from bot.database.connection import get_session_maker
+from bot.database.models import Admin
+from bot.database.repositories import ActionRepository
+from bot.services.cache import CacheService, set_cache_service
+from bot.services.degraded import degraded_mode
+from bot.services.gender_cache import GenderCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ServiceContainer:
+    """Зависимости, общие для всех handlers"""
+
+    redis: Redis
+    cache: CacheService
+    # Пол пользователей для текстов actions.json (без запроса к users)
+    genders: GenderCache
+    # Активные администраторы (прогрев, затем раз в ADMIN_CACHE_TTL)
+    admin_ids: frozenset[int] = field(default_factory=frozenset)
+    admins_loaded_at: Optional[float] = None
+    # Прогрев завершён - /ready может отвечать 200
+    warmed_up: bool = False
+
+    @property
+    def admins_stale(self) -> bool:
+        """Список админов не загружен или старше ADMIN_CACHE_TTL"""
+        return (
+            self.admins_loaded_at is None
+            or time.monotonic() - self.admins_loaded_at > settings.admin_cache_ttl
+        )
+
+    def is_admin(self, user_id: int) -> Optional[bool]:
+        """
+        Проверка прав администратора по списку в памяти
+
+        Список отвечает только "да": промах (новый админ в БД) или
+        устаревший список - "неизвестно", решает БД.
+
+        Returns:
+            bool | None: True если админ, None если нужно проверить в БД
+        """
+        if user_id == settings.admin_id:
+            return True
+        if self.admins_stale or user_id not in self.admin_ids:
+            return None
+        return True
+
+    def set_admin_ids(self, admin_ids: set[int]) -> None:
+        """Заменить список админов и отметить время загрузки (для admins_stale)"""
+        self.admin_ids = frozenset(admin_ids)
+        self.admins_loaded_at = time.monotonic()
+
+    async def refresh_admins(self, session) -> None:
+        """Перечитать активных админов из БД (одним запросом)"""
+        self.set_admin_ids(await load_admin_ids(session))
+
+
+async def load_admin_ids(session) -> set[int]:
+    """ID активных администраторов (включая ADMIN_ID из .env)"""
+    result = await session.execute(select(Admin.user_id).where(Admin.is_active.is_(True)))
+    admin_ids = {row[0] for row in result.all()}
+    admin_ids.add(settings.admin_id)
+    return admin_ids
+
+
+# ========== ГЛОБАЛЬНЫЙ ЭКЗЕМПЛЯР ==========
+
+_container: Optional[ServiceContainer] = None
+
+
+def init_container(redis: Redis) -> ServiceContainer:
+    """
+    Создать контейнер сервисов
+
+    Args:
+        redis: Redis клиент, созданный в bot/main.py
+
+    Returns:
+        ServiceContainer: Контейнер с готовыми сервисами
+    """
+    global _container
+
+    cache = CacheService(redis)
+    set_cache_service(cache)
+
+    genders = GenderCache(
+        cache,
+        max_size=settings.gender_cache_size,
+        ttl=settings.gender_cache_ttl,
+    )
+
+    _container = ServiceContainer(redis=redis, cache=cache, genders=genders)
+    logger.info("✅ Контейнер сервисов инициализирован")
+    return _container
+
+
+def get_container() -> Optional[ServiceContainer]:
+    """Получить контейнер (None если ещё не инициализирован)"""
+    return _container
+
+
+# ========== ПРОГРЕВ ==========
+
+
+async def _warm_up_once(container: ServiceContainer) -> None:
+    """Загрузить каталог, индекс паков и админов в кэш"""
+    session_maker = get_session_maker()
+
+    async with session_maker() as session:
+        action_repo = ActionRepository(session)
+
+        # Каталог действий (и индекс валидации)
+        actions = await action_repo.get_all_active()
+        await container.cache.set_actions(actions)
+        await degraded_mode.snapshot.save(actions)
+        action_index.sync_db(actions)
+
+        # Индекс паков
+        packs = await action_repo.get_all_packs()
+        await container.cache.set_packs(packs)
+
+        # Администраторы
+        admin_ids = await load_admin_ids(session)
+
+    container.set_admin_ids(admin_ids)
+
+    logger.info(
+        f"✅ Кэш прогрет: {len(actions)} действий, {len(packs)} паков, "
+        f"{len(admin_ids)} админов"
+    )
+
+
+async def warm_up(
+    container: ServiceContainer,
+    attempts: Optional[int] = 3,
+    retry_delay: float = 2.0,
+) -> bool:
+    """
+    Прогреть кэш перед запуском polling
+
+    Пока прогрев не завершён, /ready отвечает 503.
+
+    Args:
+        container: Контейнер сервисов
+        attempts: Количество попыток (None - повторять до успеха)
+        retry_delay: Пауза между попытками (секунды)
+
+    Returns:
+        bool: True если прогрев успешен
+    """
+    attempt = 0
+    while attempts is None or attempt < attempts:
+        attempt += 1
+        try:
+            await _warm_up_once(container)
+            container.warmed_up = True
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Прогрев кэша не удался (попытка {attempt}): {e}")
+            if attempts is None or attempt < attempts:
+                await asyncio.sleep(retry_delay)
+
+    return False
@@ -0,0 +1,354 @@
+"""
+Деградированный режим при недоступной базе данных
+
+ВОЗМОЖНОСТИ:
+- Локальный снимок каталога действий (последний успешно загруженный из БД)
+- Очередь отложенных записей в БД с повтором после восстановления
+- Фоновая проверка доступности БД и выход из деградированного режима
+
+Пока режим активен, inline запросы обслуживаются из снимка каталога
+без обращений к БД, а /ready сообщает статус "degraded".
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from aiogram.types import User as TelegramUser
+from sqlalchemy.exc import (
+    DisconnectionError,
+    InterfaceError,
+    OperationalError,
+    TimeoutError as PoolTimeoutError,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.core.config import settings
+from bot.core.metrics import counter, gauge
+from bot.database.connection import check_database_health, get_session_maker
+from bot.database.repositories import UserRepository
+from bot.services.user import UserService
+
+logger = logging.getLogger(__name__)
+
+# Ошибки, означающие недоступность БД (а не ошибку в данных)
+DB_UNAVAILABLE_ERRORS = (
+    OperationalError,
+    InterfaceError,
+    DisconnectionError,
+    PoolTimeoutError,
+    OSError,
+    asyncio.TimeoutError,
+)
+
+ReplayOp = Callable[[AsyncSession], Awaitable[Any]]
+
+DEGRADED_ACTIVE = gauge(
+    "bot_degraded_mode_active",
+    "1 если бот работает без базы данных",
+)
+DEGRADED_UPDATES = counter(
+    "bot_degraded_updates_total",
+    "Апдейты, обслуженные в деградированном режиме",
+    ("handler",),
+)
+REPLAY_QUEUE_SIZE = gauge(
+    "bot_replay_queue_size",
+    "Отложенные записи в БД, ожидающие повтора",
+)
+REPLAY_RESULTS = counter(
+    "bot_replay_writes_total",
+    "Результаты повтора отложенных записей",
+    ("result",),
+)
+
+
+# ========== СНИМОК КАТАЛОГА ==========
+
+
+class CatalogSnapshot:
+    """Последний известный каталог действий, сохранённый на диск"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._actions: Optional[list[dict]] = None
+        self._digest: Optional[str] = None
+
+    @staticmethod
+    def _compute_digest(actions: list[dict]) -> str:
+        payload = json.dumps(actions, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _write(self, actions: list[dict]) -> None:
+        """Атомарная запись файла (tmp + replace)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"saved_at": time.time(), "actions": actions},
+                f,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+        os.replace(tmp_path, self.path)
+
+    def _read(self) -> Optional[list[dict]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f).get("actions") or None
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Не удалось прочитать снимок каталога: {e}")
+            return None
+
+    async def save(self, actions: list[dict]) -> None:
+        """
+        Сохранить каталог (запись на диск только при изменениях)
+
+        Args:
+            actions: Список действий из БД
+        """
+        if not actions:
+            return
+
+        digest = self._compute_digest(actions)
+        self._actions = actions
+        if digest == self._digest:
+            return
+
+        try:
+            await asyncio.to_thread(self._write, actions)
+            self._digest = digest
+            logger.debug(f"💾 Снимок каталога сохранён ({len(actions)} действий)")
+        except OSError as e:
+            logger.warning(f"⚠️ Не удалось сохранить снимок каталога: {e}")
+
+    async def load(self) -> None:
+        """
+        Прочитать снимок с диска (или из catalog.json) при старте
+
+        Файловый ввод-вывод и сборка каталога - в отдельном потоке,
+        get_actions() и /ready дальше работают только с памятью.
+        """
+        if self._actions is None:
+            actions = await asyncio.to_thread(lambda: self._read() or self._from_catalog())
+            # Каталог из БД мог быть сохранён, пока читался файл
+            if self._actions is None:
+                self._actions = actions
+            logger.debug(f"📦 Снимок каталога загружен ({len(self._actions)} действий)")
+
+    def get_actions(self) -> list[dict]:
+        """Каталог из памяти (загружается load() при старте)"""
+        return self._actions or []
+
+    @staticmethod
+    def _from_catalog() -> list[dict]:
+        """Действия из собранного каталога (если он собран с --with-db)"""
+        from bot.core.catalog import get_catalog
+
+        try:
+            return get_catalog().db_actions()
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Каталог действий недоступен: {e}")
+            return []
+
+    @property
+    def available(self) -> bool:
+        """Есть ли из чего отвечать в деградированном режиме"""
+        return bool(self.get_actions())
+
+
+# ========== ОЧЕРЕДЬ ОТЛОЖЕННЫХ ЗАПИСЕЙ ==========
+
+
+class WriteReplayQueue:
+    """
+    Очередь записей в БД, отложенных на время недоступности
+
+    Записи дедуплицируются по ключу (последняя побеждает),
+    при переполнении отбрасываются самые старые.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._ops: "OrderedDict[str, ReplayOp]" = OrderedDict()
+        self._lock = asyncio.Lock()
+        REPLAY_QUEUE_SIZE.set_function(lambda: len(self._ops))
+
+    def __len__(self) -> int:
+        return len(self._ops)
+
+    def put(self, key: str, op: ReplayOp) -> None:
+        """
+        Поставить запись в очередь
+
+        Args:
+            key: Ключ дедупликации (например, "user:123")
+            op: Корутина-функция, выполняющая запись в переданной сессии
+        """
+        self._ops.pop(key, None)
+        self._ops[key] = op
+
+        while len(self._ops) > self.max_size:
+            dropped_key, _ = self._ops.popitem(last=False)
+            REPLAY_RESULTS.inc(result="dropped")
+            logger.warning(f"⚠️ Очередь записей переполнена, отброшено: {dropped_key}")
+
+    async def replay(self) -> int:
+        """
+        Выполнить все отложенные записи
+
+        Returns:
+            int: Количество успешно записанных операций
+        """
+        async with self._lock:
+            if not self._ops:
+                return 0
+
+            pending = list(self._ops.items())
+            done = 0
+            session_maker = get_session_maker()
+
+            async with session_maker() as session:
+                for key, op in pending:
+                    try:
+                        await op(session)
+                        await session.commit()
+                    except DB_UNAVAILABLE_ERRORS:
+                        await session.rollback()
+                        raise
+                    except Exception as e:
+                        await session.rollback()
+                        REPLAY_RESULTS.inc(result="failed")
+                        logger.error(f"❌ Отложенная запись {key} не выполнена: {e}")
+                    else:
+                        REPLAY_RESULTS.inc(result="ok")
+                        done += 1
+
+                    # Новая запись с тем же ключом могла прийти во время повтора
+                    if self._ops.get(key) is op:
+                        del self._ops[key]
+
+            return done
+
+
+# ========== СОСТОЯНИЕ РЕЖИМА ==========
+
+
+class DegradedMode:
+    """Флаг деградированного режима и восстановление после сбоя БД"""
+
+    def __init__(self, snapshot: CatalogSnapshot, replay_queue: WriteReplayQueue):
+        self.snapshot = snapshot
+        self.replay_queue = replay_queue
+        self.retry_interval = settings.degraded_retry_interval
+        self._since: Optional[float] = None
+        self._last_error: str = ""
+        self._recovery_task: Optional[asyncio.Task] = None
+
+    @property
+    def active(self) -> bool:
+        """Бот сейчас работает без БД"""
+        return self._since is not None
+
+    def mark_failure(self, error: BaseException) -> None:
+        """Зафиксировать недоступность БД и запустить восстановление"""
+        self._last_error = str(error) or type(error).__name__
+
+        if self._since is None:
+            self._since = time.time()
+            DEGRADED_ACTIVE.set(1)
+            logger.error(f"❌ БД недоступна, включён деградированный режим: {error}")
+
+        if self._recovery_task is None or self._recovery_task.done():
+            self._recovery_task = asyncio.create_task(self._recover())
+
+    def _mark_recovered(self) -> None:
+        if self._since is not None:
+            logger.info(
+                f"✅ БД снова доступна, деградированный режим длился "
+                f"{time.time() - self._since:.0f} с"
+            )
+        self._since = None
+        self._last_error = ""
+        DEGRADED_ACTIVE.set(0)
+
+    async def _recover(self) -> None:
+        """Ждать восстановления БД и повторить отложенные записи"""
+        while True:
+            await asyncio.sleep(self.retry_interval)
+
+            try:
+                if not await check_database_health():
+                    continue
+                replayed = await self.replay_queue.replay()
+            except DB_UNAVAILABLE_ERRORS as e:
+                self._last_error = str(e)
+                continue
+
+            if replayed:
+                logger.info(f"✅ Повторено отложенных записей: {replayed}")
+            self._mark_recovered()
+            return
+
+    async def flush(self, timeout: float) -> None:
+        """
+        Последняя попытка записать отложенные операции (drain при остановке)
+
+        Args:
+            timeout: Оставшееся до дедлайна время (секунды)
+        """
+        if self._recovery_task is not None:
+            self._recovery_task.cancel()
+            self._recovery_task = None
+
+        pending = len(self.replay_queue)
+        if not pending:
+            return
+
+        try:
+            replayed = await asyncio.wait_for(self.replay_queue.replay(), timeout)
+            logger.info(f"✅ Отложенные записи сохранены: {replayed}")
+        except (asyncio.TimeoutError, *DB_UNAVAILABLE_ERRORS) as e:
+            logger.error(
+                f"❌ БД недоступна при остановке, потеряно отложенных записей: "
+                f"{len(self.replay_queue)} ({e})"
+            )
+
+    def queue_user_upsert(self, telegram_user: TelegramUser) -> None:
+        """Отложить регистрацию/обновление пользователя"""
+        user_id = telegram_user.id
+        username = telegram_user.username
+        full_name = UserService.build_full_name(telegram_user)
+
+        async def op(session: AsyncSession) -> None:
+            await UserRepository(session).create_or_update(
+                user_id=user_id, username=username, full_name=full_name
+            )
+
+        self.replay_queue.put(f"user:{user_id}", op)
+
+    def status(self) -> Dict[str, Any]:
+        """Состояние для /ready"""
+        return {
+            "active": self.active,
+            "since": self._since,
+            "last_error": self._last_error,
+            "snapshot_available": self.snapshot.available,
+            "queued_writes": len(self.replay_queue),
+        }
+
+
+# ========== ГЛОБАЛЬНЫЙ ЭКЗЕМПЛЯР ==========
+
+degraded_mode = DegradedMode(
+    snapshot=CatalogSnapshot(Path(settings.catalog_snapshot_path)),
+    replay_queue=WriteReplayQueue(max_size=settings.degraded_write_queue_size),
+)
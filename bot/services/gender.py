@@ -0,0 +1,189 @@
+"""
+Сервис выбора и изменения пола пользователя
+
+Работает через асинхронную сессию репозитория пользователей:
+- статус пола читается одним SELECT трёх колонок
+- изменение пола - один условный UPDATE: лимит "3 изменения за 30 дней"
+  проверяется и счётчик увеличивается в одном запросе, поэтому
+  двойное нажатие "Подтвердить" не может превысить лимит
+- записанный пол сразу попадает в кэш пола (bot/services/gender_cache.py)
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from aiogram.types import User as TelegramUser
+from sqlalchemy import case, or_, select, update
+
+from bot.database.models import User
+from bot.database.repositories import UserRepository
+from bot.services.gender_cache import GenderCache
+from bot.services.user import UserService
+
+logger = logging.getLogger(__name__)
+
+GENDERS = ("male", "female")
+
+# Лимит изменений пола и окно, после которого счётчик сбрасывается
+GENDER_CHANGE_LIMIT = 3
+GENDER_CHANGE_WINDOW = timedelta(days=30)
+
+
+def utcnow() -> datetime:
+    """Текущее время UTC без tzinfo (колонка last_gender_change - DateTime)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def gender_value(gender) -> Optional[str]:
+    """'male' / 'female' / None из значения колонки (GenderType или str)"""
+    if gender is None:
+        return None
+    return getattr(gender, "value", gender)
+
+
+@dataclass(frozen=True)
+class GenderStatus:
+    """Пол пользователя и состояние лимита изменений"""
+
+    gender: Optional[str]
+    changes_count: int
+    last_change: Optional[datetime]
+
+    def window_expired(self, now: Optional[datetime] = None) -> bool:
+        """Прошло ли 30 дней с последнего изменения (счётчик обнулён)"""
+        if self.last_change is None:
+            return True
+        return (now or utcnow()) - self.last_change >= GENDER_CHANGE_WINDOW
+
+    def remaining(self, now: Optional[datetime] = None) -> int:
+        """Сколько изменений осталось в текущем окне"""
+        if self.gender is None or self.window_expired(now):
+            return GENDER_CHANGE_LIMIT
+        return max(0, GENDER_CHANGE_LIMIT - self.changes_count)
+
+    def can_change(self, now: Optional[datetime] = None) -> bool:
+        return self.remaining(now) > 0
+
+    def days_until_reset(self, now: Optional[datetime] = None) -> int:
+        """Дней до обновления лимита"""
+        if self.last_change is None:
+            return 0
+        left = self.last_change + GENDER_CHANGE_WINDOW - (now or utcnow())
+        return max(0, left.days)
+
+
+class GenderService:
+    """Пол пользователя: чтение статуса, первый выбор, изменение с лимитом"""
+
+    def __init__(
+        self, user_repo: UserRepository, gender_cache: Optional[GenderCache] = None
+    ):
+        """
+        Args:
+            user_repo: Репозиторий пользователей (его сессия - сессия апдейта)
+            gender_cache: Кэш пола, обновляется при записи
+        """
+        self.user_repo = user_repo
+        self.session = user_repo.session
+        self.gender_cache = gender_cache
+
+    async def get_status(self, user_id: int) -> Optional[GenderStatus]:
+        """
+        Статус пола одним запросом
+
+        Returns:
+            Optional[GenderStatus]: None если пользователь не зарегистрирован
+        """
+        result = await self.session.execute(
+            select(
+                User.gender, User.gender_changes_count, User.last_gender_change
+            ).where(User.id == user_id)
+        )
+        row = result.first()
+        if row is None:
+            return None
+        return GenderStatus(
+            gender=gender_value(row.gender),
+            changes_count=row.gender_changes_count or 0,
+            last_change=row.last_gender_change,
+        )
+
+    async def set_initial(self, telegram_user: TelegramUser, gender: str) -> bool:
+        """
+        Первый выбор пола (только если пол ещё не установлен)
+
+        Обычно пользователь уже зарегистрирован через /start - тогда это
+        один UPDATE. Незарегистрированный пользователь создаётся.
+
+        Returns:
+            bool: True если пол установлен, False если он уже был выбран
+        """
+        if not await self._set_initial(telegram_user.id, gender):
+            if await self.get_status(telegram_user.id) is not None:
+                return False
+
+            await UserService(self.user_repo).register_or_update_user(telegram_user)
+            if not await self._set_initial(telegram_user.id, gender):
+                return False
+
+        await self._cache(telegram_user.id, gender)
+        return True
+
+    async def _set_initial(self, user_id: int, gender: str) -> bool:
+        result = await self.session.execute(
+            update(User)
+            .where(User.id == user_id, User.gender.is_(None))
+            .values(gender=gender, last_gender_change=utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    async def _cache(self, user_id: int, gender: str) -> None:
+        if self.gender_cache is not None:
+            await self.gender_cache.set(user_id, gender)
+
+    async def change(self, user_id: int, gender: str) -> Optional[GenderStatus]:
+        """
+        Изменить пол с учётом лимита одним условным UPDATE
+
+        Счётчик сбрасывается в 1, если с последнего изменения прошло
+        30 дней, иначе увеличивается; изменение разрешено, пока счётчик
+        в окне меньше лимита.
+
+        Returns:
+            Optional[GenderStatus]: Новый статус или None, если лимит
+            исчерпан (или пол ещё не выбирался)
+        """
+        now = utcnow()
+        window_start = now - GENDER_CHANGE_WINDOW
+        window_expired = or_(
+            User.last_gender_change.is_(None),
+            User.last_gender_change <= window_start,
+        )
+
+        result = await self.session.execute(
+            update(User)
+            .where(
+                User.id == user_id,
+                User.gender.is_not(None),
+                or_(window_expired, User.gender_changes_count < GENDER_CHANGE_LIMIT),
+            )
+            .values(
+                gender=gender,
+                gender_changes_count=case(
+                    (window_expired, 1),
+                    else_=User.gender_changes_count + 1,
+                ),
+                last_gender_change=now,
+            )
+            .returning(User.gender_changes_count)
+            .execution_options(synchronize_session=False)
+        )
+        changes_count = result.scalar_one_or_none()
+        if changes_count is None:
+            return None
+
+        await self._cache(user_id, gender)
+        return GenderStatus(gender=gender, changes_count=changes_count, last_change=now)
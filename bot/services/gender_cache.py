@@ -0,0 +1,139 @@
+"""
+Кэш пола пользователей для текстов с учётом пола
+
+Тексты actions.json (accepted / rejected) зависят от пола отправителя
+и получателя. Чтобы callback не читал users ради пола, пол хранится:
+- в памяти процесса: user_id → код (1 - male, 2 - female), LRU с TTL
+- в Redis hash bot:user_gender: user_id → "m" / "f" (общий для процессов)
+
+Запись - при выборе и изменении пола (bot/handlers/gender.py).
+TTL локальной копии ограничивает устаревание в других процессах.
+
+Пример:
+    genders = await container.genders.get_many([sender_id, receiver_id])
+    await container.genders.remember(user_id, user.gender)  # из загруженной строки
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from redis.asyncio import Redis
+
+from bot.services.cache import CACHE_LOOKUPS, REDIS_ERRORS, CacheService
+
+logger = logging.getLogger(__name__)
+
+# Компактные коды пола: в памяти - int, в Redis - одна буква
+_CODES = {"male": 1, "female": 2}
+_GENDERS = {code: gender for gender, code in _CODES.items()}
+_REDIS_CODES = {"male": "m", "female": "f"}
+_REDIS_GENDERS = {code.encode(): gender for gender, code in _REDIS_CODES.items()}
+
+
+class GenderCache:
+    """Пол пользователей: память процесса → Redis hash"""
+
+    KEY = "bot:user_gender"
+
+    def __init__(
+        self,
+        cache: CacheService,
+        max_size: int = 50_000,
+        ttl: float = 300.0,
+    ):
+        """
+        Args:
+            cache: CacheService (Redis через circuit breaker и метрики)
+            max_size: Максимум записей в памяти процесса
+            ttl: Время жизни записи в памяти (секунды)
+        """
+        self.cache = cache
+        self.max_size = max_size
+        self.ttl = ttl
+        # user_id → (код пола, момент устаревания)
+        self._local: "OrderedDict[int, Tuple[int, float]]" = OrderedDict()
+
+    @property
+    def redis(self) -> Optional[Redis]:
+        return self.cache.redis
+
+    # ========== ПАМЯТЬ ПРОЦЕССА ==========
+
+    def _get_local(self, user_id: int) -> Optional[str]:
+        entry = self._local.get(user_id)
+        if entry is None:
+            return None
+        code, expires = entry
+        if expires < time.monotonic():
+            del self._local[user_id]
+            return None
+        self._local.move_to_end(user_id)
+        return _GENDERS[code]
+
+    def _set_local(self, user_id: int, gender: str) -> None:
+        self._local[user_id] = (_CODES[gender], time.monotonic() + self.ttl)
+        self._local.move_to_end(user_id)
+        while len(self._local) > self.max_size:
+            self._local.popitem(last=False)
+
+    # ========== ЧТЕНИЕ ==========
+
+    async def get_many(self, user_ids: Iterable[int]) -> Dict[int, Optional[str]]:
+        """
+        Пол нескольких пользователей (один HMGET для промахов памяти)
+
+        Returns:
+            Dict[int, Optional[str]]: user_id → 'male' / 'female' / None (неизвестен)
+        """
+        result: Dict[int, Optional[str]] = {}
+        missing = []
+        for user_id in dict.fromkeys(user_ids):
+            gender = self._get_local(user_id)
+            result[user_id] = gender
+            if gender is None:
+                missing.append(user_id)
+
+        if not missing or self.redis is None:
+            return result
+
+        try:
+            values = await self.cache.hmget("gender", self.KEY, missing)
+        except REDIS_ERRORS as e:
+            logger.debug(f"Кэш пола недоступен: {e}")
+            return result
+
+        for user_id, value in zip(missing, values):
+            if isinstance(value, str):
+                value = value.encode()
+            gender = _REDIS_GENDERS.get(value)
+            CACHE_LOOKUPS.inc(family="gender", result="hit" if gender else "miss")
+            if gender is not None:
+                self._set_local(user_id, gender)
+                result[user_id] = gender
+        return result
+
+    async def get(self, user_id: int) -> Optional[str]:
+        """Пол пользователя или None, если не известен кэшу"""
+        return (await self.get_many([user_id]))[user_id]
+
+    # ========== ЗАПИСЬ ==========
+
+    async def set(self, user_id: int, gender: Optional[str]) -> None:
+        """Записать пол (вызывается при выборе и изменении пола)"""
+        if gender not in _CODES:
+            return
+        self._set_local(user_id, gender)
+
+        if self.redis is None:
+            return
+        try:
+            await self.cache.hset("gender", self.KEY, str(user_id), _REDIS_CODES[gender])
+        except REDIS_ERRORS as e:
+            logger.warning(f"⚠️ Не удалось записать пол {user_id} в Redis: {e}")
+
+    async def remember(self, user_id: int, gender: Optional[str]) -> None:
+        """Заполнить кэш полом из уже загруженной строки users"""
+        if gender in _CODES and self._get_local(user_id) != gender:
+            await self.set(user_id, gender)
@@ -0,0 +1,147 @@
+"""
+Очередь исходящих сообщений (рассылки)
+
+Сообщения отправляет одна фоновая задача с ограничением скорости
+(Telegram допускает ~30 сообщений в секунду для разных чатов).
+При TelegramRetryAfter задача ждёт указанное время и повторяет отправку.
+
+При остановке бота очередь дописывается в drain (bot/core/lifecycle.py),
+поэтому поставленная в очередь рассылка не теряется на SIGTERM.
+
+Пример:
+    result = await send_queue.enqueue(user_id, "Текст")
+    await result  # True если отправлено
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError, TelegramRetryAfter
+
+from bot.core.config import settings
+from bot.core.metrics import counter, gauge
+
+logger = logging.getLogger(__name__)
+
+SEND_QUEUE_SIZE = gauge("bot_send_queue_size", "Сообщения в очереди отправки")
+SEND_QUEUE_RESULTS = counter(
+    "bot_send_queue_results_total",
+    "Результаты отправки сообщений из очереди",
+    ("result",),
+)
+
+
+@dataclass
+class OutgoingMessage:
+    """Сообщение в очереди отправки"""
+
+    chat_id: int
+    text: str
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    result: "asyncio.Future[bool]" = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+
+class SendQueue:
+    """Фоновая отправка сообщений с ограничением скорости"""
+
+    def __init__(self, rate: float):
+        """
+        Args:
+            rate: Сообщений в секунду
+        """
+        self.interval = 1.0 / rate
+        self._queue: Optional["asyncio.Queue[OutgoingMessage]"] = None
+        self._bot: Optional[Bot] = None
+        self._task: Optional[asyncio.Task] = None
+
+        SEND_QUEUE_SIZE.set_function(lambda: self._queue.qsize() if self._queue else 0)
+
+    def start(self, bot: Bot) -> None:
+        """Запустить задачу отправки"""
+        if self._task is not None:
+            return
+        self._bot = bot
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run(), name="send-queue")
+
+    def enqueue(self, chat_id: int, text: str, **kwargs: Any) -> "asyncio.Future[bool]":
+        """
+        Поставить сообщение в очередь
+
+        Returns:
+            Future[bool]: True - отправлено, False - ошибка отправки
+        """
+        if self._queue is None:
+            raise RuntimeError("SendQueue не запущена")
+        message = OutgoingMessage(chat_id=chat_id, text=text, kwargs=kwargs)
+        self._queue.put_nowait(message)
+        return message.result
+
+    async def _send(self, message: OutgoingMessage) -> bool:
+        for _ in range(3):
+            try:
+                await self._bot.send_message(
+                    chat_id=message.chat_id, text=message.text, **message.kwargs
+                )
+                return True
+            except TelegramRetryAfter as e:
+                logger.warning(f"⚠️ Flood limit, пауза {e.retry_after}с")
+                await asyncio.sleep(e.retry_after)
+            except TelegramAPIError as e:
+                logger.warning(f"Failed to send to {message.chat_id}: {e}")
+                return False
+        return False
+
+    async def _run(self) -> None:
+        while True:
+            message = await self._queue.get()
+            try:
+                sent = await self._send(message)
+            except Exception as e:
+                logger.error(f"❌ Ошибка отправки в {message.chat_id}: {e}")
+                sent = False
+            finally:
+                self._queue.task_done()
+
+            SEND_QUEUE_RESULTS.inc(result="ok" if sent else "failed")
+            if not message.result.done():
+                message.result.set_result(sent)
+            await asyncio.sleep(self.interval)
+
+    async def drain(self, timeout: float) -> None:
+        """Дождаться отправки всех сообщений (drain hook)"""
+        if self._queue is None:
+            return
+        pending = self._queue.qsize()
+        if pending:
+            logger.info(f"🔄 Дописываем очередь отправки: {pending} сообщений")
+        await asyncio.wait_for(self._queue.join(), timeout)
+
+    async def stop(self) -> None:
+        """Остановить отправку (неотправленные сообщения отменяются)"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        lost = 0
+        while self._queue is not None and not self._queue.empty():
+            message = self._queue.get_nowait()
+            if not message.result.done():
+                message.result.cancel()
+            lost += 1
+        if lost:
+            logger.warning(f"⚠️ Не отправлено сообщений из очереди: {lost}")
+
+
+# Глобальный экземпляр
+send_queue = SendQueue(rate=settings.send_queue_rate)
@@ -0,0 +1,310 @@
+"""
+Очередь апдейтов в Redis Streams для горизонтального масштабирования
+
+РОЛИ (настройка BOT_ROLE):
+- all     - один процесс получает и обрабатывает апдейты (по умолчанию)
+- ingest  - получает апдейты (polling или webhook) и только кладёт их в stream
+- worker  - читает stream через consumer group и обрабатывает апдейты
+
+Апдейты раскладываются по UPDATE_STREAM_PARTITIONS потокам
+bot:updates:{N} по user_id % N, поэтому апдейты одного пользователя
+всегда попадают в один поток. Внутри потока воркер обрабатывает записи
+по порядку. Если поток читают несколько воркеров (WORKER_PARTITIONS
+пересекаются), нагрузка делится между ними, но порядок апдейтов одного
+пользователя уже не гарантируется.
+
+Запись подтверждается (XACK) после обработки. Записи упавшего воркера
+остаются в pending list и забираются другим воркером через XAUTOCLAIM
+после UPDATE_STREAM_CLAIM_IDLE_MS. Запись, доставленная больше
+UPDATE_STREAM_MAX_DELIVERIES раз, переносится в bot:updates:dead.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+from typing import Any, Callable, Dict, Awaitable, List, Optional, Sequence, Tuple
+
+from aiogram import BaseMiddleware, Bot, Dispatcher
+from aiogram.types import TelegramObject, Update
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, ResponseError
+
+from bot.core.config import settings
+from bot.core.metrics import counter
+
+logger = logging.getLogger(__name__)
+
+STREAM_PUBLISHED = counter(
+    "bot_update_stream_published_total",
+    "Апдейты, записанные в Redis Stream",
+    ("result",),
+)
+STREAM_PROCESSED = counter(
+    "bot_update_stream_processed_total",
+    "Апдейты, обработанные воркером",
+    ("result",),
+)
+STREAM_CLAIMED = counter(
+    "bot_update_stream_claimed_total",
+    "Записи, забранные из pending list упавших воркеров",
+)
+
+# Поле записи stream с JSON апдейта
+PAYLOAD_FIELD = "update"
+
+
+def stream_key(partition: int) -> str:
+    """Ключ потока партиции"""
+    return f"{settings.update_stream_prefix}:{partition}"
+
+
+def dead_letter_key() -> str:
+    """Ключ потока записей, которые не удалось обработать"""
+    return f"{settings.update_stream_prefix}:dead"
+
+
+def get_update_user_id(update: Update) -> Optional[int]:
+    """ID пользователя - автора апдейта (None для апдейтов без пользователя)"""
+    try:
+        user = getattr(update.event, "from_user", None)
+    except Exception:
+        return None
+    return user.id if user is not None else None
+
+
+def get_partition(update: Update, partitions: int) -> int:
+    """Партиция апдейта: по пользователю, иначе по update_id"""
+    user_id = get_update_user_id(update)
+    key = user_id if user_id is not None else update.update_id
+    return key % partitions
+
+
+def parse_partitions(value: Optional[str], total: int) -> List[int]:
+    """
+    Партиции воркера из строки "0,1,5" (пусто - все)
+
+    Raises:
+        ValueError: Номер партиции вне диапазона
+    """
+    if not value:
+        return list(range(total))
+
+    partitions = sorted({int(item) for item in value.split(",") if item.strip()})
+    for partition in partitions:
+        if not 0 <= partition < total:
+            raise ValueError(f"Партиция {partition} вне диапазона 0..{total - 1}")
+    return partitions
+
+
+# ========== INGEST ==========
+
+
+class UpdateStreamProducer:
+    """Запись апдейтов в партиционированный stream"""
+
+    def __init__(self, redis: Redis, partitions: int, maxlen: int):
+        self.redis = redis
+        self.partitions = partitions
+        self.maxlen = maxlen
+
+    async def publish(self, update: Update) -> str:
+        """
+        Записать апдейт в поток его партиции
+
+        Returns:
+            str: ID записи в stream
+        """
+        partition = get_partition(update, self.partitions)
+        payload = update.model_dump_json(exclude_unset=True)
+        try:
+            entry_id = await self.redis.xadd(
+                stream_key(partition),
+                {PAYLOAD_FIELD: payload},
+                maxlen=self.maxlen,
+                approximate=True,
+            )
+        except RedisError:
+            STREAM_PUBLISHED.inc(result="error")
+            raise
+        STREAM_PUBLISHED.inc(result="ok")
+        return entry_id
+
+
+class StreamIngestMiddleware(BaseMiddleware):
+    """
+    Outer middleware роли ingest: апдейт кладётся в stream,
+    handlers в этом процессе не вызываются
+    """
+
+    def __init__(self, producer: UpdateStreamProducer):
+        self.producer = producer
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        if not isinstance(event, Update):
+            return await handler(event, data)
+
+        try:
+            await self.producer.publish(event)
+        except RedisError as e:
+            logger.error(f"❌ Не удалось записать апдейт {event.update_id} в stream: {e}")
+            raise
+        return None
+
+
+# ========== WORKER ==========
+
+
+class UpdateStreamWorker:
+    """Чтение апдейтов из stream через consumer group и передача в Dispatcher"""
+
+    def __init__(
+        self,
+        redis: Redis,
+        dp: Dispatcher,
+        bot: Bot,
+        partitions: Sequence[int],
+        consumer: Optional[str] = None,
+    ):
+        """
+        Args:
+            redis: Redis клиент
+            dp: Диспетчер с роутерами и middleware
+            bot: Бот для ответов
+            partitions: Партиции, которые читает этот воркер
+            consumer: Имя consumer в группе (по умолчанию hostname-pid)
+        """
+        self.redis = redis
+        self.dp = dp
+        self.bot = bot
+        self.partitions = list(partitions)
+        self.group = settings.update_stream_group
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self._stopping = asyncio.Event()
+
+    async def ensure_groups(self) -> None:
+        """Создать consumer group для каждой партиции (если её нет)"""
+        for partition in self.partitions:
+            try:
+                await self.redis.xgroup_create(
+                    stream_key(partition), self.group, id="0", mkstream=True
+                )
+            except ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+
+    async def _handle(self, key: str, entry_id: str, fields: Dict[Any, Any]) -> None:
+        """Обработать одну запись и подтвердить её"""
+        raw = fields.get(PAYLOAD_FIELD) or fields.get(PAYLOAD_FIELD.encode())
+        try:
+            if raw is None:
+                raise ValueError("Запись без апдейта")
+            await self.dp.feed_raw_update(self.bot, json.loads(raw))
+            STREAM_PROCESSED.inc(result="ok")
+        except Exception as e:
+            # Ошибка handler - не причина повторять апдейт (побочные эффекты
+            # уже могли произойти); повтор только при падении воркера
+            STREAM_PROCESSED.inc(result="error")
+            logger.error(f"❌ Ошибка обработки апдейта {entry_id} из {key}: {e}", exc_info=True)
+
+        await self.redis.xack(key, self.group, entry_id)
+
+    async def _dead_letter(self, key: str, entry_id: str, fields: Dict[Any, Any]) -> None:
+        """Перенести запись в dead letter поток и подтвердить"""
+        await self.redis.xadd(
+            dead_letter_key(),
+            {**fields, "source": key, "source_id": entry_id},
+            maxlen=settings.update_stream_maxlen,
+            approximate=True,
+        )
+        await self.redis.xack(key, self.group, entry_id)
+        STREAM_PROCESSED.inc(result="dead")
+        logger.warning(f"⚠️ Апдейт {entry_id} из {key} перенесён в {dead_letter_key()}")
+
+    async def _claim_stale(self, key: str) -> List[Tuple[str, Dict[Any, Any]]]:
+        """Забрать записи, которые другой воркер взял и не подтвердил"""
+        _, claimed, *_ = await self.redis.xautoclaim(
+            key,
+            self.group,
+            self.consumer,
+            min_idle_time=settings.update_stream_claim_idle_ms,
+            start_id="0-0",
+            count=settings.update_stream_batch,
+        )
+        if not claimed:
+            return []
+
+        STREAM_CLAIMED.inc(len(claimed))
+        logger.info(f"🔄 {self.consumer}: забрано {len(claimed)} записей из pending {key}")
+
+        # Сколько раз записи уже доставлялись (включая этот claim)
+        pending = await self.redis.xpending_range(
+            key,
+            self.group,
+            min=claimed[0][0],
+            max=claimed[-1][0],
+            count=len(claimed),
+            consumername=self.consumer,
+        )
+        deliveries = {item["message_id"]: item["times_delivered"] for item in pending}
+
+        entries = []
+        for entry_id, fields in claimed:
+            if deliveries.get(entry_id, 0) > settings.update_stream_max_deliveries:
+                await self._dead_letter(key, entry_id, fields)
+            else:
+                entries.append((entry_id, fields))
+        return entries
+
+    async def _consume(self, partition: int) -> None:
+        """Цикл чтения одной партиции (записи обрабатываются по порядку)"""
+        key = stream_key(partition)
+        loop = asyncio.get_running_loop()
+        # Pending list проверяется не чаще, чем раз в половину claim idle
+        claim_every = settings.update_stream_claim_idle_ms / 2000
+        next_claim = 0.0
+
+        while not self._stopping.is_set():
+            try:
+                entries = []
+                if loop.time() >= next_claim:
+                    entries = await self._claim_stale(key)
+                    if not entries:
+                        next_claim = loop.time() + claim_every
+                if not entries:
+                    response = await self.redis.xreadgroup(
+                        self.group,
+                        self.consumer,
+                        {key: ">"},
+                        count=settings.update_stream_batch,
+                        block=settings.update_stream_block_ms,
+                    )
+                    entries = response[0][1] if response else []
+
+                for entry_id, fields in entries:
+                    await self._handle(key, entry_id, fields)
+
+            except asyncio.CancelledError:
+                raise
+            except (RedisError, OSError) as e:
+                logger.warning(f"⚠️ Redis недоступен для {key}: {e}, повтор через 1с")
+                await asyncio.sleep(1.0)
+
+    async def run(self) -> None:
+        """Читать все партиции воркера до вызова stop()"""
+        await self.ensure_groups()
+        logger.info(
+            f"✅ Воркер {self.consumer} читает партиции {self.partitions} "
+            f"(группа {self.group})"
+        )
+        await asyncio.gather(*(self._consume(p) for p in self.partitions))
+
+    def stop(self) -> None:
+        """Остановиться после текущих записей (не дольше block timeout)"""
+        self._stopping.set()
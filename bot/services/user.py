@@ -18,6 +18,14 @@ class UserService:
     def __init__(self, user_repo: UserRepository):
         self.user_repo = user_repo
 
+    @staticmethod
+    def build_full_name(telegram_user: TelegramUser) -> str:
+        """Сформировать full_name из first_name и last_name"""
+        full_name_parts = [telegram_user.first_name]
+        if telegram_user.last_name:
+            full_name_parts.append(telegram_user.last_name)
+        return " ".join(full_name_parts)
+
     async def register_or_update_user(self, telegram_user: TelegramUser) -> User:
         """
         Регистрация или обновление пользователя из Telegram
@@ -29,10 +37,7 @@ class UserService:
             User: Объект пользователя из базы данных
         """
         # Формируем full_name из first_name и last_name
-        full_name_parts = [telegram_user.first_name]
-        if telegram_user.last_name:
-            full_name_parts.append(telegram_user.last_name)
-        full_name = " ".join(full_name_parts)
+        full_name = self.build_full_name(telegram_user)
 
         # Создаём или обновляем пользователя
         user = await self.user_repo.create_or_update(
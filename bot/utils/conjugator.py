@@ -1,148 +1,17 @@
 """
 Система склонений глаголов для действий бота
+
+Формы глаголов и сокращённые названия берутся из единого каталога
+(bot/core/catalog.py); исходные таблицы - bot/data/action_tables.json.
 """
 
-# Словарь форм глаголов: {Действие: (инфинитив, прошедшее_время, родительный_падеж)}
-ACTION_FORMS = {
-    # Мягкие действия
-    "Обнять": ("обнять", "обнял(а)", "обнимания"),
-    "Поцеловать": ("поцеловать", "поцеловал(а)", "поцелуя"),
-    "Поцеловать руку": ("поцеловать руку", "поцеловал(а) руку", "поцелуя руки"),
-    "Прижать к себе": ("прижать к себе", "прижал(а) к себе", "прижимания"),
-    "Погладить по голове": (
-        "погладить по голове",
-        "погладил(а) по голове",
-        "поглаживания",
-    ),
-    "Улыбнуться": ("улыбнуться", "улыбнулся", "улыбки"),
-    "Подмигнуть": ("подмигнуть", "подмигнул(а)", "подмигивания"),
-    "Пощекотать": ("пощекотать", "пощекотал(а)", "щекотки"),
-    "Кивнуть": ("кивнуть", "кивнул(а)", "кивка"),
-    "Сесть напротив": ("сесть напротив", "сел(а) напротив", "усаживания напротив"),
-    "Сесть рядом": ("сесть рядом", "сел(а) рядом с", "усаживания рядом с"),
-    "Взять за руку": ("взять за руку", "взял(а) за руку", "взятия за руку"),
-    "Переплести пальцы рук": (
-        "переплести пальцы рук с",
-        "переплёл(а) пальцы рук с",
-        "переплетения пальцев с",
-    ),
-    "Встать сзади": ("встать сзади", "встал(а) сзади", "вставания сзади"),
-    "Обнять сзади": ("обнять сзади", "обнял(а) сзади", "обнимания сзади"),
-    "Осторожно обнять сбоку": (
-        "осторожно обнять сбоку",
-        "осторожно обнял(а) сбоку",
-        "обнимания сбоку",
-    ),
-    "Наклониться": ("наклониться к", "наклонился к", "наклона к"),
-    "Сделать комплимент": ("сделать комплимент", "сделал(а) комплимент", "комплимента"),
-    "Подарить подарок": ("подарить подарок", "подарил(а) подарок", "подарка"),
-    "Потрепать волосы": ("потрепать волосы", "потрепал(а) волосы", "трепания волос"),
-    "Провести рукой по волосам": (
-        "провести рукой по волосам",
-        "провёл(а) рукой по волосам",
-        "проведения рукой",
-    ),
-    "Потанцевать": ("потанцевать с", "потанцевал(а) с", "танца с"),
-    "Похвалить": ("похвалить", "похвалил(а)", "похвалы"),
-    "Пригласить на чаёк": (
-        "пригласить на чаёк",
-        "пригласил(а) на чаёк",
-        "приглашения на чаёк",
-    ),
-    "Пригласить на кофеёк": (
-        "пригласить на кофеёк",
-        "пригласил(а) на кофеёк",
-        "приглашения на кофеёк",
-    ),
-    "Покормить": ("покормить", "покормил(а)", "кормления"),
-    "Ущипнуть": ("ущипнуть", "ущипнул(а)", "щипка"),
-    # Еда
-    "Съесть": ("съесть", "съел(а)", "поедания"),
-    "Съесть с печеньками": ("съесть с печеньками", "съел(а) с печеньками", "поедания"),
-    "Съесть запивая кофейком": (
-        "съесть запивая кофейком",
-        "съел(а) запивая кофейком",
-        "поедания",
-    ),
-    "Съесть запивая кофейком с молоком и сахаром": (
-        "съесть с кофе",
-        "съел(а) с кофе",
-        "поедания",
-    ),
-    "Съесть запивая чайком": (
-        "съесть запивая чайком",
-        "съел(а) запивая чайком",
-        "поедания",
-    ),
-    "Съесть запивая чайком с молоком и сахаром": (
-        "съесть с чаем",
-        "съел(а) с чаем",
-        "поедания",
-    ),
-    "Съесть запивая водой": (
-        "съесть запивая водой",
-        "съел(а) запивая водой",
-        "поедания",
-    ),
-    # Агрессивные
-    "Пнуть": ("пнуть", "пнул(а)", "пинка"),
-    "Ударить": ("ударить", "ударил(а)", "удара"),
-    "Похлопать по плечу": (
-        "похлопать по плечу",
-        "похлопал(а) по плечу",
-        "похлопывания",
-    ),
-    "Укусить": ("укусить", "укусил(а)", "укуса"),
-    "Дать пощечину": ("дать пощечину", "дал(а) пощечину", "пощечины"),
-    "Уебать": ("уебать", "уебал(а)", "уебания"),
-    "Отпиздить": ("отпиздить", "отпиздил(а)", "отпизживания"),
-    "Убить": ("убить", "убил(а)", "убийства"),
-    "Расстрелять": ("расстрелять", "расстрелял(а)", "расстрела"),
-    "Продать": ("продать", "продал(а)", "продажи"),
-    "Наорать": ("наорать на", "наорал(а) на", "ора на"),
-    "Поставить в угол": ("поставить в угол", "поставил(а) в угол", "постановки в угол"),
-    "Наказать": ("наказать", "наказал(а)", "наказания"),
-    # Специальные
-    "Поделиться едой": ("поделиться едой с", "поделился едой с", "деления едой с"),
-    "Постонать на ушко": ("постонать на ушко", "постонал(а) на ушко", "стона на ушко"),
-    "Встать на колени": (
-        "встать на колени перед",
-        "встал(а) на колени перед",
-        "вставания на колени перед",
-    ),
-    "Подчиниться": ("подчиниться", "подчинился", "подчинения"),
-    "Лизнуть шею": ("лизнуть шею", "лизнул(а) шею", "лизания шеи"),
-    "Укусить шею": ("укусить шею", "укусил(а) шею", "укуса шеи"),
-    "Игриво улыбнуться": ("игриво улыбнуться", "игриво улыбнулся", "игривой улыбки"),
-    "Расцеловать": ("расцеловать", "расцеловал(а)", "расцелования"),
-    "Забрать к себе в мусорный бак": (
-        "забрать в мусорку",
-        "забрал(а) в мусорку",
-        "забирания в мусорку",
-    ),
-    "Обнять и погладить по спине": (
-        "обнять и погладить",
-        "обнял(а) и погладил(а)",
-        "обнимания",
-    ),
-    "Вытереть слёзы": ("вытереть слёзы", "вытер(ла) слёзы", "вытирания слёз"),
-    "Поднять на руки": ("поднять на руки", "поднял(а) на руки", "поднятия на руки"),
-    "Поддержать": ("поддержать", "поддержал(а)", "поддержки"),
-    "Поспать в обнимку": (
-        "поспать в обнимку с",
-        "поспал(а) в обнимку с",
-        "сна в обнимку с",
-    ),
-}
+from bot.core.catalog import get_catalog
 
-# Сокращённые названия для длинных действий (для отображения в списке)
-ACTION_SHORT_NAMES = {
-    "Съесть запивая кофейком с молоком и сахаром": "Съесть с кофе ☕🥛",
-    "Съесть запивая чайком с молоком и сахаром": "Съесть с чаем 🍵🥛",
-    "Забрать к себе в мусорный бак": "Забрать в мусорку 🗑️",
-    "Обнять и погладить по спине": "Обнять и погладить 🤗",
-    "Осторожно обнять сбоку": "Обнять сбоку 🤗",
-    "Провести рукой по волосам": "Погладить волосы 💇",
+# Форма → колонка каталога с формами склонятора (таблица verb_forms)
+_FORM_FIELDS = {
+    "infinitive": "verb_infinitive",
+    "past": "verb_past",
+    "genitive": "verb_genitive",
 }
 
 
@@ -157,18 +26,12 @@ def get_action_form(action: str, form: str = "infinitive") -> str:
     Returns:
         Склонённая форма глагола
     """
-    forms = ACTION_FORMS.get(action, (action.lower(), action.lower(), action.lower()))
-
-    if form == "infinitive":
-        return forms[0]
-    elif form == "past":
-        return forms[1]
-    elif form == "genitive":
-        return forms[2]
-    else:
-        return forms[0]
+    entry = get_catalog().get(action)
+    value = entry and entry[_FORM_FIELDS.get(form, "verb_infinitive")]
+    return value or action.lower()
 
 
 def get_short_name(action: str) -> str:
     """Возвращает сокращённое название для длинных действий"""
-    return ACTION_SHORT_NAMES.get(action, action)
+    entry = get_catalog().get(action)
+    return (entry and entry["short_name"]) or action
@@ -9,6 +9,15 @@
 
 from aiogram.types import User
 
+from bot.core.catalog import get_catalog
+
+# Форма → колонка каталога (формы склонятора, bot/data/action_tables.json)
+_TEXT_FORM_FIELDS = {
+    "infinitive": "verb_infinitive",
+    "past": "verb_past",
+    "present": "verb_present",
+}
+
 
 def get_user_mention(user: User) -> str:
     """
@@ -49,42 +58,9 @@ def format_action_text(action: str, form: str = "infinitive") -> str:
     Returns:
         str: Отформатированное действие
     """
-    # Словарь форм действий (можно расширить)
-    action_forms = {
-        "погладить": {
-            "infinitive": "погладить",
-            "past": "погладил(а)",
-            "present": "гладит",
-        },
-        "обнять": {"infinitive": "обнять", "past": "обнял(а)", "present": "обнимает"},
-        "поцеловать": {
-            "infinitive": "поцеловать",
-            "past": "поцеловал(а)",
-            "present": "целует",
-        },
-        "ударить": {"infinitive": "ударить", "past": "ударил(а)", "present": "бьёт"},
-        "похвалить": {
-            "infinitive": "похвалить",
-            "past": "похвалил(а)",
-            "present": "хвалит",
-        },
-        "подмигнуть": {
-            "infinitive": "подмигнуть",
-            "past": "подмигнул(а)",
-            "present": "подмигивает",
-        },
-        "улыбнуться": {
-            "infinitive": "улыбнуться",
-            "past": "улыбнулся/улыбнулась",
-            "present": "улыбается",
-        },
-        "пнуть": {"infinitive": "пнуть", "past": "пнул(а)", "present": "пинает"},
-    }
-
-    action_lower = action.lower()
-    if action_lower in action_forms:
-        return action_forms[action_lower].get(form, action)
-    return action
+    entry = get_catalog().get(action)
+    field = _TEXT_FORM_FIELDS.get(form)
+    return (entry and field and entry[field]) or action
 
 
 def format_stats_message(username: str, stats: dict) -> str:
@@ -118,10 +94,9 @@ def format_stats_message(username: str, stats: dict) -> str:
     if top_actions:
         message += "\n<b>🏆 Любимые действия:</b>\n"
         for i, (action_name, count) in enumerate(top_actions, 1):
-            # Получаем эмодзи действия
-            from bot.core.config import settings
-
-            emoji = settings.action_emojis.get(action_name, "❓")
+            # Эмодзи действия из каталога
+            entry = get_catalog().get(action_name)
+            emoji = entry["emoji"] if entry else "❓"
 
             # Склоняем слово "раз"
             if count == 1:
@@ -7,7 +7,7 @@
 - Защиты от некорректных данных
 """
 
-from bot.core.config import settings
+from bot.core.action_index import action_index
 
 
 def is_valid_action(action: str) -> bool:
@@ -26,7 +26,17 @@ def is_valid_action(action: str) -> bool:
         >>> is_valid_action("invalid_action")
         False
     """
-    return action.lower() in [a.lower() for a in settings.actions]
+    return action_index.has_action(action)
+
+
+def is_valid_pack(pack: str) -> bool:
+    """Проверяет, существует ли пак действий (без учёта регистра)"""
+    return action_index.has_pack(pack)
+
+
+def is_valid_emoji(emoji: str) -> bool:
+    """Проверяет, используется ли emoji каким-либо действием"""
+    return action_index.has_emoji(emoji)
 
 
 def validate_user_id(user_id: int) -> bool:
@@ -0,0 +1,112 @@
+"""
+Бенчмарк ActionService: линейный поиск против скомпилированного каталога
+
+ЗАПУСК:
+    python -m scripts.bench_action_service
+    python -m scripts.bench_action_service --number 200000
+
+ЧТО ДЕЛАЕТ:
+    1. Загружает bot/data/actions.json
+    2. Прогоняет прежнюю реализацию (перебор списка, lower() и
+       str.format на каждый вызов) и ActionService с индексами
+       и заранее разбитыми шаблонами
+    3. Печатает время одного вызова (нс) и ускорение
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Добавляем корневую директорию в путь
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bot.services.action_service import ActionService
+
+
+# ========== ПРЕЖНЯЯ РЕАЛИЗАЦИЯ (линейный перебор) ==========
+
+
+class LinearActionService:
+    """ActionService до индексов: каждый вызов перебирает actions.json"""
+
+    def __init__(self, actions: List[Dict]):
+        self.actions = actions
+
+    def get_action_by_id(self, action_id: int) -> Optional[Dict]:
+        for action in self.actions:
+            if action["id"] == action_id:
+                return action
+        return None
+
+    def get_action_by_name(self, action_name: str) -> Optional[Dict]:
+        for action in self.actions:
+            if action["name"].lower() == action_name.lower():
+                return action
+        return None
+
+    def get_actions_by_category(self, category: str) -> List[Dict]:
+        return [a for a in self.actions if a.get("category") == category]
+
+    def get_accepted_text(
+        self, action_id: int, user1_name: str, user2_name: str, user1_gender: str
+    ) -> str:
+        action = self.get_action_by_id(action_id)
+        if not action:
+            return ""
+        gender = user1_gender if user1_gender in ["male", "female"] else "male"
+        template = action["accepted"].get(gender, action["accepted"]["male"])
+        return template.format(user1=user1_name, user2=user2_name)
+
+    def search_actions(self, query: str) -> List[Dict]:
+        query = query.lower()
+        return [a for a in self.actions if query in a["name"].lower()]
+
+
+# ========== ЗАМЕР ==========
+
+
+def per_call_ns(func: Callable[[], object], number: int) -> float:
+    """Лучшее из трёх повторов, нс на вызов"""
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e9
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=50_000, help="Вызовов на замер")
+    args = parser.parse_args()
+
+    service = ActionService()
+    actions = service.get_all_actions()
+    legacy = LinearActionService(actions)
+
+    # Худший случай для перебора - последнее действие каталога
+    last = actions[-1]
+    action_id, name, category = last["id"], last["name"].upper(), last["category"]
+
+    cases = [
+        ("get_action_by_id", lambda s: s.get_action_by_id(action_id)),
+        ("get_action_by_name", lambda s: s.get_action_by_name(name)),
+        ("get_actions_by_category", lambda s: s.get_actions_by_category(category)),
+        (
+            "get_accepted_text",
+            lambda s: s.get_accepted_text(action_id, "Аня", "Борис", "female"),
+        ),
+        ("search_actions", lambda s: s.search_actions("поц")),
+    ]
+
+    print(f"📦 Действий в каталоге: {len(actions)}, вызовов на замер: {args.number}\n")
+    print(f"{'метод':<26} {'перебор, нс':>12} {'индекс, нс':>12} {'ускорение':>10}")
+    for title, call in cases:
+        # Обе реализации должны давать одинаковый результат
+        assert call(legacy) == call(service), title
+        before = per_call_ns(lambda: call(legacy), args.number)
+        after = per_call_ns(lambda: call(service), args.number)
+        print(f"{title:<26} {before:>12.0f} {after:>12.0f} {before / after:>9.1f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Бенчмарк холодного запуска: импорт bot.main в чистом процессе
+
+ЗАПУСК:
+    python -m scripts.bench_startup
+    python -m scripts.bench_startup --runs 10 --budget-ms 1200
+
+ЧТО ДЕЛАЕТ:
+    1. Один прогревочный запуск (компиляция .pyc не попадает в замер)
+    2. N запусков: время импорта bot.main (роутеры, клавиатуры,
+       конфигурация и Settings()) внутри нового интерпретатора
+    3. Сравнивает медиану с бюджетом. При превышении печатает самые
+       дорогие модули и завершается с кодом 1 (для CI)
+
+Подключение к Telegram, БД и Redis не измеряется - это фазы
+bot_startup_phase_seconds в /metrics (bot/core/startup.py).
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import List
+
+from scripts.profile_imports import ROOT, print_report, profile, subprocess_env
+
+MEASURE_CODE = (
+    "import time\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "print(time.perf_counter() - start)\n"
+)
+
+
+def measure_once(module: str) -> float:
+    """Время импорта модуля в новом процессе (секунды)"""
+    result = subprocess.run(
+        [sys.executable, "-c", MEASURE_CODE.format(module=module)],
+        cwd=ROOT,
+        env=subprocess_env(),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        tail = "\n".join(result.stderr.splitlines()[-15:])
+        raise RuntimeError(f"Импорт {module} завершился с ошибкой:\n{tail}")
+    # Логи настройки логирования могут попасть в stdout - время в последней строке
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def bench(module: str, runs: int) -> List[float]:
+    measure_once(module)
+    return [measure_once(module) for _ in range(runs)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="bot.main", help="Что импортировать")
+    parser.add_argument("--runs", type=int, default=5, help="Количество замеров")
+    parser.add_argument(
+        "--budget-ms", type=float, default=1500.0, help="Бюджет медианы (мс)"
+    )
+    parser.add_argument(
+        "--top", type=int, default=15, help="Сколько модулей показать при превышении"
+    )
+    args = parser.parse_args()
+
+    try:
+        timings = bench(args.module, max(args.runs, 1))
+    except RuntimeError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    median_ms = statistics.median(timings) * 1000
+    print(
+        f"⏱ import {args.module}: медиана {median_ms:.0f} мс, "
+        f"мин {min(timings) * 1000:.0f} мс, макс {max(timings) * 1000:.0f} мс "
+        f"({len(timings)} запусков)"
+    )
+
+    if median_ms <= args.budget_ms:
+        print(f"✅ В бюджете {args.budget_ms:.0f} мс")
+        return 0
+
+    print(f"❌ Бюджет {args.budget_ms:.0f} мс превышен на {median_ms - args.budget_ms:.0f} мс\n")
+    try:
+        print_report(profile(args.module), args.top, "self", prefix="")
+    except RuntimeError as e:
+        print(f"⚠️ Профиль импорта недоступен: {e}", file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Сборка единого каталога действий bot/data/catalog.json
+
+ЗАПУСК:
+    python -m scripts.build_catalog
+    python -m scripts.build_catalog --with-db
+    python -m scripts.build_catalog --check
+
+ЧТО ДЕЛАЕТ:
+    1. Читает таблицы bot/data/action_tables.json и bot/data/actions.json
+    2. С --with-db добавляет активные действия из таблицы actions
+       (id, порядок, пак; поля БД имеют приоритет)
+    3. Проверяет каталог (дубли, пустые формы, шаблоны) и атомарно
+       записывает артефакт; версия - хэш содержимого
+    4. С --check ничего не пишет: код 1, если артефакт устарел
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+# Добавляем корневую директорию в путь
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bot.core.catalog import (
+    CATALOG_PATH,
+    FIELDS,
+    build_catalog,
+    read_catalog,
+    write_catalog,
+)
+
+
+async def fetch_db_actions() -> List[Dict]:
+    """Активные действия из БД"""
+    from bot.database.connection import get_engine, get_session_maker
+    from bot.database.repositories import ActionRepository
+
+    try:
+        async with get_session_maker()() as session:
+            return await ActionRepository(session).get_all_active()
+    finally:
+        await get_engine().dispose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--with-db", action="store_true", help="Добавить действия из БД")
+    parser.add_argument(
+        "--check", action="store_true", help="Только проверить, что артефакт актуален"
+    )
+    parser.add_argument("--output", type=Path, default=CATALOG_PATH, help="Путь артефакта")
+    args = parser.parse_args()
+
+    db_actions = asyncio.run(fetch_db_actions()) if args.with_db else None
+
+    try:
+        payload = build_catalog(db_actions)
+    except (OSError, ValueError) as e:
+        print(f"❌ Каталог не собран: {e}")
+        return 1
+
+    if args.check:
+        try:
+            current = read_catalog(args.output)
+        except (OSError, ValueError) as e:
+            print(f"❌ {args.output.name}: {e}")
+            return 1
+        if current["version"] != payload["version"]:
+            print(
+                f"❌ {args.output.name} устарел: {current['version']} → {payload['version']}. "
+                f"Пересоберите: python -m scripts.build_catalog"
+            )
+            return 1
+        print(f"✅ {args.output.name} актуален (версия {payload['version']})")
+        return 0
+
+    write_catalog(payload, args.output)
+    json_id = FIELDS.index("json_id")
+    with_templates = sum(1 for row in payload["actions"] if row[json_id] is not None)
+    print(
+        f"✅ Каталог {payload['version']}: {len(payload['actions'])} действий, "
+        f"{len(payload['packs'])} паков, {with_templates} с шаблонами → {args.output}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,131 +1,396 @@
 """
-Скрипт переноса действий из config.py в базу данных
+Импорт / экспорт каталога действий в базу данных
 
 ЗАПУСК:
     python -m scripts.migrate_actions_to_db
+    python -m scripts.migrate_actions_to_db --dry-run
+    python -m scripts.migrate_actions_to_db --update-existing
+    python -m scripts.migrate_actions_to_db --source actions.jsonl
+    python -m scripts.migrate_actions_to_db --export actions.jsonl
 
 ЧТО ДЕЛАЕТ:
-    1. Читает действия из bot/core/config.py
-    2. Создаёт записи в таблице actions
-    3. Добавляет первого админа (ADMIN_ID из .env)
+    1. Читает действия потоком: из единого каталога (bot/data/catalog.json,
+       см. scripts/build_catalog.py) или из JSONL (--source, по строке
+       на действие - формат --export)
+    2. Берёт только действия, входящие в пак (как прежний перенос паков
+       из config.py); --include-unpacked - все действия источника
+    3. Одним запросом загружает текущие действия из БД и считает разницу:
+       новые, отличающиеся, без изменений
+    4. Добавляет новые действия пачками: один многострочный
+       INSERT ... ON CONFLICT (name) на пачку
+    5. Один раз инвалидирует кэш действий в Redis (если были изменения)
+    6. Добавляет первого админа (ADMIN_ID из .env)
+
+    Существующие действия по умолчанию не меняются (emoji и формы могли
+    быть отредактированы админами) - отличия только печатаются.
+    --update-existing перезаписывает их значениями источника
+    (ON CONFLICT DO UPDATE).
+
+    --dry-run печатает разницу и ничего не пишет.
+    --export выгружает действия из БД в JSONL (потоком) и завершается.
+
+Название сравнивается без учёта регистра; для существующего действия
+используется написание из БД. Флаг is_active у существующих действий
+не меняется - отключённые в админке действия импорт не включает обратно.
 """
 
+import argparse
 import asyncio
+import json
 import sys
 from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 # Добавляем корневую директорию в путь
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy import select
+
+from bot.core.catalog import DEFAULT_EMOJI, load_catalog
 from bot.core.config import settings
+from bot.database.connection import get_engine, get_redis, get_session_maker
 from bot.database.models import Action, Admin
-from bot.database.connection import get_engine
+from bot.services.cache import CacheService
 
+# Колонки, которые импорт сравнивает и обновляет (ключ - name)
+COLUMNS = (
+    "emoji",
+    "infinitive",
+    "past_tense",
+    "genitive_noun",
+    "display_order",
+    "pack",
+)
+EXPORT_COLUMNS = ("name",) + COLUMNS + ("is_active",)
 
-async def migrate_actions():
-    """Перенос всех действий из config.py в БД"""
+BATCH_SIZE = 500
 
-    print("🚀 Начинаю миграцию действий из config.py в базу данных...")
 
-    engine = get_engine()
-    async_session = async_sessionmaker(
-        engine, class_=AsyncSession, expire_on_commit=False
-    )
+# ========== ИСТОЧНИКИ ==========
 
-    async with async_session() as session:
-        try:
-            # ========== 1. ПЕРЕНОС ДЕЙСТВИЙ ==========
-            actions_data = settings.actions
-            action_emojis = settings.action_emojis
-            action_forms = settings.action_forms
-
-            print(f"\n📊 Найдено действий в config.py: {len(actions_data)}")
-
-            migrated = 0
-            skipped = 0
-
-            for idx, action_name in enumerate(actions_data):
-                # Получаем данные
-                emoji = action_emojis.get(action_name, "✨")
-                forms = action_forms.get(action_name, {})
-
-                # Формы глаголов
-                past_tense = forms.get("past", action_name.lower())
-                genitive_noun = forms.get("noun", action_name.lower())
-                infinitive = action_name.lower()
-
-                # Проверяем, существует ли уже
-                from sqlalchemy import select
-
-                result = await session.execute(
-                    select(Action).where(Action.name == action_name)
-                )
-                existing = result.scalar_one_or_none()
-
-                if existing:
-                    print(f"  ⏭️  Пропуск: {action_name} (уже существует)")
-                    skipped += 1
-                    continue
-
-                # Создаём новое действие
-                new_action = Action(
-                    name=action_name,
-                    emoji=emoji,
-                    infinitive=infinitive,
-                    past_tense=past_tense,
-                    genitive_noun=genitive_noun,
-                    display_order=idx,
-                    is_active=True,
-                    usage_count=0,
-                )
-
-                session.add(new_action)
-                migrated += 1
-                print(f"  ✅ Добавлено: {emoji} {action_name}")
-
-            await session.commit()
-            print(f"\n✅ Действий добавлено: {migrated}")
-            print(f"⏭️  Действий пропущено: {skipped}")
-
-            # ========== 2. ДОБАВЛЕНИЕ АДМИНА ==========
-            print(f"\n👤 Добавляю первого администратора...")
-
-            admin_id = settings.admin_id
-
-            from sqlalchemy import select
-
-            result = await session.execute(
-                select(Admin).where(Admin.user_id == admin_id)
+
+def _normalize(row: Dict[str, Any], position: int) -> Dict[str, Any]:
+    """Строка импорта: name + COLUMNS, значения по умолчанию как в каталоге"""
+    name = (row.get("name") or "").strip()
+    if not name:
+        raise ValueError(f"Строка {position}: действие без названия")
+
+    lowered = name.lower()
+    display_order = row.get("display_order")
+    return {
+        "name": name,
+        "emoji": row.get("emoji") or DEFAULT_EMOJI,
+        "infinitive": row.get("infinitive") or lowered,
+        "past_tense": row.get("past_tense") or lowered,
+        "genitive_noun": row.get("genitive_noun") or lowered,
+        "display_order": position if display_order is None else display_order,
+        "pack": row.get("pack"),
+    }
+
+
+def iter_catalog() -> Iterator[Dict[str, Any]]:
+    """Действия единого каталога"""
+    for position, action in enumerate(load_catalog().actions):
+        yield _normalize(action, position)
+
+
+def iter_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    """Действия из JSONL построчно (файл не читается целиком)"""
+    with open(path, "r", encoding="utf-8") as f:
+        for position, line in enumerate(f):
+            if line.strip():
+                yield _normalize(json.loads(line), position)
+
+
+def batched(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ========== РАЗНИЦА ==========
+
+
+async def load_existing(session) -> Dict[str, Dict[str, Any]]:
+    """Все действия БД одним запросом: название (casefold) → колонки"""
+    columns = [Action.name] + [getattr(Action, column) for column in COLUMNS]
+    result = await session.execute(select(*columns))
+    return {
+        row.name.casefold(): dict(zip(("name",) + COLUMNS, row)) for row in result
+    }
+
+
+def diff_row(
+    row: Dict[str, Any], existing: Dict[str, Dict[str, Any]]
+) -> Tuple[str, List[str]]:
+    """
+    Сравнить строку импорта с БД
+
+    Для существующего действия название в row заменяется написанием
+    из БД: ON CONFLICT (name) сравнивает названия точно.
+
+    Returns:
+        Tuple[str, List[str]]: ("insert" | "update" | "same", изменённые колонки)
+    """
+    current = existing.get(row["name"].casefold())
+    if current is None:
+        return "insert", []
+
+    row["name"] = current["name"]
+    # Пак из источника не задан - оставляем пак из БД
+    if row["pack"] is None:
+        row["pack"] = current["pack"]
+    changed = [column for column in COLUMNS if current[column] != row[column]]
+    return ("update" if changed else "same"), changed
+
+
+# ========== ЗАПИСЬ ==========
+
+
+def dialect_insert(dialect: str):
+    """INSERT с поддержкой ON CONFLICT для текущей СУБД"""
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+async def upsert_batch(
+    session, insert, rows: List[Dict[str, Any]], update_existing: bool
+) -> None:
+    """
+    Один многострочный INSERT ... ON CONFLICT (name) на пачку
+
+    update_existing: DO UPDATE (перезаписать колонки), иначе DO NOTHING
+    """
+    values = [{**row, "is_active": True, "usage_count": 0} for row in rows]
+    # Колонки в VALUES должны совпадать у всех строк
+    for value in values:
+        if value["pack"] is None:
+            value.pop("pack")
+
+    for has_pack in (True, False):
+        chunk = [value for value in values if ("pack" in value) == has_pack]
+        if not chunk:
+            continue
+        stmt = insert(Action).values(chunk)
+        if update_existing:
+            update_columns = COLUMNS if has_pack else tuple(c for c in COLUMNS if c != "pack")
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Action.name],
+                set_={column: stmt.excluded[column] for column in update_columns},
             )
-            existing_admin = result.scalar_one_or_none()
-
-            if existing_admin:
-                print(f"  ℹ️  Админ {admin_id} уже существует")
-            else:
-                new_admin = Admin(
-                    user_id=admin_id,
-                    username=None,  # Заполнится при первом использовании бота
-                    full_name="Main Admin",
-                    is_active=True,
-                    added_by=None,
-                )
-                session.add(new_admin)
-                await session.commit()
-                print(f"  ✅ Администратор {admin_id} добавлен!")
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[Action.name])
+        await session.execute(stmt)
+
+
+async def import_actions(
+    rows: Iterable[Dict[str, Any]],
+    batch_size: int,
+    dry_run: bool,
+    update_existing: bool = False,
+    include_unpacked: bool = False,
+) -> int:
+    """
+    Импорт действий
+
+    Args:
+        rows: Строки источника (поток)
+        batch_size: Строк на один INSERT
+        dry_run: Только показать разницу
+        update_existing: Перезаписывать отличающиеся действия из БД
+        include_unpacked: Импортировать и действия без пака
 
-            print("\n🎉 Миграция завершена успешно!")
+    Returns:
+        int: Количество добавленных и изменённых действий
+    """
+    insert = dialect_insert(get_engine().dialect.name)
+    stats = {"insert": 0, "update": 0, "skip": 0, "same": 0, "unpacked": 0}
 
-        except Exception as e:
-            print(f"\n❌ Ошибка миграции: {e}")
+    async with get_session_maker()() as session:
+        try:
+            existing = await load_existing(session)
+            print(f"📊 Действий в БД: {len(existing)}")
+
+            seen = set()
+            for batch in batched(rows, batch_size):
+                pending = []
+                for row in batch:
+                    key = row["name"].casefold()
+                    if key in seen:
+                        raise ValueError(f"Источник: повторяется действие {row['name']!r}")
+                    seen.add(key)
+
+                    kind, changed = diff_row(row, existing)
+                    if kind == "insert" and row["pack"] is None and not include_unpacked:
+                        stats["unpacked"] += 1
+                        continue
+                    if kind == "update" and not update_existing:
+                        kind = "skip"
+
+                    stats[kind] += 1
+                    if kind == "insert":
+                        print(f"  ➕ {row['emoji']} {row['name']}")
+                    elif kind == "update":
+                        print(f"  ✏️  {row['name']}: {', '.join(changed)}")
+                    elif kind == "skip":
+                        print(f"  ⏭️  {row['name']}: отличается ({', '.join(changed)}), пропуск")
+                    if kind in ("insert", "update"):
+                        pending.append(row)
+
+                if pending and not dry_run:
+                    await upsert_batch(session, insert, pending, update_existing)
+
+            if not dry_run:
+                await session.commit()
+        except Exception:
             await session.rollback()
             raise
-        finally:
-            await engine.dispose()
+
+    print(
+        f"\n✅ Новых: {stats['insert']}, изменённых: {stats['update']}, "
+        f"без изменений: {stats['same']}"
+    )
+    if stats["skip"]:
+        print(
+            f"⏭️  Отличаются от БД, не изменены: {stats['skip']} "
+            f"(перезаписать: --update-existing)"
+        )
+    if stats["unpacked"]:
+        print(
+            f"⏭️  Новые действия без пака пропущены: {stats['unpacked']} "
+            f"(импортировать: --include-unpacked)"
+        )
+    if dry_run:
+        print("ℹ️  --dry-run: изменения не записаны")
+    return stats["insert"] + stats["update"]
+
+
+async def invalidate_cache() -> None:
+    """Одна инвалидация кэша действий после импорта"""
+    try:
+        cache = CacheService(await get_redis())
+    except Exception as e:
+        print(f"⚠️  Redis недоступен, кэш не инвалидирован: {e}")
+        return
+    if not await cache.invalidate_actions():
+        print("⚠️  Кэш действий не инвалидирован (истечёт по TTL)")
+
+
+async def ensure_admin() -> None:
+    """Добавить первого администратора (ADMIN_ID из .env)"""
+    admin_id = settings.admin_id
+
+    async with get_session_maker()() as session:
+        result = await session.execute(select(Admin).where(Admin.user_id == admin_id))
+        if result.scalar_one_or_none():
+            print(f"  ℹ️  Админ {admin_id} уже существует")
+            return
+
+        session.add(
+            Admin(
+                user_id=admin_id,
+                username=None,  # Заполнится при первом использовании бота
+                full_name="Main Admin",
+                is_active=True,
+                added_by=None,
+            )
+        )
+        await session.commit()
+        print(f"  ✅ Администратор {admin_id} добавлен!")
+
+
+# ========== ЭКСПОРТ ==========
+
+
+async def export_actions(path: Optional[Path]) -> int:
+    """Выгрузить действия из БД в JSONL потоком (без загрузки всей таблицы)"""
+    columns = [getattr(Action, column) for column in EXPORT_COLUMNS]
+    out = open(path, "w", encoding="utf-8") if path else sys.stdout
+    count = 0
+    try:
+        async with get_session_maker()() as session:
+            result = await session.stream(select(*columns).order_by(Action.display_order))
+            async for row in result:
+                out.write(json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False))
+                out.write("\n")
+                count += 1
+    finally:
+        if path:
+            out.close()
+    return count
+
+
+# ========== ЗАПУСК ==========
+
+
+async def run(args: argparse.Namespace) -> int:
+    try:
+        if args.export is not None:
+            count = await export_actions(None if str(args.export) == "-" else args.export)
+            print(f"✅ Выгружено действий: {count}", file=sys.stderr)
+            return 0
+
+        source = iter_jsonl(args.source) if args.source else iter_catalog()
+        changed = await import_actions(
+            source,
+            args.batch_size,
+            args.dry_run,
+            update_existing=args.update_existing,
+            include_unpacked=args.include_unpacked,
+        )
+        if args.dry_run:
+            return 0
+
+        if changed:
+            await invalidate_cache()
+
+        print("\n👤 Добавляю первого администратора...")
+        await ensure_admin()
+
+        print("\n🎉 Миграция завершена успешно!")
+        return 0
+    except Exception as e:
+        print(f"\n❌ Ошибка миграции: {e}")
+        return 1
+    finally:
+        await get_engine().dispose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--source", type=Path, help="JSONL с действиями вместо каталога")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Показать разницу, ничего не записывать"
+    )
+    parser.add_argument(
+        "--update-existing",
+        action="store_true",
+        help="Перезаписать отличающиеся действия в БД значениями источника",
+    )
+    parser.add_argument(
+        "--include-unpacked",
+        action="store_true",
+        help="Импортировать и действия без пака (только из actions.json / склонений)",
+    )
+    parser.add_argument(
+        "--export", type=Path, help="Выгрузить действия из БД в JSONL ('-' - stdout)"
+    )
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Строк на INSERT")
+    args = parser.parse_args()
+
+    print("=" * 60, file=sys.stderr)
+    print("    МИГРАЦИЯ ДЕЙСТВИЙ В БАЗУ ДАННЫХ", file=sys.stderr)
+    print("=" * 60, file=sys.stderr)
+    return asyncio.run(run(args))
 
 
 if __name__ == "__main__":
-    print("=" * 60)
-    print("    МИГРАЦИЯ ДЕЙСТВИЙ В БАЗУ ДАННЫХ")
-    print("=" * 60)
-    asyncio.run(migrate_actions())
+    sys.exit(main())
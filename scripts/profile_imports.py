@@ -0,0 +1,154 @@
+"""
+Профиль времени импорта модулей бота
+
+ЗАПУСК:
+    python -m scripts.profile_imports
+    python -m scripts.profile_imports --sort cumulative --top 40
+    python -m scripts.profile_imports --prefix bot.
+
+ЧТО ДЕЛАЕТ:
+    1. Запускает чистый интерпретатор с python -X importtime
+       и импортирует модуль (по умолчанию bot.main)
+    2. Разбирает отчёт importtime: собственное и накопленное время модулей
+    3. Печатает самые дорогие модули и сумму по пакетам верхнего уровня
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).parent.parent
+
+# Импорт bot.main создаёт Settings() - без .env нужны обязательные поля
+PLACEHOLDER_ENV = {
+    "BOT_TOKEN": "0000000000:import-profile-placeholder-token",
+    "ADMIN_ID": "1",
+}
+
+
+@dataclass
+class ImportRecord:
+    """Строка отчёта python -X importtime"""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def subprocess_env() -> Dict[str, str]:
+    """Окружение дочернего интерпретатора (реальные значения имеют приоритет)"""
+    env = dict(os.environ)
+    for key, value in PLACEHOLDER_ENV.items():
+        env.setdefault(key, value)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(ROOT), env.get("PYTHONPATH")])
+    )
+    return env
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """
+    Разобрать вывод importtime
+
+    Формат строки:
+        import time:       412 |       1650 |   bot.core.config
+    Отступ имени модуля - глубина вложенности импорта.
+    """
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        self_us, cumulative_us, name = parts
+        if not self_us.strip().isdigit():
+            # Заголовок: self [us] | cumulative | imported package
+            continue
+        stripped = name.lstrip(" ")
+        records.append(
+            ImportRecord(
+                module=stripped.strip(),
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=(len(name) - len(stripped)) // 2,
+            )
+        )
+    return records
+
+
+def profile(module: str = "bot.main") -> List[ImportRecord]:
+    """Импортировать модуль в новом процессе и вернуть отчёт importtime"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=subprocess_env(),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        tail = "\n".join(result.stderr.splitlines()[-15:])
+        raise RuntimeError(f"Импорт {module} завершился с ошибкой:\n{tail}")
+    return parse_importtime(result.stderr)
+
+
+def by_package(records: List[ImportRecord]) -> Counter:
+    """Собственное время, просуммированное по пакету верхнего уровня"""
+    totals: Counter = Counter()
+    for record in records:
+        totals[record.module.split(".")[0]] += record.self_us
+    return totals
+
+
+def print_report(
+    records: List[ImportRecord], top: int, sort: str, prefix: str = ""
+) -> None:
+    selected = [r for r in records if r.module.startswith(prefix)]
+    key = (lambda r: r.self_us) if sort == "self" else (lambda r: r.cumulative_us)
+    total_us = sum(r.self_us for r in records)
+
+    print(f"📦 Модулей импортировано: {len(records)}, всего {total_us / 1000:.1f} мс")
+    print(f"\n🐢 Топ {top} по {'собственному' if sort == 'self' else 'накопленному'} времени:")
+    print(f"{'self, мс':>10} {'cumul, мс':>10}  модуль")
+    for record in sorted(selected, key=key, reverse=True)[:top]:
+        print(
+            f"{record.self_us / 1000:>10.1f} {record.cumulative_us / 1000:>10.1f}  "
+            f"{record.module}"
+        )
+
+    print("\n📊 По пакетам (собственное время):")
+    for package, self_us in by_package(records).most_common(top):
+        share = self_us / total_us * 100 if total_us else 0.0
+        print(f"{self_us / 1000:>10.1f} мс {share:>5.1f}%  {package}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="bot.main", help="Что импортировать")
+    parser.add_argument("--top", type=int, default=25, help="Сколько строк выводить")
+    parser.add_argument(
+        "--sort", choices=("self", "cumulative"), default="self", help="Сортировка"
+    )
+    parser.add_argument(
+        "--prefix", default="", help="Показывать только модули с префиксом (bot.)"
+    )
+    args = parser.parse_args()
+
+    try:
+        records = profile(args.module)
+    except RuntimeError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    print_report(records, args.top, args.sort, args.prefix)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Преобразование трассировок апдейтов в folded stacks для flame graph
+
+ЗАПУСК:
+    python -m scripts.traces_to_folded logs/traces.jsonl > traces.folded
+    flamegraph.pl traces.folded > traces.svg
+
+ЧТО ДЕЛАЕТ:
+    1. Читает JSONL файлы трассировок (bot/core/tracing.py)
+    2. Для каждого span строит стек update;handler.inline;db.select
+    3. Суммирует собственное время span (без дочерних) в микросекундах
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable
+
+
+def fold_trace(record: Dict, totals: Counter) -> None:
+    """Добавить собственное время всех span одного trace"""
+    spans = {span["id"]: span for span in record.get("spans", [])}
+
+    children_time: Dict[int, float] = {}
+    for span in spans.values():
+        parent = span.get("parent")
+        if parent is not None:
+            children_time[parent] = children_time.get(parent, 0.0) + span["duration_ms"]
+
+    for span_id, span in spans.items():
+        stack = []
+        current = span
+        while current is not None:
+            stack.append(current["name"])
+            current = spans.get(current.get("parent"))
+        stack.reverse()
+
+        self_ms = max(span["duration_ms"] - children_time.get(span_id, 0.0), 0.0)
+        totals[";".join(stack)] += int(self_ms * 1000)
+
+
+def fold_files(paths: Iterable[Path]) -> Counter:
+    totals: Counter = Counter()
+    for path in paths:
+        with path.open(encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    fold_trace(json.loads(line), totals)
+                except (ValueError, KeyError) as e:
+                    print(f"⚠️ {path}:{line_no}: пропущена строка ({e})", file=sys.stderr)
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JSONL трассировки -> folded stacks")
+    parser.add_argument("files", nargs="+", type=Path, help="Файлы traces.jsonl*")
+    args = parser.parse_args()
+
+    totals = fold_files(args.files)
+    for stack, micros in sorted(totals.items()):
+        if micros > 0:
+            print(f"{stack} {micros}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Общие настройки тестов
+
+Settings требует BOT_TOKEN и ADMIN_ID - задаём заглушки до импорта
+модулей бота (значения из окружения не перезаписываются).
+
+Тесты на SQLite требуют aiosqlite и слой bot.database - без них
+эти модули не собираются.
+"""
+
+import os
+
+os.environ.setdefault("BOT_TOKEN", "0000000000:test-placeholder-token")
+os.environ.setdefault("ADMIN_ID", "1")
+
+
+# Модули тестов, которым нужна БД (SQLite через aiosqlite)
+DATABASE_TESTS = ["test_admin_actions.py", "test_gender_service.py", "test_pool_monitor.py"]
+
+
+def _database_available() -> bool:
+    try:
+        import aiosqlite  # noqa: F401
+
+        import bot.database.models  # noqa: F401
+        import bot.database.repositories  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+collect_ignore = [] if _database_available() else DATABASE_TESTS
@@ -0,0 +1,126 @@
+"""
+Индекс валидации: действия, паки и emoji из каталога и БД, горячая замена
+"""
+
+import copy
+
+import pytest
+
+from bot.core import catalog as catalog_module
+from bot.core.action_index import ActionIndex, ValidationSnapshot
+from bot.core.catalog import FIELDS, Catalog, build_catalog, catalog_version, get_catalog
+
+
+@pytest.fixture(scope="module")
+def payload():
+    return build_catalog()
+
+
+@pytest.fixture
+def restore_catalog():
+    """Вернуть глобальный каталог после теста"""
+    saved = catalog_module._catalog
+    yield
+    catalog_module._catalog = saved
+
+
+def unpacked_name(catalog: Catalog) -> str:
+    """Действие каталога, не входящее ни в один пак"""
+    packed = set(catalog.names)
+    return next(a["name"] for a in catalog.actions if a["name"] not in packed)
+
+
+def renamed(payload, old: str, new: str) -> Catalog:
+    """Каталог, где действие old переименовано в new (и в паке тоже)"""
+    changed = copy.deepcopy(payload)
+    for row in changed["actions"]:
+        if row[FIELDS.index("name")] == old:
+            row[FIELDS.index("name")] = new
+    changed["packs"] = {
+        pack: [new if name == old else name for name in names]
+        for pack, names in changed["packs"].items()
+    }
+    changed["version"] = catalog_version(changed)
+    return Catalog(changed)
+
+
+# ========== СНИМОК ==========
+
+
+def test_snapshot_contains_only_packed_actions(payload):
+    catalog = Catalog(payload)
+    snapshot = ValidationSnapshot.build(catalog)
+
+    assert snapshot.actions == {name.casefold() for name in catalog.names}
+    assert unpacked_name(catalog).casefold() not in snapshot.actions
+    assert snapshot.packs == {pack.casefold() for pack in catalog.packs}
+    assert snapshot.emojis == {catalog.get(name)["emoji"] for name in catalog.names}
+
+
+def test_snapshot_adds_db_actions(payload):
+    catalog = Catalog(payload)
+    db_actions = [{"name": "Пощекотать пяточки", "emoji": "🦶", "pack": "БД"}]
+    snapshot = ValidationSnapshot.build(catalog, db_actions)
+    assert "пощекотать пяточки" in snapshot.actions
+    assert "бд" in snapshot.packs
+    assert "🦶" in snapshot.emojis
+    assert snapshot.covers(db_actions[0])
+
+
+# ========== ИНДЕКС ==========
+
+
+def test_index_is_case_insensitive(restore_catalog):
+    index = ActionIndex()
+    assert index.has_action("обнять")
+    assert index.has_action("ОБНЯТЬ")
+    assert not index.has_action("invalid_action")
+    assert not index.has_action(unpacked_name(get_catalog()))
+
+
+def test_index_sync_db(restore_catalog):
+    index = ActionIndex()
+    assert not index.has_action("Пощекотать пяточки")
+
+    index.sync_db([{"id": 200, "name": "Пощекотать пяточки", "emoji": "🫶"}])
+    assert index.has_action("пощекотать пяточки")
+
+    # Повторная загрузка заменяет набор из БД целиком
+    index.sync_db([])
+    assert not index.has_action("пощекотать пяточки")
+
+
+def test_index_rebuilds_on_catalog_swap(payload, restore_catalog):
+    index = ActionIndex()
+    index.sync_db([{"id": 200, "name": "Пощекотать пяточки", "emoji": "🫶"}])
+    before = index.snapshot
+
+    catalog_module.set_catalog(renamed(payload, "Обнять", "Крепко обнять"))
+
+    assert index.snapshot is not before
+    assert index.has_action("крепко обнять")
+    assert not index.has_action("обнять")
+    # Действия из БД переживают замену каталога
+    assert index.has_action("пощекотать пяточки")
+
+
+def test_index_keeps_snapshot_for_same_catalog(restore_catalog):
+    index = ActionIndex()
+    assert index.snapshot is index.snapshot
+
+    # Тот же список из БД (повторное попадание в кэш) снимок не пересобирает
+    db_actions = [{"id": 200, "name": "Пощекотать пяточки", "emoji": "🫶"}]
+    index.sync_db(db_actions)
+    before = index.snapshot
+    index.sync_db(list(db_actions))
+    index.add(db_actions[0])
+    assert index.snapshot is before
+
+
+def test_index_add(restore_catalog):
+    index = ActionIndex()
+    index.add({"id": 200, "name": "Пощекотать пяточки", "emoji": "🦶", "pack": "Щекотка"})
+
+    assert index.has_action("ПОЩЕКОТАТЬ ПЯТОЧКИ")
+    assert index.has_pack("щекотка")
+    assert index.has_emoji("🦶")
@@ -0,0 +1,98 @@
+"""
+ActionService: скомпилированные шаблоны и проверка каталога actions.json
+"""
+
+import pytest
+
+from bot.services.action_service import ActionCatalog, CompiledTemplate
+
+
+def make_action(action_id: int = 1, name: str = "Обнять", **overrides) -> dict:
+    action = {
+        "id": action_id,
+        "name": name,
+        "emoji": "🤗",
+        "category": "нежность",
+        "inline_text": "{user1} хочет обнять",
+        "accepted": {"male": "{user1} обнял {user2}", "female": "{user1} обняла {user2}"},
+        "rejected": {"male": "{user2} отказался", "female": "{user2} отказалась"},
+    }
+    action.update(overrides)
+    return action
+
+
+# ========== CompiledTemplate ==========
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "{user1} обнял {user2}",
+        "{user2}",
+        "без полей",
+        "",
+        "{{скобки}} {user1}",
+        "{user1}{user2}{user1}",
+    ],
+)
+def test_template_renders_like_str_format(source):
+    values = {"user1": "Аня", "user2": "Борис"}
+    assert CompiledTemplate(source).render(values) == source.format(**values)
+
+
+@pytest.mark.parametrize("source", ["{user3}", "{user1!r}", "{user1:>10}", "{0}", "{}"])
+def test_template_rejects_unknown_fields(source):
+    with pytest.raises(ValueError):
+        CompiledTemplate(source)
+
+
+# ========== ActionCatalog ==========
+
+
+def test_catalog_indexes():
+    hug = make_action(1, "Обнять")
+    kiss = make_action(2, "Поцеловать", category="романтика")
+    catalog = ActionCatalog({"version": "1", "actions": [hug, kiss]})
+
+    assert len(catalog) == 2
+    assert catalog.by_id[2] is kiss
+    assert catalog.by_name["обнять"] is hug
+    assert catalog.by_category["романтика"] == [kiss]
+    assert catalog.compiled[1].accepted["female"].render(
+        {"user1": "Аня", "user2": "Борис"}
+    ) == "Аня обняла Борис"
+
+
+def test_catalog_missing_gender_falls_back_to_male():
+    action = make_action(accepted={"male": "{user1} обнял {user2}"})
+    catalog = ActionCatalog({"actions": [action]})
+    compiled = catalog.compiled[1]
+    assert compiled.accepted["female"] is compiled.accepted["male"]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {},
+        {"actions": {"id": 1}},
+        {"actions": [{"name": "Без id"}]},
+        {"actions": [make_action(1, "Обнять"), make_action(1, "Погладить")]},
+        {"actions": [make_action(1, "Обнять"), make_action(2, "ОБНЯТЬ")]},
+        {"actions": [make_action(accepted={"female": "{user1}"})]},
+        {"actions": [make_action(rejected={"male": "{user3}"})]},
+        {"actions": [make_action(inline_text="{user1.name}")]},
+    ],
+    ids=[
+        "no-actions",
+        "actions-not-list",
+        "no-id",
+        "duplicate-id",
+        "duplicate-name-casefold",
+        "no-male-template",
+        "unknown-field",
+        "attribute-field",
+    ],
+)
+def test_catalog_validation_errors(data):
+    with pytest.raises(ValueError):
+        ActionCatalog(data)
@@ -0,0 +1,186 @@
+"""
+Действие, добавленное через /add_action, сразу проходит валидацию
+
+Репозитории и кэш - заглушки в памяти, FSM - MemoryStorage aiogram.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from bot.core.action_index import action_index
+from bot.handlers import admin, commands
+from bot.services.action import ActionService
+from bot.services.interaction import InteractionService
+
+NEW_ACTION = "Пощекотать пяточки"
+
+
+class FakeMessage:
+    def __init__(self, text: str):
+        self.text = text
+        self.answers = []
+
+    async def answer(self, text: str, **kwargs) -> None:
+        self.answers.append(text)
+
+
+class FakeActionRepository:
+    def __init__(self, packs=None):
+        self.created = []
+        self.packs = packs or {}
+        self.pack_queries = []
+
+    async def create(self, **fields) -> dict:
+        action = {"id": 500 + len(self.created), "display_order": 0, **fields}
+        self.created.append(action)
+        return action
+
+    async def get_pack_actions(self, pack_name: str) -> list:
+        self.pack_queries.append(pack_name)
+        key = pack_name.casefold()
+        return next((actions for name, actions in self.packs.items() if name.casefold() == key), [])
+
+
+class FakeCache:
+    def __init__(self, actions=None, packs=None):
+        self.actions = actions
+        self.packs = packs
+        self.invalidated = 0
+
+    async def get_actions(self):
+        return self.actions
+
+    async def get_packs(self):
+        return self.packs
+
+    async def invalidate_actions(self) -> None:
+        self.invalidated += 1
+
+
+class FakeInteractionRepository:
+    async def create(self, **fields):
+        return SimpleNamespace(id=1, **fields)
+
+
+@pytest.fixture(autouse=True)
+def reset_index():
+    """Глобальный индекс без действий из БД до и после теста"""
+    action_index.sync_db([])
+    yield
+    action_index.sync_db([])
+
+
+def new_state() -> FSMContext:
+    return FSMContext(storage=MemoryStorage(), key=StorageKey(bot_id=1, chat_id=1, user_id=1))
+
+
+async def add_action(state: FSMContext, repo, cache, name: str = NEW_ACTION) -> FakeMessage:
+    """Пройти /add_action от названия до сохранения"""
+    await admin.process_name(FakeMessage(name), state)
+    await admin.process_emoji(FakeMessage("🦶"), state)
+    await admin.process_infinitive(FakeMessage("пощекотать пяточки"), state)
+    await admin.process_past(FakeMessage("пощекотал пяточки"), state)
+    last = FakeMessage("щекотки")
+    await admin.process_noun(last, state, repo, cache)
+    return last
+
+
+async def interact(action: str):
+    return await InteractionService(FakeInteractionRepository()).create_interaction(
+        sender_id=1, receiver_id=2, action=action
+    )
+
+
+# ========== /add_action ==========
+
+
+def test_added_action_is_accepted_by_interaction():
+    async def scenario():
+        _, error = await interact(NEW_ACTION)
+        assert error is not None
+
+        repo, cache = FakeActionRepository(), FakeCache()
+        last = await add_action(new_state(), repo, cache)
+
+        assert len(repo.created) == 1
+        assert cache.invalidated == 1
+        assert "успешно добавлено" in last.answers[0]
+
+        interaction, error = await interact(NEW_ACTION.upper())
+        assert error is None
+        assert interaction.action == NEW_ACTION.upper()
+
+    asyncio.run(scenario())
+
+
+def test_existing_name_is_rejected_in_any_case():
+    async def scenario():
+        state = new_state()
+        message = FakeMessage("ОБНЯТЬ")
+        await admin.process_name(message, state)
+
+        assert "уже существует" in message.answers[0]
+        assert await state.get_state() is None
+
+    asyncio.run(scenario())
+
+
+def test_known_emoji_is_reported_but_allowed():
+    async def scenario():
+        state = new_state()
+        message = FakeMessage("🤗")
+        await admin.process_emoji(message, state)
+
+        assert "уже используется" in message.answers[0]
+        assert (await state.get_data())["emoji"] == "🤗"
+
+    asyncio.run(scenario())
+
+
+# ========== ActionService ==========
+
+
+def test_cache_hit_syncs_index():
+    async def scenario():
+        # Действие добавлено в другом процессе, список - из общего кэша
+        cached = [{"id": 500, "name": NEW_ACTION, "emoji": "🦶", "pack": "Щекотка"}]
+        service = ActionService(FakeActionRepository(), FakeCache(actions=cached))
+
+        assert await service.get_all_actions() == cached
+        assert action_index.has_action(NEW_ACTION)
+        assert action_index.has_pack("щекотка")
+
+    asyncio.run(scenario())
+
+
+# ========== /pack ==========
+
+
+def test_pack_unknown_name_skips_db():
+    async def scenario():
+        repo = FakeActionRepository()
+        message = FakeMessage("/pack Нет такого пака")
+        await commands.cmd_pack(message, repo, FakeCache(packs={"Стандартный пак": []}))
+
+        assert repo.pack_queries == []
+        assert "не найден" in message.answers[0]
+
+    asyncio.run(scenario())
+
+
+def test_pack_other_case_falls_back_to_db():
+    async def scenario():
+        hug = {"name": "Обнять", "emoji": "🤗"}
+        repo = FakeActionRepository(packs={"Стандартный пак": [hug]})
+        message = FakeMessage("/pack стандартный пак")
+        await commands.cmd_pack(message, repo, FakeCache(packs={"Стандартный пак": [hug]}))
+
+        assert repo.pack_queries == ["стандартный пак"]
+        assert "🤗 Обнять" in message.answers[0]
+
+    asyncio.run(scenario())
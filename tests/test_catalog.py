@@ -0,0 +1,224 @@
+"""
+Единый каталог действий: сборка, проверка, чтение артефакта, устаревание
+"""
+
+import copy
+import logging
+import shutil
+
+import pytest
+
+from bot.core.catalog import (
+    ACTIONS_JSON_PATH,
+    FIELDS,
+    TABLES_PATH,
+    Catalog,
+    build_catalog,
+    catalog_signature,
+    catalog_version,
+    load_catalog,
+    read_catalog,
+    validate_payload,
+    write_catalog,
+)
+
+
+@pytest.fixture(scope="module")
+def payload():
+    return build_catalog()
+
+
+@pytest.fixture
+def sources(tmp_path):
+    """Копии actions.json и action_tables.json, которые тест может менять"""
+    actions_json = tmp_path / "actions.json"
+    tables = tmp_path / "action_tables.json"
+    shutil.copy(ACTIONS_JSON_PATH, actions_json)
+    shutil.copy(TABLES_PATH, tables)
+    return tmp_path / "catalog.json", actions_json, tables
+
+
+def row_index(payload, name: str) -> int:
+    key = name.casefold()
+    return next(i for i, row in enumerate(payload["actions"]) if row[0].casefold() == key)
+
+
+def resign(payload) -> dict:
+    payload["version"] = catalog_version(payload)
+    return payload
+
+
+# ========== СБОРКА ==========
+
+
+def test_build_is_valid_and_deterministic(payload):
+    validate_payload(payload)
+    assert payload["fields"] == list(FIELDS)
+    assert build_catalog()["version"] == payload["version"]
+
+
+def test_build_merges_sources(payload):
+    catalog = Catalog(payload)
+    hug = catalog.get("обнять")
+
+    assert hug["pack"] == "Стандартный пак"
+    assert hug["json_id"] is not None
+    assert hug["accepted"]["male"]
+    # Формы склонятора и формы текстов БД не перезаписывают друг друга
+    assert hug["verb_past"] == "обнял(а)"
+    assert hug["verb_genitive"] == "обнимания"
+    assert hug["past_tense"] == "обнял"
+    assert hug["genitive_noun"] == "объятия"
+    assert hug["verb_present"] == "обнимает"
+
+
+def test_build_db_rows_take_precedence(sources):
+    _, actions_json, tables = sources
+    db_actions = [
+        {"id": 7, "name": "обнять", "emoji": "🫂", "past_tense": "обнял(а) крепко", "pack": "БД"},
+    ]
+    catalog = Catalog(build_catalog(db_actions, actions_json, tables))
+    hug = catalog.get("Обнять")
+
+    assert (hug["db_id"], hug["emoji"], hug["past_tense"]) == (7, "🫂", "обнял(а) крепко")
+    assert "Обнять" in catalog.packs["БД"]
+    assert catalog.db_actions() == [
+        {
+            "id": 7,
+            "name": "Обнять",
+            "emoji": "🫂",
+            "infinitive": "обнять",
+            "past_tense": "обнял(а) крепко",
+            "genitive_noun": "объятия",
+            "display_order": hug["display_order"],
+            "pack": "БД",
+        }
+    ]
+
+
+# ========== ПРОВЕРКА ==========
+
+
+def _broken(payload, mutate):
+    broken = copy.deepcopy(payload)
+    mutate(broken)
+    return resign(broken)
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda p: p.update(format=999),
+        lambda p: p["fields"].reverse(),
+        lambda p: p["actions"][0].pop(),
+        lambda p: p["actions"].append(list(p["actions"][0])),
+        lambda p: p["actions"][0].__setitem__(FIELDS.index("emoji"), ""),
+        lambda p: p["packs"].update({"Пустой": ["Нет такого"]}),
+    ],
+    ids=["format", "fields", "row-length", "duplicate-name", "empty-emoji", "unknown-pack-action"],
+)
+def test_validate_rejects_broken_payload(payload, mutate):
+    with pytest.raises(ValueError):
+        validate_payload(_broken(payload, mutate))
+
+
+def test_validate_rejects_bad_template(payload):
+    broken = copy.deepcopy(payload)
+    row = broken["actions"][row_index(broken, "Обнять")]
+    row[FIELDS.index("inline_text")] = "{user3}"
+    with pytest.raises(ValueError):
+        validate_payload(resign(broken))
+
+
+def test_validate_rejects_tampered_version(payload):
+    broken = copy.deepcopy(payload)
+    broken["actions"][0][FIELDS.index("emoji")] = "🦄"
+    with pytest.raises(ValueError, match="версия"):
+        validate_payload(broken)
+
+
+# ========== АРТЕФАКТ ==========
+
+
+def test_write_read_round_trip(payload, tmp_path):
+    path = tmp_path / "catalog.json"
+    write_catalog(payload, path)
+    assert read_catalog(path) == payload
+    assert not path.with_suffix(".json.tmp").exists()
+
+
+def test_load_uses_fresh_artifact(sources, caplog):
+    path, actions_json, tables = sources
+    payload = build_catalog(actions_json_path=actions_json, tables_path=tables)
+    write_catalog(payload, path)
+
+    with caplog.at_level(logging.WARNING):
+        catalog = load_catalog(path, actions_json, tables)
+    assert catalog.built_at == payload["built_at"]
+    assert not caplog.records
+
+
+def test_load_rebuilds_when_tables_change(sources, caplog):
+    path, actions_json, tables = sources
+    write_catalog(build_catalog(actions_json_path=actions_json, tables_path=tables), path)
+    before = catalog_signature(path, actions_json, tables)
+
+    text = tables.read_text(encoding="utf-8")
+    tables.write_text(
+        text.replace('"Пнуть": "пинает"', '"Пнуть": "пинает ногой"'), encoding="utf-8"
+    )
+
+    assert catalog_signature(path, actions_json, tables) != before
+    with caplog.at_level(logging.WARNING):
+        catalog = load_catalog(path, actions_json, tables)
+    assert catalog.get("Пнуть")["verb_present"] == "пинает ногой"
+    assert "action_tables.json" in caplog.text
+
+
+def test_load_rebuild_keeps_db_actions(sources, caplog):
+    path, actions_json, tables = sources
+    db_actions = [{"id": 7, "name": "Пощекотать пяточки", "emoji": "🦶", "pack": "БД"}]
+    write_catalog(build_catalog(db_actions, actions_json, tables), path)
+
+    text = tables.read_text(encoding="utf-8")
+    tables.write_text(
+        text.replace('"Пнуть": "пинает"', '"Пнуть": "пинает ногой"'), encoding="utf-8"
+    )
+
+    with caplog.at_level(logging.WARNING):
+        catalog = load_catalog(path, actions_json, tables)
+    assert catalog.get("Пнуть")["verb_present"] == "пинает ногой"
+    assert catalog.get("Пощекотать пяточки")["db_id"] == 7
+    assert "Пощекотать пяточки" in catalog.packs["БД"]
+    assert "из БД - из артефакта: 1" in caplog.text
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["{not json", '{"packs": []}'],
+    ids=["syntax", "missing-tables"],
+)
+def test_build_rejects_broken_tables(sources, text):
+    _, actions_json, tables = sources
+    tables.write_text(text, encoding="utf-8")
+    with pytest.raises(ValueError, match="action_tables.json"):
+        build_catalog(actions_json_path=actions_json, tables_path=tables)
+
+
+def test_load_rebuilds_when_actions_json_changes(sources, caplog):
+    path, actions_json, tables = sources
+    write_catalog(build_catalog(actions_json_path=actions_json, tables_path=tables), path)
+    actions_json.write_text(
+        actions_json.read_text(encoding="utf-8").replace('"🤗"', '"🫂"', 1),
+        encoding="utf-8",
+    )
+
+    with caplog.at_level(logging.WARNING):
+        load_catalog(path, actions_json, tables)
+    assert "actions.json" in caplog.text
+
+
+def test_load_without_artifact_builds_in_memory(sources):
+    path, actions_json, tables = sources
+    catalog = load_catalog(path, actions_json, tables)
+    assert len(catalog) == len(build_catalog(actions_json_path=actions_json)["actions"])
@@ -0,0 +1,205 @@
+"""
+GenderService: лимит "3 изменения за 30 дней" одним условным UPDATE
+
+Запросы выполняются на SQLite (aiosqlite), таблица users создаётся
+из моделей. Без aiosqlite модуль не собирается (tests/conftest.py).
+"""
+
+import asyncio
+from datetime import timedelta
+
+from aiogram.types import User as TelegramUser
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from bot.database import models
+from bot.database.repositories import UserRepository
+from bot.services.gender import (
+    GENDER_CHANGE_LIMIT,
+    GENDER_CHANGE_WINDOW,
+    GenderService,
+    GenderStatus,
+    utcnow,
+)
+
+User = models.User
+
+USER_ID = 1001
+
+
+def telegram_user(user_id: int = USER_ID) -> TelegramUser:
+    return TelegramUser(id=user_id, is_bot=False, first_name="Аня")
+
+
+def run_with_db(tmp_path, scenario) -> None:
+    """Выполнить сценарий на чистой БД (файл - для нескольких соединений)"""
+
+    async def main():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'bot.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(models.Base.metadata.create_all, tables=[User.__table__])
+        try:
+            await scenario(async_sessionmaker(engine, expire_on_commit=False))
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
+
+
+async def register(session_maker, gender=None, changes=0, last_change=None) -> None:
+    async with session_maker() as session:
+        await UserRepository(session).create_or_update(
+            user_id=USER_ID, username="anya", full_name="Аня"
+        )
+        await session.execute(
+            update(User)
+            .where(User.id == USER_ID)
+            .values(
+                gender=gender,
+                gender_changes_count=changes,
+                last_gender_change=last_change,
+            )
+        )
+        await session.commit()
+
+
+async def change(session_maker, gender: str):
+    async with session_maker() as session:
+        status = await GenderService(UserRepository(session)).change(USER_ID, gender)
+        await session.commit()
+        return status
+
+
+async def get_status(session_maker) -> GenderStatus:
+    async with session_maker() as session:
+        return await GenderService(UserRepository(session)).get_status(USER_ID)
+
+
+# ========== GenderStatus ==========
+
+
+def test_status_without_gender_has_full_limit():
+    status = GenderStatus(gender=None, changes_count=3, last_change=utcnow())
+    assert status.remaining() == GENDER_CHANGE_LIMIT
+    assert status.can_change()
+
+
+def test_status_limit_and_reset():
+    now = utcnow()
+    status = GenderStatus(gender="male", changes_count=3, last_change=now - timedelta(days=10))
+    assert status.remaining(now) == 0
+    assert not status.can_change(now)
+    assert status.days_until_reset(now) == 20
+
+    # Ровно 30 дней - окно истекло, счётчик обнулён
+    expired = GenderStatus("male", 3, now - GENDER_CHANGE_WINDOW)
+    assert expired.window_expired(now)
+    assert expired.remaining(now) == GENDER_CHANGE_LIMIT
+    assert expired.days_until_reset(now) == 0
+
+
+# ========== Первый выбор ==========
+
+
+def test_set_initial_only_when_gender_is_null(tmp_path):
+    async def scenario(session_maker):
+        await register(session_maker)
+
+        async with session_maker() as session:
+            service = GenderService(UserRepository(session))
+            assert await service.set_initial(telegram_user(), "female")
+            assert not await service.set_initial(telegram_user(), "male")
+            await session.commit()
+
+        status = await get_status(session_maker)
+        assert status.gender == "female"
+        assert status.changes_count == 0
+
+    run_with_db(tmp_path, scenario)
+
+
+def test_set_initial_registers_unknown_user(tmp_path):
+    async def scenario(session_maker):
+        async with session_maker() as session:
+            service = GenderService(UserRepository(session))
+            assert await service.set_initial(telegram_user(), "male")
+            await session.commit()
+
+        assert (await get_status(session_maker)).gender == "male"
+
+    run_with_db(tmp_path, scenario)
+
+
+# ========== Изменение с лимитом ==========
+
+
+def test_change_requires_initial_gender(tmp_path):
+    async def scenario(session_maker):
+        await register(session_maker, gender=None)
+        assert await change(session_maker, "male") is None
+        assert (await get_status(session_maker)).gender is None
+
+    run_with_db(tmp_path, scenario)
+
+
+def test_change_limit_within_window(tmp_path):
+    async def scenario(session_maker):
+        await register(session_maker, gender="male", last_change=utcnow())
+
+        for expected in range(1, GENDER_CHANGE_LIMIT + 1):
+            status = await change(session_maker, "female" if expected % 2 else "male")
+            assert status is not None
+            assert status.changes_count == expected
+
+        # Четвёртое изменение в окне отклоняется, пол не меняется
+        assert await change(session_maker, "female") is None
+        status = await get_status(session_maker)
+        assert status.changes_count == GENDER_CHANGE_LIMIT
+        assert status.gender == "female"
+
+    run_with_db(tmp_path, scenario)
+
+
+def test_change_resets_counter_after_window(tmp_path):
+    async def scenario(session_maker):
+        last_change = utcnow() - GENDER_CHANGE_WINDOW
+        await register(
+            session_maker, gender="male", changes=GENDER_CHANGE_LIMIT, last_change=last_change
+        )
+
+        status = await change(session_maker, "female")
+        assert status is not None
+        assert status.changes_count == 1
+
+    run_with_db(tmp_path, scenario)
+
+
+def test_change_rejected_just_inside_window(tmp_path):
+    async def scenario(session_maker):
+        last_change = utcnow() - GENDER_CHANGE_WINDOW + timedelta(minutes=1)
+        await register(
+            session_maker, gender="male", changes=GENDER_CHANGE_LIMIT, last_change=last_change
+        )
+
+        assert await change(session_maker, "female") is None
+
+    run_with_db(tmp_path, scenario)
+
+
+def test_concurrent_confirm_does_not_exceed_limit(tmp_path):
+    async def scenario(session_maker):
+        # Осталось одно изменение, "Подтвердить" нажато дважды
+        await register(
+            session_maker,
+            gender="male",
+            changes=GENDER_CHANGE_LIMIT - 1,
+            last_change=utcnow(),
+        )
+
+        results = await asyncio.gather(
+            change(session_maker, "female"), change(session_maker, "female")
+        )
+        assert sum(status is not None for status in results) == 1
+        assert (await get_status(session_maker)).changes_count == GENDER_CHANGE_LIMIT
+
+    run_with_db(tmp_path, scenario)
@@ -0,0 +1,91 @@
+"""
+PoolMonitor: ожидание соединения по событиям сессий и адаптивный max_overflow
+"""
+
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from bot.core.config import settings
+from bot.database.pool import PoolMonitor, get_max_overflow
+
+
+def run_with_pool(tmp_path, scenario, max_overflow: int = 0) -> None:
+    """Сценарий на SQLite с пулом из одного соединения"""
+
+    async def main():
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=1,
+            max_overflow=max_overflow,
+        )
+        monitor = PoolMonitor()
+        monitor.attach(engine)
+        try:
+            await scenario(monitor, async_sessionmaker(engine, expire_on_commit=False))
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
+
+
+def test_wait_is_measured_under_contention(tmp_path):
+    async def scenario(monitor, session_maker):
+        async def hold():
+            async with session_maker() as session:
+                await session.execute(text("SELECT 1"))
+                await asyncio.sleep(0.2)
+
+        async def wait():
+            await asyncio.sleep(0.05)
+            async with session_maker() as session:
+                await session.execute(text("SELECT 1"))
+
+        await asyncio.gather(hold(), wait())
+
+        waits = sorted(monitor._waits)
+        assert len(waits) == 2
+        assert waits[0] < 0.05
+        assert 0.1 <= waits[1] < 1.0
+
+    run_with_pool(tmp_path, scenario)
+
+
+def test_savepoint_and_sessions_without_queries_are_not_measured(tmp_path):
+    async def scenario(monitor, session_maker):
+        async with session_maker() as session:
+            await session.commit()
+        assert not monitor._waits
+
+        async with session_maker() as session:
+            await session.execute(text("SELECT 1"))
+            async with session.begin_nested():
+                await session.execute(text("SELECT 2"))
+            await session.commit()
+        assert len(monitor._waits) == 1
+
+    run_with_pool(tmp_path, scenario)
+
+
+def test_adjust_raises_max_overflow_when_handlers_wait(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_adapt_high_wait", 0.05)
+    monkeypatch.setattr(settings, "db_pool_adapt_step", 2)
+    monkeypatch.setattr(settings, "db_pool_max_overflow_limit", 3)
+
+    async def scenario(monitor, session_maker):
+        pool = monitor._pool
+        monitor._waits.extend([0.2] * 10)
+
+        monitor.adjust()
+        assert get_max_overflow(pool) == 2
+        assert not monitor._waits
+
+        monitor._waits.extend([0.2] * 10)
+        monitor.adjust()
+        assert get_max_overflow(pool) == 3
+        assert monitor.snapshot()["max_overflow"] == 3
+
+    run_with_pool(tmp_path, scenario)